@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.conf import settings
+        from . import columnar_logic
+        columnar_logic.dataset_cache.max_bytes = getattr(settings, 'DATASET_CACHE_MAX_BYTES', columnar_logic.dataset_cache.max_bytes)
@@ -0,0 +1,116 @@
+import math
+from bisect import bisect_right
+from collections import Counter
+
+# Strategies accepted by `fit`; 'entropy' is supervised and needs class labels.
+STRATEGIES = ('equal_width', 'equal_frequency', 'entropy')
+
+# Label of each bin in the preprocessing output and in the decision tree.
+BIN_LABEL = 'Bin {number}: [{lower:.2f} - {upper:.2f}]'
+RANGE_LABEL = '[{lower:.2f}-{upper:.2f}]'
+
+
+class Binning:
+    """Sorted bin edges of a column. A value is assigned to its bin by binary
+    search over the edges: bins are closed on the left, the last one on both
+    sides, and values outside the edges go to the nearest end bin."""
+
+    def __init__(self, edges, label_format=BIN_LABEL):
+        self.edges = list(edges)
+        if self.constant:
+            self.labels = [f'Bin 1: ({self.edges[0]})']
+        else:
+            self.labels = [label_format.format(number=i + 1, lower=self.edges[i], upper=self.edges[i + 1]) for i in range(self.num_bins)]
+
+    @property
+    def constant(self):
+        return self.edges[0] == self.edges[-1]
+
+    @property
+    def num_bins(self):
+        return 1 if self.constant else len(self.edges) - 1
+
+    def index(self, value):
+        return min(max(bisect_right(self.edges, value) - 1, 0), self.num_bins - 1)
+
+    def label(self, value):
+        return self.labels[self.index(value)]
+
+    def to_dict(self):
+        return {'edges': self.edges, 'labels': self.labels}
+
+
+def equal_width_edges(min_val, max_val, num_bins):
+    bin_width = (max_val - min_val) / num_bins
+    if bin_width == 0: return [min_val, max_val]
+    edges = [min_val + i * bin_width for i in range(num_bins + 1)]
+    edges[-1] = max_val
+    return edges
+
+
+def equal_frequency_edges(sorted_values, num_bins):
+    """Quantile edges, so every bin holds about the same number of values.
+    Repeated values cannot be split, so fewer bins may come back."""
+    n = len(sorted_values)
+    edges = []
+    for i in range(num_bins):
+        edge = sorted_values[i * n // num_bins]
+        if not edges or edge > edges[-1]: edges.append(edge)
+    if sorted_values[-1] > edges[-1] or len(edges) == 1: edges.append(sorted_values[-1])
+    return edges
+
+
+def _entropy(counts, total):
+    return -sum(c / total * math.log2(c / total) for c in counts if c)
+
+
+def _mdl_cuts(values, classes, lo, hi, cuts):
+    """Fayyad & Irani: split [lo, hi) at the boundary with the lowest class
+    entropy and recurse while the gain passes the MDL criterion."""
+    n = hi - lo
+    if n < 2: return
+    total = Counter(classes[lo:hi])
+    left = Counter()
+    best = None
+    for i in range(lo, hi - 1):
+        left[classes[i]] += 1
+        if values[i] == values[i + 1]: continue
+        n_left = i + 1 - lo
+        right = [total[c] - left[c] for c in total]
+        score = (n_left * _entropy(left.values(), n_left) + (n - n_left) * _entropy(right, n - n_left)) / n
+        if best is None or score < best[0]: best = (score, i + 1, Counter(left))
+    if best is None: return
+    score, split, left = best
+    right = total - left
+    ent, ent_left, ent_right = _entropy(total.values(), n), _entropy(left.values(), split - lo), _entropy(right.values(), hi - split)
+    k, k_left, k_right = len(total), len(left), len(right)
+    delta = math.log2(3 ** k - 2) - (k * ent - k_left * ent_left - k_right * ent_right)
+    if ent - score <= (math.log2(n - 1) + delta) / n: return
+    _mdl_cuts(values, classes, lo, split, cuts)
+    cuts.append((values[split - 1] + values[split]) / 2)
+    _mdl_cuts(values, classes, split, hi, cuts)
+
+
+def entropy_edges(values, classes):
+    """Supervised edges from the class label of every value (entropy/MDL)."""
+    pairs = sorted(zip(values, classes), key=lambda pair: pair[0])
+    sorted_values = [v for v, _ in pairs]
+    sorted_classes = [c for _, c in pairs]
+    cuts = []
+    _mdl_cuts(sorted_values, sorted_classes, 0, len(pairs), cuts)
+    return [sorted_values[0]] + cuts + [sorted_values[-1]]
+
+
+def fit(values, num_bins=5, strategy='equal_width', classes=None, label_format=BIN_LABEL):
+    """Bin edges for a list of numbers; None when there are no values."""
+    if not values: return None
+    if strategy == 'equal_width':
+        edges = equal_width_edges(min(values), max(values), num_bins)
+    elif strategy == 'equal_frequency':
+        edges = equal_frequency_edges(sorted(values), num_bins)
+    elif strategy == 'entropy':
+        if classes is None: raise ValueError("Entropy binning needs a target column.")
+        edges = entropy_edges(values, classes)
+    else:
+        raise ValueError(f"Unknown binning strategy: {strategy}")
+    return Binning(edges, label_format)
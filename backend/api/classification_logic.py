@@ -1,7 +1,8 @@
 import math
 from collections import Counter, defaultdict
 import random
-import copy
+
+from . import binning_logic
 
 # --- Helper Functions ---
 
@@ -16,40 +17,29 @@ def euclidean_distance(row1, row2, attributes):
 
 # --- Decision Tree ---
 
-def _discretize_column(dataset, column, num_bins=4):
+def _discretize_column(dataset, column, num_bins=4, strategy='equal_width', target_attr=None):
     """Helper to discretize a single numeric column into categorical bins."""
-    values = [row[column] for row in dataset if isinstance(row.get(column), (int, float))]
-    if not values: return
-    
-    min_val, max_val = min(values), max(values)
-    if min_val == max_val: return
-
-    bin_width = (max_val - min_val) / num_bins
-    
-    for row in dataset:
-        if isinstance(row.get(column), (int, float)):
-            val = row[column]
-            if bin_width == 0:
-                bin_index = 0
-            else:
-                bin_index = min(int((val - min_val) / bin_width), num_bins - 1)
-                if val == max_val: bin_index = num_bins - 1
-            
-            lower_bound = min_val + bin_index * bin_width
-            upper_bound = min_val + (bin_index + 1) * bin_width
-            row[column] = f"[{lower_bound:.2f}-{upper_bound:.2f}]"
-
-def preprocess_for_tree(dataset, attributes):
-    """Discretizes all numeric attributes in the dataset for the decision tree."""
-    processed_dataset = copy.deepcopy(dataset)
+    rows = [row for row in dataset if isinstance(row.get(column), (int, float))]
+    if not rows: return
+    classes = [row.get(target_attr) for row in rows] if strategy == 'entropy' else None
+    binning = binning_logic.fit([row[column] for row in rows], num_bins, strategy, classes, binning_logic.RANGE_LABEL)
+    if binning.constant: return
+    for row in rows:
+        row[column] = binning.label(row[column])
+
+def preprocess_for_tree(dataset, attributes, strategy='equal_width', target_attr=None):
+    """Discretizes all numeric attributes in the dataset for the decision tree.
+    `strategy` is a binning_logic strategy; 'entropy' bins against `target_attr`."""
+    # Cells are immutable scalars, so copying each row is enough to leave `dataset` untouched.
+    processed_dataset = [dict(row) for row in dataset]
     for attr in attributes:
         # Check if the column is likely numeric and continuous
         if any(isinstance(row.get(attr), float) for row in processed_dataset):
-             _discretize_column(processed_dataset, attr)
+             _discretize_column(processed_dataset, attr, strategy=strategy, target_attr=target_attr)
         else: # For integer types, check if there are many unique values
             unique_values = set(row[attr] for row in processed_dataset if isinstance(row.get(attr), int))
             if len(unique_values) > 5: # Threshold for when to discretize integers
-                _discretize_column(processed_dataset, attr)
+                _discretize_column(processed_dataset, attr, strategy=strategy, target_attr=target_attr)
     return processed_dataset
 
 def calculate_entropy(data, target_attr):
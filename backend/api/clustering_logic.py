@@ -0,0 +1,559 @@
+import math
+import os
+import random
+
+from .compat import np  # None without NumPy: the same algorithms run on lists of rows
+from . import processing_logic
+
+# Rows per block when computing point-to-centroid distances with NumPy.
+DISTANCE_BLOCK = 4096
+
+
+def feature_matrix(columnar, columns):
+    """Rows of `columns` where every cell is a number: an (n, d) float64
+    array with NumPy, a list of row lists without it."""
+    if np is None:
+        arrays, mask = columnar.aligned(columns)
+        return processing_logic.matrix_from_columns(arrays, mask)
+    matrix = np.column_stack([np.frombuffer(columnar.floats(column), dtype=np.float64) for column in columns])
+    return matrix[~np.isnan(matrix).any(axis=1)]
+
+
+def _sq_dist(a, b):
+    return sum((x - y) ** 2 for x, y in zip(a, b))
+
+
+# -----------------------------
+# k-means++ seeding
+# -----------------------------
+def _kmeans_pp_python(points, k, rng):
+    centers = [list(points[rng.randrange(len(points))])]
+    d2 = [_sq_dist(p, centers[0]) for p in points]
+    while len(centers) < k:
+        total = sum(d2)
+        if total == 0: break  # fewer distinct points than k
+        target, acc = rng.random() * total, 0.0
+        for i, weight in enumerate(d2):
+            acc += weight
+            if acc >= target and weight > 0: break
+        centers.append(list(points[i]))
+        d2 = [min(d, _sq_dist(p, centers[-1])) for d, p in zip(d2, points)]
+    return centers
+
+
+def _kmeans_pp_numpy(X, k, rng):
+    centers = [X[rng.integers(len(X))]]
+    d2 = ((X - centers[0]) ** 2).sum(axis=1)
+    while len(centers) < k:
+        total = d2.sum()
+        if total == 0: break
+        centers.append(X[rng.choice(len(X), p=d2 / total)])
+        d2 = np.minimum(d2, ((X - centers[-1]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+def kmeans_plus_plus(points, k, seed=None):
+    """k-means++ seeds: each next centre is drawn with probability
+    proportional to its squared distance to the nearest centre so far."""
+    if np is not None and isinstance(points, np.ndarray):
+        return _kmeans_pp_numpy(points, k, np.random.default_rng(seed))
+    return _kmeans_pp_python(points, k, random.Random(seed))
+
+
+# -----------------------------
+# Hamerly's k-means
+# -----------------------------
+# Every point keeps an upper bound on the distance to its centre and a lower
+# bound on the distance to any other centre. After the centres move the
+# bounds are loosened by the movement, and a point is only re-examined when
+# its upper bound exceeds both its lower bound and half the distance from its
+# centre to the nearest other centre.
+def _nearest_two_python(p, centers):
+    best = second = math.inf
+    best_j = 0
+    for j, c in enumerate(centers):
+        d = math.sqrt(_sq_dist(p, c))
+        if d < best: second, best, best_j = best, d, j
+        elif d < second: second = d
+    return best_j, best, second
+
+
+def _hamerly_python(points, centers, max_iter, tol):
+    k, dim = len(centers), len(points[0])
+    state = [_nearest_two_python(p, centers) for p in points]
+    assign = [s[0] for s in state]
+    upper = [s[1] for s in state]
+    lower = [s[2] for s in state]
+    iterations, converged = 0, False
+    for iterations in range(1, max_iter + 1):
+        sums, counts = [[0.0] * dim for _ in range(k)], [0] * k
+        for p, a in zip(points, assign):
+            counts[a] += 1
+            total = sums[a]
+            for d, x in enumerate(p): total[d] += x
+        new_centers = [[v / counts[j] for v in sums[j]] if counts[j] else centers[j] for j in range(k)]
+        moves = [math.sqrt(_sq_dist(a, b)) for a, b in zip(new_centers, centers)]
+        centers = new_centers
+        if max(moves) <= tol:
+            converged = True
+            break
+        max_move = max(moves)
+        half = [0.5 * min((math.sqrt(_sq_dist(c, o)) for o_j, o in enumerate(centers) if o_j != j), default=math.inf) for j, c in enumerate(centers)]
+        for i, p in enumerate(points):
+            a = assign[i]
+            upper[i] += moves[a]
+            lower[i] -= max_move
+            bound = max(half[a], lower[i])
+            if upper[i] <= bound: continue
+            upper[i] = math.sqrt(_sq_dist(p, centers[a]))
+            if upper[i] <= bound: continue
+            assign[i], upper[i], lower[i] = _nearest_two_python(p, centers)
+    assign = [_nearest_two_python(p, centers)[0] for p in points]
+    inertia = sum(_sq_dist(p, centers[a]) for p, a in zip(points, assign))
+    return centers, assign, inertia, iterations, converged
+
+
+def _distances(X, C):
+    """(n, k) Euclidean distances, computed a block of rows at a time."""
+    out = np.empty((len(X), len(C)))
+    for start in range(0, len(X), DISTANCE_BLOCK):
+        block = X[start:start + DISTANCE_BLOCK]
+        out[start:start + DISTANCE_BLOCK] = np.sqrt(((block[:, None, :] - C[None, :, :]) ** 2).sum(axis=2))
+    return out
+
+
+def _nearest_two_numpy(X, C):
+    D = _distances(X, C)
+    rows = np.arange(len(X))
+    assign = D.argmin(axis=1)
+    upper = D[rows, assign]
+    D[rows, assign] = np.inf
+    lower = D.min(axis=1) if C.shape[0] > 1 else np.full(len(X), np.inf)
+    return assign, upper, lower
+
+
+def _hamerly_numpy(X, C, max_iter, tol):
+    k = len(C)
+    assign, upper, lower = _nearest_two_numpy(X, C)
+    iterations, converged = 0, False
+    for iterations in range(1, max_iter + 1):
+        counts = np.bincount(assign, minlength=k)
+        sums = np.column_stack([np.bincount(assign, weights=X[:, d], minlength=k) for d in range(X.shape[1])])
+        new_C = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], C)
+        moves = np.sqrt(((new_C - C) ** 2).sum(axis=1))
+        C = new_C
+        if moves.max() <= tol:
+            converged = True
+            break
+        upper += moves[assign]
+        lower -= moves.max()
+        between = _distances(C, C)
+        np.fill_diagonal(between, np.inf)
+        half = 0.5 * between.min(axis=1)
+        bound = np.maximum(half[assign], lower)
+        idx = np.nonzero(upper > bound)[0]
+        if idx.size:
+            upper[idx] = np.sqrt(((X[idx] - C[assign[idx]]) ** 2).sum(axis=1))
+            idx = idx[upper[idx] > bound[idx]]
+            if idx.size: assign[idx], upper[idx], lower[idx] = _nearest_two_numpy(X[idx], C)
+    assign = _distances(X, C).argmin(axis=1)
+    inertia = float(((X - C[assign]) ** 2).sum())
+    return C.tolist(), assign.tolist(), inertia, iterations, converged
+
+
+def k_means(points, k=3, max_iter=100, seed=None, init='k-means++', tol=1e-6):
+    """k-means with k-means++ (or random) seeding and Hamerly's bound pruning.
+    Returns the centroids, the first 200 assignments, the inertia (sum of
+    squared distances to the assigned centroid) and the iterations used."""
+    if k < 1: raise ValueError("k must be at least 1.")
+    if len(points) == 0: return {'error': 'No numeric data found for selected columns.'}
+    n = len(points)
+    if init == 'random':
+        chosen = random.Random(seed).sample(range(n), min(k, n))
+        centers = points[chosen] if np is not None and isinstance(points, np.ndarray) else [list(points[i]) for i in chosen]
+    else:
+        centers = kmeans_plus_plus(points, min(k, n), seed)
+    if np is not None and isinstance(points, np.ndarray):
+        centroids, assignments, inertia, iterations, converged = _hamerly_numpy(points, np.array(centers, dtype=np.float64), max_iter, tol)
+    else:
+        centroids, assignments, inertia, iterations, converged = _hamerly_python(points, centers, max_iter, tol)
+    return {
+        'task': 'k_means',
+        'k': len(centroids),
+        'centroids': centroids,
+        'assignments_sample': assignments[:200],
+        'inertia': inertia,
+        'iterations': iterations,
+        'converged': converged,
+        'init': init,
+    }
+
+
+# -----------------------------
+# Mini-batch k-means (out of core)
+# -----------------------------
+def iter_blocks(columnar, columns, block_rows, starts=None):
+    """Yields (start, points, valid) for consecutive blocks of rows read from
+    the memory-mapped sidecar columns; `valid[i]` is False when a cell of row
+    start + i is not a number. Only one block is held in memory at a time."""
+    arrays = [columnar.floats(column) for column in columns]
+    for start in (range(0, columnar.row_count, block_rows) if starts is None else starts):
+        if np is not None:
+            block = np.column_stack([np.frombuffer(array[start:start + block_rows], dtype=np.float64) for array in arrays])
+            valid = ~np.isnan(block).any(axis=1)
+        else:
+            block = [list(cells) for cells in zip(*[array[start:start + block_rows] for array in arrays])]
+            valid = [not any(math.isnan(x) for x in cells) for cells in block]
+        yield start, block, valid
+
+
+class MiniBatchKMeans:
+    """Sculley's mini-batch k-means. Each centroid is the running mean of
+    every point assigned to it so far, updated once per batch, so memory is
+    bounded by one batch regardless of the dataset size."""
+
+    def __init__(self, k=3, batch_size=1024, seed=None, tol=1e-4):
+        if k < 1: raise ValueError("k must be at least 1.")
+        if batch_size < 1: raise ValueError("batch_size must be at least 1.")
+        self.k = k
+        self.batch_size = batch_size
+        self.seed = seed
+        self.tol = tol
+        self.centroids = None
+        self.counts = None
+        self.epochs = 0
+        self.batches = 0
+
+    def _valid_points(self, block, valid):
+        if np is not None: return block[valid]
+        return [p for p, ok in zip(block, valid) if ok]
+
+    def _nearest(self, points):
+        """Index of and squared distance to the nearest centroid of every point."""
+        if np is not None:
+            labels = _distances(points, self.centroids).argmin(axis=1)
+            return labels, ((points - self.centroids[labels]) ** 2).sum(axis=1)
+        labels = [min(range(len(self.centroids)), key=lambda j: _sq_dist(p, self.centroids[j])) for p in points]
+        return labels, [_sq_dist(p, self.centroids[j]) for p, j in zip(points, labels)]
+
+    def _init(self, columnar, columns):
+        """k-means++ over up to `batch_size` rows drawn uniformly from the
+        whole file (only the sampled rows are read from the memory map)."""
+        rng = random.Random(self.seed)
+        picked = sorted(rng.sample(range(columnar.row_count), min(columnar.row_count, self.batch_size)))
+        arrays = [columnar.floats(column) for column in columns]
+        sample = [[array[i] for array in arrays] for i in picked]
+        sample = [p for p in sample if not any(math.isnan(x) for x in p)]
+        if not sample: return False
+        if np is not None:
+            self.centroids = kmeans_plus_plus(np.array(sample), min(self.k, len(sample)), self.seed)
+            self.counts = np.zeros(len(self.centroids))
+        else:
+            self.centroids = kmeans_plus_plus(sample, min(self.k, len(sample)), self.seed)
+            self.counts = [0] * len(self.centroids)
+        return True
+
+    def partial_fit(self, points):
+        """Moves the centroids towards one batch of valid points."""
+        if len(points) == 0: return
+        labels, _ = self._nearest(points)
+        if np is not None:
+            k = len(self.centroids)
+            sizes = np.bincount(labels, minlength=k)
+            sums = np.column_stack([np.bincount(labels, weights=points[:, d], minlength=k) for d in range(points.shape[1])])
+            self.counts += sizes
+            moved = sizes > 0
+            self.centroids[moved] += (sums[moved] - sizes[moved, None] * self.centroids[moved]) / self.counts[moved, None]
+        else:
+            for p, j in zip(points, labels):
+                self.counts[j] += 1
+                eta = 1 / self.counts[j]
+                self.centroids[j] = [c + eta * (x - c) for c, x in zip(self.centroids[j], p)]
+        self.batches += 1
+
+    def fit(self, columnar, columns, max_epochs=10):
+        """Streams shuffled batches from the sidecar for up to `max_epochs`
+        passes, stopping once an epoch moves no centroid more than `tol`."""
+        if not self._init(columnar, columns): return self
+        rng = random.Random(self.seed)
+        starts = list(range(0, columnar.row_count, self.batch_size))
+        for self.epochs in range(1, max_epochs + 1):
+            before = [list(c) for c in self.centroids]
+            rng.shuffle(starts)
+            for _, block, valid in iter_blocks(columnar, columns, self.batch_size, starts):
+                self.partial_fit(self._valid_points(block, valid))
+            if max(math.sqrt(_sq_dist(a, b)) for a, b in zip(before, self.centroids)) <= self.tol: break
+        return self
+
+    def assignments(self, columnar, columns):
+        """Final streaming pass: yields the cluster of every row in file order
+        (None when a feature cell is not a number) and accumulates `inertia`
+        and `sizes`."""
+        self.inertia, self.sizes = 0.0, [0] * len(self.centroids)
+        for _, block, valid in iter_blocks(columnar, columns, self.batch_size):
+            labels, sq = self._nearest(self._valid_points(block, valid))
+            labels = iter(labels.tolist() if np is not None else labels)
+            self.inertia += float(sum(sq))
+            for ok in (valid.tolist() if np is not None else valid):
+                if not ok:
+                    yield None
+                    continue
+                label = next(labels)
+                self.sizes[label] += 1
+                yield label
+
+
+# -----------------------------
+# k-medoids: FastPAM, CLARA, CLARANS
+# -----------------------------
+# FastPAM keeps every pairwise distance, so it is used up to this many rows;
+# larger inputs are clustered on samples (CLARA) or by randomized search (CLARANS).
+PAM_MAX_ROWS = 3000
+# Distance evaluations below which CLARA/CLARANS runs stay in-process unless
+# `workers` asks for a pool: starting worker processes costs more than that.
+PARALLEL_MIN_WORK = 5_000_000
+
+
+class CondensedDistances:
+    """Euclidean distances between n points, stored once per pair (i < j):
+    n * (n - 1) / 2 floats instead of n * n."""
+
+    def __init__(self, points):
+        n = self.n = len(points)
+        self._offsets = [n * i - i * (i + 1) // 2 - i - 1 for i in range(n)]
+        if np is not None:
+            X = np.asarray(points, dtype=np.float64)
+            self.data = np.concatenate([np.sqrt(((X[i + 1:] - X[i]) ** 2).sum(axis=1)) for i in range(n - 1)]) if n > 1 else np.empty(0)
+            self._offsets = np.array(self._offsets)
+            self._columns = np.arange(n)
+        else:
+            self.data = [math.sqrt(_sq_dist(points[i], points[j])) for i in range(n) for j in range(i + 1, n)]
+
+    def row(self, i):
+        """Distances from point i to every point (0 for itself)."""
+        if np is not None:
+            j = self._columns
+            row = self.data[self._offsets[np.minimum(i, j)] + np.maximum(i, j)]
+            row[i] = 0.0
+            return row
+        offsets, data = self._offsets, self.data
+        return [data[offsets[j] + i] if j < i else data[offsets[i] + j] if j > i else 0.0 for j in range(self.n)]
+
+
+def _total(values):
+    return float(values.sum()) if np is not None else sum(values)
+
+
+def _nearest_medoids(rows):
+    """For k rows of distances (one per medoid): the nearest medoid slot of
+    every point, the distance to it and the distance to the second nearest."""
+    if np is not None:
+        R = np.vstack(rows)
+        columns = np.arange(R.shape[1])
+        near = R.argmin(axis=0)
+        dn = R[near, columns]
+        R[near, columns] = np.inf
+        return near, dn, R.min(axis=0)
+    near, dn, ds = [], [], []
+    for cells in zip(*rows):
+        order = sorted(range(len(cells)), key=cells.__getitem__)
+        near.append(order[0])
+        dn.append(cells[order[0]])
+        ds.append(cells[order[1]] if len(order) > 1 else math.inf)
+    return near, dn, ds
+
+
+def _build(dist, k):
+    """PAM BUILD: greedily adds the medoid that lowers the total distance most."""
+    n = dist.n
+    sums = [_total(dist.row(c)) for c in range(n)]
+    medoids = [min(range(n), key=sums.__getitem__)]
+    dn = dist.row(medoids[0])
+    while len(medoids) < k:
+        best, best_gain = None, -1.0
+        for c in range(n):
+            if c in medoids: continue
+            row = dist.row(c)
+            gain = float(np.maximum(dn - row, 0).sum()) if np is not None else sum(max(a - b, 0) for a, b in zip(dn, row))
+            if gain > best_gain: best, best_gain = c, gain
+        medoids.append(best)
+        row = dist.row(best)
+        dn = np.minimum(dn, row) if np is not None else [min(a, b) for a, b in zip(dn, row)]
+    return medoids
+
+
+def _swap_deltas(row, near, dn, ds, removal, k):
+    """FastPAM1: change in total distance when candidate c (distances `row`)
+    replaces each of the k medoids, from one scan over the points."""
+    if np is not None:
+        closer = row < dn
+        shared = float((row - dn)[closer].sum())
+        second = ~closer & (row < ds)
+        delta = removal + np.bincount(near[closer], weights=(dn - ds)[closer], minlength=k) + np.bincount(near[second], weights=(row - ds)[second], minlength=k)
+        return delta + shared
+    delta, shared = list(removal), 0.0
+    for d, m, a, b in zip(row, near, dn, ds):
+        if d < a:
+            shared += d - a
+            delta[m] += a - b
+        elif d < b:
+            delta[m] += d - b
+    return [x + shared for x in delta]
+
+
+def fast_pam(points, k=3, max_iter=100):
+    """k-medoids by PAM BUILD and FastPAM1 swaps over a condensed distance
+    matrix. Each iteration evaluates every (medoid, non-medoid) swap in
+    O(n^2) total and applies the best one while it lowers the cost."""
+    n = len(points)
+    if not 1 <= k <= n: raise ValueError("k must be between 1 and the number of points.")
+    dist = CondensedDistances(points)
+    if k == 1:
+        medoids = [min(range(n), key=lambda c: _total(dist.row(c)))]
+        near, dn, _ = _nearest_medoids([dist.row(medoids[0])])
+        return medoids, near, _total(dn), 0
+    medoids = _build(dist, k)
+    swaps = 0
+    for _ in range(max_iter):
+        near, dn, ds = _nearest_medoids([dist.row(m) for m in medoids])
+        if np is not None: removal = np.bincount(near, weights=ds - dn, minlength=k)
+        else:
+            removal = [0.0] * k
+            for m, a, b in zip(near, dn, ds): removal[m] += b - a
+        best, best_delta = None, -1e-12
+        chosen = set(medoids)
+        for c in range(n):
+            if c in chosen: continue
+            delta = _swap_deltas(dist.row(c), near, dn, ds, removal, k)
+            i = min(range(k), key=delta.__getitem__)
+            if delta[i] < best_delta: best, best_delta = (i, c), delta[i]
+        if best is None: break
+        medoids[best[0]] = best[1]
+        swaps += 1
+    near, dn, _ = _nearest_medoids([dist.row(m) for m in medoids])
+    return medoids, near, _total(dn), swaps
+
+
+def _medoid_cost(points, medoids):
+    """Nearest-medoid slot of every point and the total distance, without a distance matrix."""
+    if np is not None:
+        D = _distances(points, points[medoids])
+        near = D.argmin(axis=1)
+        return near, float(D[np.arange(len(points)), near].sum())
+    centers = [points[m] for m in medoids]
+    near = [_nearest_two_python(p, centers)[0] for p in points]
+    return near, sum(math.sqrt(_sq_dist(p, centers[j])) for p, j in zip(points, near))
+
+
+def _run_parallel(fn, tasks, workers, work):
+    """Runs `fn` over `tasks`, in a process pool when `workers` > 1 is given or,
+    with `workers` None, when the estimated distance evaluations (`work`)
+    reach PARALLEL_MIN_WORK; inline otherwise."""
+    if workers is None: workers = (os.cpu_count() or 1) if work >= PARALLEL_MIN_WORK else 1
+    workers = min(workers, len(tasks))
+    if workers <= 1: return [fn(task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, tasks))
+
+
+def _clara_sample(task):
+    sample, k, max_iter = task
+    return fast_pam(sample, k, max_iter)[0]
+
+
+def clara(points, k=3, samples=5, sample_size=None, max_iter=100, workers=None, seed=None):
+    """CLARA: FastPAM on `samples` random samples (40 + 2k rows by default),
+    in a process pool when large enough (see `_run_parallel`); the medoids
+    with the lowest total distance on the whole data win."""
+    n = len(points)
+    if samples < 1: raise ValueError("samples must be at least 1.")
+    if sample_size is not None and sample_size < k: raise ValueError("sample_size must be at least k.")
+    size = min(n, sample_size or 40 + 2 * k)
+    rng = random.Random(seed)
+    draws = [sorted(rng.sample(range(n), size)) for _ in range(samples)]
+    tasks = [(points[draw] if np is not None else [points[i] for i in draw], k, max_iter) for draw in draws]
+    best = None
+    for draw, sample_medoids in zip(draws, _run_parallel(_clara_sample, tasks, workers, samples * size * size)):
+        medoids = [draw[i] for i in sample_medoids]
+        near, cost = _medoid_cost(points, medoids)
+        if best is None or cost < best[2]: best = (medoids, near, cost)
+    return best + (samples,)
+
+
+def _clarans_search(task):
+    """One CLARANS local search: random swaps, each evaluated in O(n) from the
+    nearest/second-nearest distances, until `max_neighbor` fail in a row."""
+    points, k, max_neighbor, seed = task
+    rng = random.Random(seed)
+    n = len(points)
+    medoids = rng.sample(range(n), k)
+    def distances_to(c):
+        if np is not None: return np.sqrt(((points - points[c]) ** 2).sum(axis=1))
+        return [math.sqrt(_sq_dist(p, points[c])) for p in points]
+    near, dn, ds = _nearest_medoids([distances_to(m) for m in medoids])
+    failures = 0
+    while failures < max_neighbor:
+        i, c = rng.randrange(k), rng.randrange(n)
+        if c in medoids: continue
+        dc = distances_to(c)
+        if np is not None:
+            new = np.where(near == i, np.minimum(dc, ds), np.minimum(dn, dc))
+            delta = float((new - dn).sum())
+        else:
+            delta = sum((min(d, b) if m == i else min(a, d)) - a for d, m, a, b in zip(dc, near, dn, ds))
+        if delta < -1e-12:
+            medoids[i] = c
+            near, dn, ds = _nearest_medoids([distances_to(m) for m in medoids])
+            failures = 0
+        else:
+            failures += 1
+    return medoids, _total(dn)
+
+
+def clarans(points, k=3, num_local=2, max_neighbor=250, workers=None, seed=None):
+    """CLARANS: `num_local` randomized local searches, in a process pool when
+    large enough; the one ending with the lowest total distance wins."""
+    if num_local < 1 or max_neighbor < 1: raise ValueError("num_local and max_neighbor must be at least 1.")
+    rng = random.Random(seed)
+    tasks = [(points, k, max_neighbor, rng.random()) for _ in range(num_local)]
+    medoids, _ = min(_run_parallel(_clarans_search, tasks, workers, num_local * max_neighbor * len(points)), key=lambda result: result[1])
+    near, cost = _medoid_cost(points, medoids)
+    return medoids, near, cost, num_local
+
+
+KMEDOID_METHODS = ('fastpam', 'clara', 'clarans')
+
+
+def k_medoids(points, k=3, max_iter=100, method=None, seed=None, workers=None, samples=5, sample_size=None, num_local=2, max_neighbor=250):
+    """k-medoids returning the medoids, the first 200 assignments and the
+    total distance (cost). `method` defaults to FastPAM up to PAM_MAX_ROWS
+    rows and CLARA above."""
+    n = len(points)
+    if k < 1: raise ValueError("k must be at least 1.")
+    if n == 0: return {'error': 'No numeric data found for selected columns.'}
+    if np is not None: points = np.asarray(points, dtype=np.float64)
+    rows = points.tolist() if np is not None else points
+    if k >= n:
+        return {'task': 'k_medoid', 'k': n, 'medoids': rows, 'assignments_sample': list(range(n))[:200]}
+    method = method or ('fastpam' if n <= PAM_MAX_ROWS else 'clara')
+    if method == 'fastpam':
+        medoids, near, cost, swaps = fast_pam(points, k, max_iter)
+        extra = {'swaps': swaps}
+    elif method == 'clara':
+        medoids, near, cost, runs = clara(points, k, samples, sample_size, max_iter, workers, seed)
+        extra = {'samples': runs}
+    elif method == 'clarans':
+        medoids, near, cost, runs = clarans(points, k, num_local, max_neighbor, workers, seed)
+        extra = {'local_searches': runs}
+    else:
+        raise ValueError(f"Unknown k-medoids method: {method}")
+    near = near.tolist() if hasattr(near, 'tolist') else near
+    return dict({
+        'task': 'k_medoid',
+        'k': k,
+        'medoids': [rows[m] for m in medoids],
+        'assignments_sample': near[:200],
+        'cost': cost,
+        'method': method,
+    }, **extra)
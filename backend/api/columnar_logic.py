@@ -0,0 +1,521 @@
+import array
+import csv
+import io
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from . import processing_logic
+
+# Sidecars live next to the uploaded file: media/.columnar/<filename>/
+SIDECAR_DIR = '.columnar'
+SIDECAR_VERSION = 3
+META_FILE = 'meta.json'
+ROW_INDEX_FILE = 'rows.idx'
+
+# Column kinds stored in the sidecar:
+#   numeric - every cell parsed as a float, only a float64 array is written
+#   string  - no cell parsed as a float, only dictionary codes are written
+#   mixed   - both arrays are written, a code of -1 means "use the float"
+NUMERIC, STRING, MIXED = 'numeric', 'string', 'mixed'
+NUMERIC_CODE = -1
+# Columns with blank cells also get `<index>.null`: bit r (byte r // 8,
+# bit r % 8) is set when row r is blank, i.e. None or only whitespace.
+NULL_SUFFIX = 'null'
+
+
+def sidecar_path(file_path):
+    directory, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, SIDECAR_DIR, name)
+
+
+def remove_sidecar(file_path):
+    """Deletes the columnar sidecar of a dataset, if there is one, and its cached rows."""
+    dataset_cache.invalidate(file_path)
+    path = sidecar_path(file_path)
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _source_signature(file_path):
+    stat = os.stat(file_path)
+    return {'source_size': stat.st_size, 'source_mtime_ns': stat.st_mtime_ns}
+
+
+_RECORD_TOKENS = re.compile(rb'["\n]')
+
+
+class RowIndexer:
+    """Records the byte offset of every data row while raw CSV bytes stream past.
+
+    A newline only ends a record outside double quotes, so quoted fields that
+    contain newlines stay in one record. Blank lines are skipped like csv.DictReader.
+    """
+
+    def __init__(self):
+        self.offsets = array.array('Q')
+        self._position = 0
+        self._record_start = 0
+        self._has_content = False
+        self._in_quotes = False
+        self._header_seen = False
+
+    def _end_record(self):
+        if not self._header_seen:
+            self._header_seen = True
+        elif self._has_content:
+            self.offsets.append(self._record_start)
+
+    def feed(self, chunk):
+        last = 0
+        for match in _RECORD_TOKENS.finditer(chunk):
+            pos = match.start()
+            if not self._has_content and chunk[last:pos].strip(b'\r'): self._has_content = True
+            if match.group() == b'"':
+                self._in_quotes = not self._in_quotes
+                self._has_content = True
+            elif not self._in_quotes:
+                self._end_record()
+                self._record_start = self._position + pos + 1
+                self._has_content = False
+            last = pos + 1
+        if not self._has_content and chunk[last:].strip(b'\r'): self._has_content = True
+        self._position += len(chunk)
+
+    def finish(self):
+        if self._has_content: self._end_record()
+        self._has_content = False
+        return self.offsets
+
+
+def index_rows(file_path, chunk_size=1 << 20):
+    """Builds the row offset index of a CSV file on disk."""
+    indexer = RowIndexer()
+    with open(file_path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b''):
+            indexer.feed(chunk)
+    return indexer.finish()
+
+
+# Rows a SidecarBuilder keeps in memory before appending them to the column
+# files; a multiple of 8, so the null bitmaps of consecutive chunks concatenate.
+SPILL_ROWS = 1 << 16
+
+
+class SidecarBuilder:
+    """Accumulates parsed CSV rows column by column and writes the sidecar.
+
+    Cells are converted exactly like `processing_logic.load_full_data` does, so
+    rows rebuilt from the sidecar are identical to the ones parsed from the CSV.
+    Given `file_path`, every SPILL_ROWS rows are appended to the column files
+    of a staging directory, so only the dictionaries, the null bitmaps and the
+    current chunk are held in memory.
+    """
+
+    def __init__(self, header, column_types=None, file_path=None):
+        self.header = header
+        self.width = len(header)
+        self.converters = processing_logic.cell_converters(header, column_types)
+        self.floats = [array.array('d') for _ in range(self.width)]
+        self.codes = [array.array('i') for _ in range(self.width)]
+        self.dictionaries = [{} for _ in range(self.width)]
+        self.blank_codes = [set() for _ in range(self.width)]
+        self.null_bitmaps = [bytearray() for _ in range(self.width)]
+        self.missing = [0] * self.width
+        self.numbers = [0] * self.width
+        self.row_count = 0
+        self.staging = _staging_path(file_path) if file_path is not None else None
+
+    def add_row(self, row):
+        for i in range(self.width):
+            value = self.converters[i](row[i] if i < len(row) else None)
+            if isinstance(value, float):
+                self.floats[i].append(value)
+                self.codes[i].append(NUMERIC_CODE)
+            else:
+                dictionary = self.dictionaries[i]
+                code = dictionary.get(value)
+                if code is None:
+                    code = dictionary[value] = len(dictionary)
+                    if value is None or str(value).strip() == '': self.blank_codes[i].add(code)
+                self.floats[i].append(math.nan)
+                self.codes[i].append(code)
+        self.row_count += 1
+        if self.staging is not None and self.row_count % SPILL_ROWS == 0: self._spill()
+
+    def number_count(self, i):
+        """Cells of column `i` parsed as numbers so far."""
+        return self.numbers[i] + self.codes[i].count(NUMERIC_CODE)
+
+    def _spill(self):
+        for i in range(self.width):
+            with open(os.path.join(self.staging, f'{i}.f64'), 'ab') as fh: self.floats[i].tofile(fh)
+            with open(os.path.join(self.staging, f'{i}.codes'), 'ab') as fh: self.codes[i].tofile(fh)
+            bitmap, missing = _null_bitmap(self.codes[i], self.blank_codes[i])
+            self.null_bitmaps[i] += bitmap
+            self.missing[i] += missing
+            self.numbers[i] += self.codes[i].count(NUMERIC_CODE)
+            self.floats[i], self.codes[i] = array.array('d'), array.array('i')
+
+    def write(self, file_path, row_offsets=None):
+        """Writes the sidecar of `file_path`, which must be complete on disk.
+
+        `row_offsets` comes from a RowIndexer fed during the same pass; the file
+        is scanned for it otherwise.
+        """
+        if row_offsets is None: row_offsets = index_rows(file_path)
+        final_path = sidecar_path(file_path)
+        if self.staging is None: self.staging = _staging_path(file_path)
+        tmp_path = self.staging
+        self._spill()
+        with open(os.path.join(tmp_path, ROW_INDEX_FILE), 'wb') as fh: row_offsets.tofile(fh)
+
+        columns = []
+        for i, name in enumerate(self.header):
+            if not self.dictionaries[i]: kind = NUMERIC
+            elif self.numbers[i] == 0: kind = STRING
+            else: kind = MIXED
+            if kind == STRING: os.remove(os.path.join(tmp_path, f'{i}.f64'))
+            if kind == NUMERIC: os.remove(os.path.join(tmp_path, f'{i}.codes'))
+            if self.missing[i]:
+                with open(os.path.join(tmp_path, f'{i}.{NULL_SUFFIX}'), 'wb') as fh: fh.write(self.null_bitmaps[i])
+            columns.append({'name': name, 'kind': kind, 'dictionary': list(self.dictionaries[i]), 'missing': self.missing[i]})
+
+        meta = {'version': SIDECAR_VERSION, 'header': self.header, 'row_count': self.row_count, 'columns': columns}
+        meta.update(_source_signature(file_path))
+        with open(os.path.join(tmp_path, META_FILE), 'w', encoding='utf-8') as fh:
+            json.dump(meta, fh)
+
+        remove_sidecar(file_path)
+        os.replace(tmp_path, final_path)
+        return meta
+
+
+def _staging_path(file_path):
+    """Creates the empty directory a sidecar is written to before it replaces the old one."""
+    path = sidecar_path(file_path) + '.tmp'
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    return path
+
+
+def _null_bitmap(codes, blank):
+    """Bitmap of the rows whose code is one of the `blank` codes, and their number."""
+    bitmap = bytearray((len(codes) + 7) // 8)
+    missing = 0
+    if blank:
+        for r, code in enumerate(codes):
+            if code in blank:
+                bitmap[r >> 3] |= 1 << (r & 7)
+                missing += 1
+    return bitmap, missing
+
+
+def build_sidecar(file_path, column_types=None):
+    """Parses the CSV once and writes one typed binary array per column."""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found at {file_path}")
+
+    with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        builder = SidecarBuilder(next(reader, []), column_types, file_path)
+        for row in reader:
+            if not row: continue  # csv.DictReader skips blank lines as well
+            builder.add_row(row)
+    return builder.write(file_path)
+
+
+def _map_array(path, typecode, length):
+    """Memory-maps a binary column file and exposes it as a typed memoryview."""
+    if length == 0:
+        return memoryview(array.array(typecode))
+    with open(path, 'rb') as fh:
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+
+class ColumnarDataset:
+    """Read-only view over a dataset sidecar, columns are mapped lazily."""
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self.header = meta['header']
+        self.row_count = meta['row_count']
+        self._columns = {}
+        for i, col in enumerate(meta['columns']):
+            self._columns[col['name']] = (i, col)
+        self._mapped = {}
+
+    def __len__(self):
+        return self.row_count
+
+    def kind(self, column):
+        return self._info(column)[1]['kind']
+
+    def _info(self, column):
+        if column not in self._columns:
+            raise ValueError(f"Column '{column}' not found in the file.")
+        return self._columns[column]
+
+    def column_file(self, column, suffix):
+        """Path of a per-column file in the sidecar, e.g. `column_file(col, 'f64')`."""
+        index, _ = self._info(column)
+        return os.path.join(self.path, f'{index}.{suffix}')
+
+    def pair_file(self, column1, column2, suffix):
+        """Path of a file about a column pair in the sidecar, e.g. a graph index."""
+        return os.path.join(self.path, f'{self._info(column1)[0]}-{self._info(column2)[0]}.{suffix}')
+
+    def _array(self, column, suffix, typecode):
+        key = (self._info(column)[0], suffix)
+        if key not in self._mapped:
+            self._mapped[key] = _map_array(self.column_file(column, suffix), typecode, self.row_count)
+        return self._mapped[key]
+
+    def floats(self, column):
+        """float64 view of a column, NaN where the cell is not a number."""
+        if self.kind(column) == STRING:
+            return memoryview(array.array('d', [math.nan]) * self.row_count)
+        return self._array(column, 'f64', 'd')
+
+    def codes(self, column):
+        """Dictionary codes of a column, -1 where the cell is a number."""
+        if self.kind(column) == NUMERIC:
+            return memoryview(array.array('i', [NUMERIC_CODE]) * self.row_count)
+        return self._array(column, 'codes', 'i')
+
+    def dictionary(self, column):
+        return self._info(column)[1]['dictionary']
+
+    def numeric_values(self, column):
+        """Numeric cells of a column, in row order (matches `load_column_data`)."""
+        if self.kind(column) == NUMERIC:
+            return self.floats(column).tolist()
+        if self.kind(column) == STRING:
+            return []
+        return [f for f, c in zip(self.floats(column), self.codes(column)) if c == NUMERIC_CODE]
+
+    def missing_count(self, column):
+        """Number of blank cells in a column, counted when the sidecar was written."""
+        return self._info(column)[1]['missing']
+
+    def null_bitmap(self, column):
+        """Null bitmap of a column (see NULL_SUFFIX), or None when no cell is blank."""
+        if not self.missing_count(column): return None
+        return self._array(column, NULL_SUFFIX, 'B')
+
+    def missing_rows(self, column):
+        """Sorted indices of the rows whose cell in `column` is blank."""
+        bitmap = self.null_bitmap(column)
+        if bitmap is None: return []
+        rows = []
+        for i, byte in enumerate(bitmap):
+            if not byte: continue
+            rows.extend(i * 8 + bit for bit in range(8) if byte >> bit & 1)
+        return rows
+
+    def row_offsets(self):
+        """Byte offset in the CSV of every data row (memory-mapped)."""
+        if 'rows' not in self._mapped:
+            self._mapped['rows'] = _map_array(os.path.join(self.path, ROW_INDEX_FILE), 'Q', self.row_count)
+        return self._mapped['rows']
+
+    def iter_numeric(self, column):
+        """Streams the non-NaN numeric cells of a column straight from the memory map."""
+        kind = self.kind(column)
+        if kind == NUMERIC:
+            return (x for x in self.floats(column) if x == x)
+        if kind == STRING:
+            return iter(())
+        return (x for x, c in zip(self.floats(column), self.codes(column)) if c == NUMERIC_CODE and x == x)
+
+    def values(self, column):
+        """Every cell of a column as parsed by `load_full_data` (float or str)."""
+        kind = self.kind(column)
+        if kind == NUMERIC:
+            return self.floats(column).tolist()
+        dictionary = self.dictionary(column)
+        if kind == STRING:
+            return [dictionary[c] for c in self.codes(column)]
+        return [f if c == NUMERIC_CODE else dictionary[c] for f, c in zip(self.floats(column), self.codes(column))]
+
+    def iter_values(self, column):
+        """Lazy counterpart of `values`, reading the memory map cell by cell."""
+        kind = self.kind(column)
+        if kind == NUMERIC:
+            return iter(self.floats(column))
+        dictionary = self.dictionary(column)
+        if kind == STRING:
+            return (dictionary[c] for c in self.codes(column))
+        return (f if c == NUMERIC_CODE else dictionary[c] for f, c in zip(self.floats(column), self.codes(column)))
+
+    def iter_rows(self, columns=None):
+        """Streams fresh row dictionaries without materializing the whole dataset."""
+        names = list(dict.fromkeys(self.header if columns is None else columns))
+        if not names: return ({} for _ in range(self.row_count))
+        return (dict(zip(names, cells)) for cells in zip(*[self.iter_values(name) for name in names]))
+
+    def aligned(self, columns):
+        """Row-aligned float arrays for several columns plus their shared validity mask.
+
+        A row is valid when every requested cell is a number (NaN counts as missing).
+        """
+        arrays = [self.floats(column).tolist() for column in columns]
+        mask = [not any(math.isnan(x) for x in cells) for cells in zip(*arrays)] if arrays else []
+        return arrays, mask
+
+    def rows(self, columns=None):
+        """Rebuilds the list of row dictionaries for the given columns (all by default)."""
+        names = list(dict.fromkeys(self.header if columns is None else columns))
+        cols = [self.values(name) for name in names]
+        return [dict(zip(names, cells)) for cells in zip(*cols)] if names else [{} for _ in range(self.row_count)]
+
+
+def open_sidecar(file_path):
+    """Returns the sidecar of a CSV, or None if it is missing or out of date."""
+    path = sidecar_path(file_path)
+    try:
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != SIDECAR_VERSION: return None
+    try:
+        if any(meta.get(k) != v for k, v in _source_signature(file_path).items()): return None
+    except OSError:
+        return None
+    return ColumnarDataset(path, meta)
+
+
+def load_columnar(file_path, column_types=None):
+    """Opens the sidecar of a CSV, (re)building it first when it is missing or stale.
+
+    `column_types` (Dataset.column_types) selects fixed cell converters for the rebuild.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found at {file_path}")
+    columnar = open_sidecar(file_path)
+    if columnar is None:
+        build_sidecar(file_path, column_types)
+        columnar = open_sidecar(file_path)
+    return columnar
+
+
+# -----------------------------
+# Parsed dataset cache
+# -----------------------------
+def _estimate_size(rows):
+    """Approximate resident size of a list of row dicts, extrapolated from the first row."""
+    if not rows: return 0
+    sample = rows[0]
+    per_row = sys.getsizeof(sample) + sum(sys.getsizeof(v) for v in sample.values()) + 8
+    return per_row * len(rows)
+
+
+class DatasetCache:
+    """Process-wide LRU of parsed datasets bounded by an approximate memory budget.
+
+    Entries are keyed by path plus size/mtime of the source, so a re-uploaded file
+    never hits a stale entry. Rows are stored read-only (MappingProxyType); callers
+    that mutate rows get their own shallow copies, see `load_full_data`.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(file_path, *extra):
+        path = os.path.abspath(file_path)
+        signature = _source_signature(path)
+        return (path, signature['source_size'], signature['source_mtime_ns']) + extra
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+        rows = loader()
+        size = _estimate_size(rows)
+        rows = tuple(MappingProxyType(row) for row in rows)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (rows, size)
+                self._size += size
+                while self._size > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._size -= evicted
+        return rows
+
+    def invalidate(self, file_path):
+        path = os.path.abspath(file_path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self._size -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+# Budget is overridden from settings.DATASET_CACHE_MAX_BYTES in ApiConfig.ready
+dataset_cache = DatasetCache(max_bytes=256 * 1024 * 1024)
+
+
+# -----------------------------
+# Task loaders (drop-in for processing_logic.load_*)
+# -----------------------------
+def load_column_data(file_path, column_name, column_types=None):
+    """Loads the numeric cells of one column from the sidecar."""
+    return load_columnar(file_path, column_types).numeric_values(column_name)
+
+
+def load_full_data(file_path, column_types=None, readonly=False, columns=None):
+    """Loads the dataset as a list of dictionaries, through the dataset cache.
+
+    `columns` projects the rows onto the columns a task actually reads (all by
+    default), so only those are materialized and cached. With `readonly=True`
+    the shared cached rows are returned as is (read-only mappings); otherwise
+    every row is a fresh dict the caller may mutate.
+    """
+    projection = None if columns is None else tuple(dict.fromkeys(columns))
+    key = dataset_cache.key(file_path, projection)
+    rows = dataset_cache.get_or_load(key, lambda: load_columnar(file_path, column_types).rows(projection))
+    return rows if readonly else [dict(row) for row in rows]
+
+
+def load_aligned_columns(file_path, columns, column_types=None):
+    """Loads N columns in one pass as row-aligned float arrays and a shared validity mask."""
+    return load_columnar(file_path, column_types).aligned(columns)
+
+
+def compress(values, mask):
+    """Keeps the entries of `values` whose row is valid in `mask`."""
+    return [v for v, ok in zip(values, mask) if ok]
+
+
+def read_rows(file_path, offset, limit, column_types=None):
+    """Reads `limit` raw rows starting at data row `offset` by seeking through the row index."""
+    columnar = load_columnar(file_path, column_types)
+    offsets = columnar.row_offsets()
+    if offset >= len(offsets) or limit <= 0: return columnar.header, [], columnar.row_count
+    with open(file_path, 'rb') as fh:
+        fh.seek(offsets[offset])
+        reader = csv.reader(io.TextIOWrapper(fh, encoding='utf-8', newline=''))
+        rows = []
+        for row in reader:
+            if not row: continue
+            rows.append(row)
+            if len(rows) >= limit: break
+    return columnar.header, rows, columnar.row_count
@@ -0,0 +1,5 @@
+# Optional dependencies, imported once for every module; None when not installed.
+try:
+    import numpy as np
+except ImportError:  # the NumPy code paths fall back to pure Python
+    np = None
@@ -0,0 +1,129 @@
+import math
+from collections import Counter
+
+from . import columnar_logic
+
+
+def _category_order(value):
+    # Numbers and strings can share a mixed column; sort numbers first.
+    return (isinstance(value, str), value)
+
+
+def chi_square_sf(statistic, df):
+    """P(X >= statistic) for a chi-square distribution with `df` degrees of
+    freedom, i.e. the regularized upper incomplete gamma Q(df / 2, statistic / 2)."""
+    if df <= 0 or statistic <= 0: return 1.0
+    a, x = df / 2, statistic / 2
+    log_prefactor = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        # Series for the lower tail P(a, x).
+        term = total = 1.0 / a
+        ap = a
+        for _ in range(1000):
+            ap += 1
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * 1e-15: break
+        return max(0.0, 1.0 - total * math.exp(log_prefactor))
+    # Continued fraction for Q(a, x) (modified Lentz).
+    tiny = 1e-300
+    b = x + 1 - a
+    c, d = 1 / tiny, 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        if abs(d) < tiny: d = tiny
+        c = b + an / c
+        if abs(c) < tiny: c = tiny
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15: break
+    return min(1.0, math.exp(log_prefactor) * h)
+
+
+class ContingencyTable:
+    """Counts of (code1, code2) pairs, decoded to categories through `labels1`/`labels2`."""
+
+    def __init__(self, counts, labels1, labels2):
+        self.counts = counts
+        used1 = {i for i, _ in counts}
+        used2 = {j for _, j in counts}
+        self.codes1 = sorted(used1, key=lambda i: _category_order(labels1[i]))
+        self.codes2 = sorted(used2, key=lambda j: _category_order(labels2[j]))
+        self.labels1, self.labels2 = labels1, labels2
+
+    @classmethod
+    def from_codes(cls, codes1, labels1, codes2, labels2):
+        return cls(Counter(zip(codes1, codes2)), labels1, labels2)
+
+    def statistics(self):
+        """Chi-square statistic, degrees of freedom, p-value and Cramér's V."""
+        row_totals, col_totals = Counter(), Counter()
+        for (i, j), count in self.counts.items():
+            row_totals[i] += count
+            col_totals[j] += count
+        n = sum(row_totals.values())
+        if n == 0: return 0, 0, 1.0, 0.0
+        statistic = 0
+        for i in self.codes1:
+            for j in self.codes2:
+                expected = row_totals[i] * col_totals[j] / n
+                statistic += (self.counts.get((i, j), 0) - expected) ** 2 / expected
+        rows, cols = len(self.codes1), len(self.codes2)
+        df = (rows - 1) * (cols - 1)
+        k = min(rows, cols) - 1
+        cramers_v = math.sqrt(statistic / (n * k)) if k > 0 else 0.0
+        return statistic, df, chi_square_sf(statistic, df), min(cramers_v, 1.0)
+
+    def to_json(self):
+        """[["", cat2...], [cat1, count...], ...] as returned by `calculate_chi_square`."""
+        table = [[""] + [self.labels2[j] for j in self.codes2]]
+        for i in self.codes1:
+            table.append([self.labels1[i]] + [self.counts.get((i, j), 0) for j in self.codes2])
+        return table
+
+
+def encode_column(columnar, column):
+    """Dictionary codes of every cell of a sidecar column and the category of
+    each code. String cells keep their sidecar codes; each distinct number
+    (and NaN, once) gets a code after them."""
+    kind = columnar.kind(column)
+    labels = [] if kind == columnar_logic.NUMERIC else list(columnar.dictionary(column))
+    if kind == columnar_logic.STRING: return columnar.codes(column), labels
+    numbers = {}
+    def code(value):
+        if value != value: value = math.nan
+        if value not in numbers:
+            numbers[value] = len(labels)
+            labels.append(value)
+        return numbers[value]
+    if kind == columnar_logic.NUMERIC:
+        return [code(f) for f in columnar.floats(column)], labels
+    return [c if c != columnar_logic.NUMERIC_CODE else code(f) for f, c in zip(columnar.floats(column), columnar.codes(column))], labels
+
+
+def chi_square_test(columnar, column1, column2):
+    codes1, labels1 = encode_column(columnar, column1)
+    codes2, labels2 = encode_column(columnar, column2)
+    table = ContingencyTable.from_codes(codes1, labels1, codes2, labels2)
+    statistic, df, p_value, cramers_v = table.statistics()
+    return {'chi_square_statistic': statistic, 'degrees_of_freedom': df, 'p_value': p_value, 'cramers_v': cramers_v, 'contingency_table': table.to_json()}
+
+
+def chi_square_matrix(columnar, columns):
+    """Chi-square statistic, p-value and Cramér's V of every pair of `columns`.
+    Each column is encoded once; the pairs are counted from the codes."""
+    encoded = [encode_column(columnar, column) for column in columns]
+    p = len(columns)
+    statistic, p_value, cramers_v = ([[None] * p for _ in range(p)] for _ in range(3))
+    for i in range(p):
+        for j in range(i, p):
+            table = ContingencyTable.from_codes(encoded[i][0], encoded[i][1], encoded[j][0], encoded[j][1])
+            stat, _, p_val, v = table.statistics()
+            statistic[i][j] = statistic[j][i] = stat
+            p_value[i][j] = p_value[j][i] = p_val
+            cramers_v[i][j] = cramers_v[j][i] = v
+    return {'columns': columns, 'chi_square_statistic': statistic, 'p_value': p_value, 'cramers_v': cramers_v}
@@ -0,0 +1,84 @@
+import math
+
+from .compat import np  # None without NumPy: the sums are accumulated row by row instead
+
+# Rows accumulated per block; bounds memory to CHUNK_ROWS x columns floats.
+CHUNK_ROWS = 65536
+
+
+class PairwiseMoments:
+    """Sufficient statistics of every column pair over the rows where both
+    cells are numbers (pairwise deletion).
+
+    For the pair (i, j): n[i][j] rows, sx[i][j] = sum of column i, sxx[i][j] =
+    sum of its squares and sxy[i][j] = sum of the cross products, all taken
+    over those rows. Values are shifted by a per-column constant first so the
+    sums do not lose precision to large means.
+    """
+
+    def __init__(self, num_columns):
+        p = num_columns
+        self.p = p
+        self.shift = None
+        if np is not None:
+            self.n, self.sx, self.sxx, self.sxy = (np.zeros((p, p)) for _ in range(4))
+        else:
+            self.n, self.sx, self.sxx, self.sxy = ([[0.0] * p for _ in range(p)] for _ in range(4))
+
+    def _set_shift(self, columns):
+        self.shift = []
+        for column in columns:
+            present = [x for x in column if x == x]
+            self.shift.append(sum(present) / len(present) if present else 0.0)
+
+    def update(self, columns):
+        """Adds a block of rows given as one float sequence per column (NaN = missing)."""
+        if self.shift is None: self._set_shift(columns)
+        if np is not None:
+            x = np.column_stack([np.asarray(column, dtype=np.float64) for column in columns]) - np.asarray(self.shift)
+            present = ~np.isnan(x)
+            m = present.astype(np.float64)
+            x = np.where(present, x, 0.0)
+            self.n += m.T @ m
+            self.sx += x.T @ m
+            self.sxx += (x * x).T @ m
+            self.sxy += x.T @ x
+            return
+        shift = self.shift
+        for row in zip(*columns):
+            cells = [(i, x - shift[i]) for i, x in enumerate(row) if x == x]
+            for i, xi in cells:
+                n_i, sx_i, sxx_i, sxy_i = self.n[i], self.sx[i], self.sxx[i], self.sxy[i]
+                for j, xj in cells:
+                    n_i[j] += 1
+                    sx_i[j] += xi
+                    sxx_i[j] += xi * xi
+                    sxy_i[j] += xi * xj
+
+    def matrices(self):
+        """Sample covariance and Pearson correlation matrices plus the pair
+        counts; pairs with fewer than two rows or a constant column get 0."""
+        p = self.p
+        n, sx, sxx, sxy = (m.tolist() if np is not None else m for m in (self.n, self.sx, self.sxx, self.sxy))
+        covariance = [[0.0] * p for _ in range(p)]
+        correlation = [[0.0] * p for _ in range(p)]
+        for i in range(p):
+            for j in range(p):
+                count = n[i][j]
+                if count < 2: continue
+                cov = (sxy[i][j] - sx[i][j] * sx[j][i] / count) / (count - 1)
+                var_i = (sxx[i][j] - sx[i][j] ** 2 / count) / (count - 1)
+                var_j = (sxx[j][i] - sx[j][i] ** 2 / count) / (count - 1)
+                covariance[i][j] = cov
+                if var_i > 0 and var_j > 0: correlation[i][j] = max(-1.0, min(1.0, cov / math.sqrt(var_i * var_j)))
+        return covariance, correlation, [[int(c) for c in row] for row in n]
+
+
+def correlation_matrix(columnar, columns, chunk_rows=CHUNK_ROWS):
+    """Pearson and covariance matrices of `columns` from one pass over their
+    float64 sidecar arrays."""
+    arrays = [columnar.floats(column) for column in columns]
+    moments = PairwiseMoments(len(columns))
+    for start in range(0, columnar.row_count, chunk_rows):
+        moments.update([array[start:start + chunk_rows] for array in arrays])
+    return moments.matrices()
@@ -53,7 +53,7 @@ def evaluate_model(dataset, task, params):
 
     if task == 'decision_tree':
         split_criterion = params.get('split_criterion', 'information_gain')
-        processed_train_data = classification_logic.preprocess_for_tree(train_data, attributes)
+        processed_train_data = classification_logic.preprocess_for_tree(train_data, attributes, params.get('binning', 'equal_width'), target_attr)
         model = classification_logic.build_decision_tree(
             processed_train_data, attributes, target_attr, split_criterion
         )
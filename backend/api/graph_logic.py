@@ -0,0 +1,311 @@
+import array
+import json
+import math
+import os
+
+from .compat import np  # None without NumPy: the same iterations run over Python lists
+from . import columnar_logic, contingency_logic
+
+# A compiled graph of a (source, target) column pair is persisted in the
+# dataset sidecar as `<source>-<target>.graph.<part>` files (see `load_graph`),
+# so it is dropped together with the sidecar when the CSV changes.
+GRAPH_SUFFIX = 'graph'
+# CSR arrays and their typecodes: forward (out-links) and reverse (in-links).
+GRAPH_ARRAYS = (('offsets', 'q'), ('targets', 'i'), ('reverse_offsets', 'q'), ('sources', 'i'))
+
+
+def _is_node(label):
+    # Only missing cells (short rows) are not endpoints; blank cells are nodes named ''.
+    return label is not None
+
+
+class Graph:
+    """Directed graph over interned node ids in CSR form: node i is
+    `labels[i]`, its out-neighbours are `targets[offsets[i]:offsets[i + 1]]`
+    and its in-neighbours `sources[reverse_offsets[i]:reverse_offsets[i + 1]]`,
+    both sorted. Repeated edges are stored once."""
+
+    def __init__(self, labels, offsets, targets, reverse_offsets, sources):
+        self.labels = labels
+        self.offsets = offsets
+        self.targets = targets
+        self.reverse_offsets = reverse_offsets
+        self.sources = sources
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def out_degrees(self):
+        if np is not None: return np.diff(self.offsets)
+        return [self.offsets[i + 1] - self.offsets[i] for i in range(self.num_nodes)]
+
+    @classmethod
+    def from_id_pairs(cls, labels, sources, targets):
+        """Graph of the edges sources[e] -> targets[e] (ids into `labels`);
+        nodes without any edge are dropped."""
+        if np is not None:
+            sources, targets = np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+            used = np.zeros(len(labels), dtype=bool)
+            used[sources] = used[targets] = True
+            ids = np.cumsum(used) - 1
+            n = int(used.sum())
+            keys = np.sort(ids[sources] * n + ids[targets])
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+            offsets, targets = _csr(keys, n)
+            reverse_offsets, sources = _csr(np.sort(targets.astype(np.int64) * n + keys // n) if n else keys, n)
+            return cls([labels[i] for i in np.flatnonzero(used).tolist()], offsets, targets, reverse_offsets, sources)
+        used = sorted(set(sources) | set(targets))
+        ids = {node: i for i, node in enumerate(used)}
+        edges = sorted({(ids[s], ids[t]) for s, t in zip(sources, targets)})
+        offsets, targets = _csr(edges, len(used))
+        reverse_offsets, sources = _csr(sorted((t, s) for s, t in edges), len(used))
+        return cls([labels[i] for i in used], offsets, targets, reverse_offsets, sources)
+
+    @classmethod
+    def from_edges(cls, edges):
+        """Graph of (source label, target label) pairs."""
+        ids, labels, sources, targets = {}, [], [], []
+        for pair in edges:
+            for node in pair:
+                if node not in ids:
+                    ids[node] = len(labels)
+                    labels.append(node)
+            sources.append(ids[pair[0]])
+            targets.append(ids[pair[1]])
+        return cls.from_id_pairs(labels, sources, targets)
+
+
+def _csr(edges, n):
+    """Offsets and neighbours of sorted edges: (row, column) pairs, or with
+    NumPy int64 keys row * n + column."""
+    if np is not None:
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        if n: np.cumsum(np.bincount(edges // n, minlength=n), out=offsets[1:])
+        return offsets, (edges % n if n else edges).astype(np.int32)
+    offsets = [0] * (n + 1)
+    for row, _ in edges:
+        offsets[row + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    return offsets, [column for _, column in edges]
+
+
+def _column_ids(columnar, column):
+    """Dictionary code of every cell of a sidecar column and the label of each
+    code (see `contingency_logic.encode_column`)."""
+    if np is None: return contingency_logic.encode_column(columnar, column)
+    kind = columnar.kind(column)
+    if kind == columnar_logic.STRING:
+        return np.frombuffer(columnar.codes(column), dtype=np.int32), list(columnar.dictionary(column))
+    floats = np.frombuffer(columnar.floats(column), dtype=np.float64)
+    if kind == columnar_logic.NUMERIC:
+        numbers, codes = np.unique(floats, return_inverse=True)
+        return codes, numbers.tolist()
+    codes = np.frombuffer(columnar.codes(column), dtype=np.int32).astype(np.int64)
+    labels = list(columnar.dictionary(column))
+    is_number = codes == columnar_logic.NUMERIC_CODE
+    numbers, number_codes = np.unique(floats[is_number], return_inverse=True)
+    codes[is_number] = len(labels) + number_codes
+    return codes, labels + numbers.tolist()
+
+
+def compile_graph(columnar, source_col, target_col):
+    """Edge list of two sidecar columns compiled to a `Graph`, straight from
+    their dictionary codes. Node names are the cells as strings, as in
+    `processing_logic.pagerank_from_edges`; rows with a missing endpoint are skipped."""
+    (source_codes, source_labels), (target_codes, target_labels) = _column_ids(columnar, source_col), _column_ids(columnar, target_col)
+    ids, labels = {}, []
+    def intern(column_labels):
+        lookup = []
+        for label in column_labels:
+            if not _is_node(label):
+                lookup.append(-1)
+                continue
+            name = str(label)
+            if name not in ids:
+                ids[name] = len(labels)
+                labels.append(name)
+            lookup.append(ids[name])
+        return lookup
+    source_lookup, target_lookup = intern(source_labels), intern(target_labels)
+    if np is not None:
+        sources = np.asarray(source_lookup, dtype=np.int64)[source_codes]
+        targets = np.asarray(target_lookup, dtype=np.int64)[target_codes]
+        keep = (sources >= 0) & (targets >= 0)
+        return Graph.from_id_pairs(labels, sources[keep], targets[keep])
+    pairs = [(source_lookup[s], target_lookup[t]) for s, t in zip(source_codes, target_codes)]
+    pairs = [(s, t) for s, t in pairs if s >= 0 and t >= 0]
+    return Graph.from_id_pairs(labels, [s for s, _ in pairs], [t for _, t in pairs])
+
+
+def _write_array(path, values, typecode):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as fh:
+        if np is not None: np.asarray(values, dtype=np.dtype(typecode)).tofile(fh)
+        else: array.array(typecode, values).tofile(fh)
+    os.replace(tmp_path, path)
+
+
+def _read_array(path, typecode):
+    if np is not None: return np.fromfile(path, dtype=np.dtype(typecode))
+    values = array.array(typecode)
+    with open(path, 'rb') as fh:
+        values.frombytes(fh.read())
+    return values
+
+
+def save_graph(columnar, source_col, target_col, graph):
+    """Persists a compiled graph in the sidecar; the labels file is written
+    last and marks the index as complete."""
+    part = lambda name: columnar.pair_file(source_col, target_col, f'{GRAPH_SUFFIX}.{name}')
+    for name, typecode in GRAPH_ARRAYS:
+        _write_array(part(name), getattr(graph, name), typecode)
+    path = part('json')
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as fh:
+        json.dump({'labels': graph.labels}, fh)
+    os.replace(f'{path}.tmp', path)
+
+
+def load_graph(columnar, source_col, target_col):
+    """Graph index of (source_col, target_col): read from the sidecar when it
+    was compiled before, otherwise compiled with `compile_graph` and persisted
+    for the next task on the same pair."""
+    part = lambda name: columnar.pair_file(source_col, target_col, f'{GRAPH_SUFFIX}.{name}')
+    if os.path.exists(part('json')):
+        with open(part('json'), encoding='utf-8') as fh:
+            labels = json.load(fh)['labels']
+        return Graph(labels, *(_read_array(part(name), typecode) for name, typecode in GRAPH_ARRAYS))
+    graph = compile_graph(columnar, source_col, target_col)
+    save_graph(columnar, source_col, target_col, graph)
+    return graph
+
+
+def _segment_sums(values, offsets):
+    """values[offsets[i]:offsets[i + 1]].sum() for every i."""
+    degrees = np.diff(offsets)
+    sums = np.zeros(len(degrees))
+    nonempty = degrees > 0
+    if nonempty.any(): sums[nonempty] = np.add.reduceat(values, offsets[:-1][nonempty])
+    return sums
+
+
+def pagerank(graph, damping=0.85, max_iter=100, tol=1e-6):
+    """PageRank by power iteration over the CSR arrays. The rank of dangling
+    nodes (no out-links) is spread evenly over all nodes, so ranks keep
+    summing to 1. Stops when the L1 change drops below `tol`; returns the
+    ranks and the iterations run."""
+    n = graph.num_nodes
+    degrees = graph.out_degrees()
+    if np is not None:
+        share = np.divide(1.0, degrees, out=np.zeros(n), where=degrees > 0)
+        dangling = degrees == 0
+        ranks = np.full(n, 1.0 / n)
+        iteration = 0
+        for iteration in range(1, max_iter + 1):
+            # Each node pulls rank / out-degree from its in-links (reverse CSR).
+            new = damping * _segment_sums((ranks * share)[graph.sources], graph.reverse_offsets)
+            new += (1 - damping + damping * ranks[dangling].sum()) / n
+            diff = float(np.abs(new - ranks).sum())
+            ranks = new
+            if diff < tol: break
+        return ranks, iteration
+    offsets, targets = graph.offsets, graph.targets
+    ranks = [1.0 / n] * n
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        new = [0.0] * n
+        dangling_mass = 0.0
+        for i in range(n):
+            if not degrees[i]:
+                dangling_mass += ranks[i]
+                continue
+            share = damping * ranks[i] / degrees[i]
+            for t in targets[offsets[i]:offsets[i + 1]]:
+                new[t] += share
+        base = (1 - damping + damping * dangling_mass) / n
+        new = [rank + base for rank in new]
+        diff = sum(abs(a - b) for a, b in zip(new, ranks))
+        ranks = new
+        if diff < tol: break
+    return ranks, iteration
+
+
+def hits(graph, max_iter=100, tol=1e-6):
+    """HITS by power iteration: authorities sum the hub scores of their
+    in-links (reverse CSR), then hubs sum the new authority scores of their
+    out-links (forward CSR); both are scaled to unit L2 norm. Stops when the
+    L1 change of both drops below `tol`; returns authorities, hubs and the
+    iterations run."""
+    n = graph.num_nodes
+    if np is not None:
+        auth, hub = np.ones(n), np.ones(n)
+        iteration = 0
+        for iteration in range(1, max_iter + 1):
+            new_auth = _segment_sums(hub[graph.sources], graph.reverse_offsets)
+            new_auth /= np.sqrt((new_auth * new_auth).sum()) or 1.0
+            new_hub = _segment_sums(new_auth[graph.targets], graph.offsets)
+            new_hub /= np.sqrt((new_hub * new_hub).sum()) or 1.0
+            diff = float(np.abs(new_auth - auth).sum() + np.abs(new_hub - hub).sum())
+            auth, hub = new_auth, new_hub
+            if diff < tol: break
+        return auth, hub, iteration
+    def pull(values, offsets, neighbours):
+        sums = [sum(values[j] for j in neighbours[offsets[i]:offsets[i + 1]]) for i in range(n)]
+        norm = math.sqrt(sum(v * v for v in sums)) or 1.0
+        return [v / norm for v in sums]
+    auth, hub = [1.0] * n, [1.0] * n
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        new_auth = pull(hub, graph.reverse_offsets, graph.sources)
+        new_hub = pull(new_auth, graph.offsets, graph.targets)
+        diff = sum(abs(a - b) for a, b in zip(new_auth, auth)) + sum(abs(a - b) for a, b in zip(new_hub, hub))
+        auth, hub = new_auth, new_hub
+        if diff < tol: break
+    return auth, hub, iteration
+
+
+def ranked_scores(labels, scores, limit=None):
+    """[{'node', 'score'}] by descending score, the first `limit` only when given."""
+    if limit is not None and limit < 1: raise ValueError("limit must be at least 1.")
+    if np is not None:
+        scores = np.asarray(scores)
+        if limit is not None and limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit] if limit > 0 else np.empty(0, dtype=np.int64)
+            order = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            order = np.argsort(-scores, kind='stable')
+        return [{'node': labels[i], 'score': round(float(scores[i]), 6)} for i in order.tolist()]
+    order = sorted(range(len(scores)), key=lambda i: -scores[i])
+    return [{'node': labels[i], 'score': round(scores[i], 6)} for i in order[:limit]]
+
+
+def pagerank_response(graph, damping=0.85, max_iter=100, tol=1e-6, limit=None):
+    """Response of the `pagerank` task for a compiled graph."""
+    if graph.num_nodes == 0: return {'error': 'No edges found using selected columns.'}
+    ranks, iterations = pagerank(graph, damping, max_iter, tol)
+    return {
+        'task': 'pagerank',
+        'scores': ranked_scores(graph.labels, ranks, limit),
+        'num_nodes': graph.num_nodes,
+        'num_edges': graph.num_edges,
+        'iterations': iterations,
+    }
+
+
+def hits_response(graph, max_iter=100, tol=1e-6, limit=None):
+    """Response of the `hits` task for a compiled graph."""
+    if graph.num_nodes == 0: return {'error': 'No edges found using selected columns.'}
+    auth, hub, iterations = hits(graph, max_iter, tol)
+    return {
+        'task': 'hits',
+        'authorities': ranked_scores(graph.labels, auth, limit),
+        'hubs': ranked_scores(graph.labels, hub, limit),
+        'num_nodes': graph.num_nodes,
+        'num_edges': graph.num_edges,
+        'iterations': iterations,
+    }
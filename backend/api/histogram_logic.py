@@ -0,0 +1,132 @@
+import array
+import os
+
+from . import vector_logic
+
+# Every numeric column gets one base histogram of FINE_BINS equal-width bins,
+# stored in its sidecar as `<index>.hist`: float64 [min, max, count, ...].
+# Histograms of any coarser resolution or sub-range are merged from it.
+# 14400 = 2^6 * 3^2 * 5^2 is divided by the usual bin counts (1-6, 8-10, 12,
+# 15, 16, 20, 25, 32, 50, 64, 100, ...), whose merges are exact.
+FINE_BINS = 14400
+HISTOGRAM_SUFFIX = 'hist'
+
+
+class FineHistogram:
+    """Equal-width counts of a column's numeric cells over [min, max]."""
+
+    def __init__(self, min_val, max_val, counts):
+        self.min = min_val
+        self.max = max_val
+        self.counts = counts
+
+    @property
+    def total(self):
+        return sum(self.counts)
+
+    @classmethod
+    def from_columnar(cls, columnar, column, fine_bins=FINE_BINS):
+        values = vector_logic.numeric_column(columnar, column)
+        if values is not None:
+            if values.size == 0: return None
+            min_val, max_val = float(values.min()), float(values.max())
+            if min_val == max_val: return cls(min_val, max_val, [0] * (fine_bins - 1) + [int(values.size)])
+            return cls(min_val, max_val, vector_logic.bin_counts(values, min_val, max_val, fine_bins))
+        values = list(columnar.iter_numeric(column))
+        if not values: return None
+        min_val, max_val = min(values), max(values)
+        counts = [0] * fine_bins
+        bin_width = (max_val - min_val) / fine_bins
+        for val in values:
+            index = min(int((val - min_val) / bin_width), fine_bins - 1) if bin_width else fine_bins - 1
+            if val == max_val: index = fine_bins - 1
+            counts[index] += 1
+        return cls(min_val, max_val, counts)
+
+    def merge(self, num_bins, value_range=None):
+        """Histogram of `num_bins` equal-width bins over [min, max], or over the
+        (low, high) `value_range`, built from the fine bins alone.
+
+        Each fine bin goes to the bin holding its centre. When the bin edges
+        line up with fine edges (the whole range and num_bins dividing
+        FINE_BINS) the counts equal `prepare_histogram_data`; otherwise a count
+        is off by at most one fine bin per edge.
+        """
+        if num_bins <= 0: return {'labels': [], 'counts': []}
+        if self.min == self.max: return {'labels': [f'{self.min:.2f}'], 'counts': [self.total]}
+        low, high = value_range if value_range else (self.min, self.max)
+        if not low < high: raise ValueError("Histogram range must have low < high.")
+        bin_width = (high - low) / num_bins
+        labels = _labels(low, high, num_bins)
+        counts = [0] * num_bins
+        fine_width = (self.max - self.min) / len(self.counts)
+        for i, count in enumerate(self.counts):
+            if not count: continue
+            centre = self.min + (i + 0.5) * fine_width
+            if centre < low or centre > high: continue
+            counts[min(int((centre - low) / bin_width), num_bins - 1)] += count
+        return {'labels': labels, 'counts': counts}
+
+
+def merges_exactly(num_bins, value_range=None):
+    """Whether `FineHistogram.merge` gives exact counts for this request."""
+    return value_range is None and num_bins > 0 and FINE_BINS % num_bins == 0
+
+
+def exact_histogram(columnar, column, num_bins, value_range=None):
+    """`processing_logic.prepare_histogram_data` of a column, read from every
+    numeric cell, over [min, max] or the (low, high) `value_range`."""
+    if num_bins <= 0: return {'labels': [], 'counts': []}
+    values = vector_logic.numeric_column(columnar, column)
+    if values is not None:
+        if value_range is None: return vector_logic.prepare_histogram_data(values, num_bins)
+        low, high = value_range
+        if not low < high: raise ValueError("Histogram range must have low < high.")
+        values = values[(values >= low) & (values <= high)]
+        return {'labels': _labels(low, high, num_bins), 'counts': vector_logic.bin_counts(values, low, high, num_bins)}
+    values = list(columnar.iter_numeric(column))
+    if value_range is None:
+        if not values: return {'labels': [], 'counts': []}
+        low, high = min(values), max(values)
+        if low == high: return {'labels': [f'{low:.2f}'], 'counts': [len(values)]}
+    else:
+        low, high = value_range
+        if not low < high: raise ValueError("Histogram range must have low < high.")
+    bin_width = (high - low) / num_bins
+    counts = [0] * num_bins
+    for val in values:
+        if val < low or val > high: continue
+        counts[num_bins - 1 if val == high else min(int((val - low) / bin_width), num_bins - 1)] += 1
+    return {'labels': _labels(low, high, num_bins), 'counts': counts}
+
+
+def _labels(low, high, num_bins):
+    bin_width = (high - low) / num_bins
+    bins = [low + i * bin_width for i in range(num_bins + 1)]
+    return [f'[{bins[i]:.2f}-{bins[i+1]:.2f}]' for i in range(num_bins)]
+
+
+def _read(path):
+    data = array.array('d')
+    with open(path, 'rb') as fh:
+        data.frombytes(fh.read())
+    return FineHistogram(data[0], data[1], [int(c) for c in data[2:]])
+
+
+def _write(path, histogram):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as fh:
+        array.array('d', [histogram.min, histogram.max] + histogram.counts).tofile(fh)
+    os.replace(tmp_path, path)
+
+
+def load_histogram(columnar, column):
+    """Base histogram of a column, computed from the sidecar on first use and
+    persisted next to it. None when the column has no numeric cells."""
+    path = columnar.column_file(column, HISTOGRAM_SUFFIX)
+    if os.path.exists(path):
+        histogram = _read(path)
+        if len(histogram.counts) == FINE_BINS: return histogram
+    histogram = FineHistogram.from_columnar(columnar, column)
+    if histogram is not None: _write(path, histogram)
+    return histogram
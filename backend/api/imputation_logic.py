@@ -0,0 +1,66 @@
+from collections import Counter
+
+from . import columnar_logic, ingest_logic, processing_logic
+
+IMPUTE_METHODS = ('mean', 'median', 'mode', 'constant')
+
+
+def missing_counts(columnar):
+    """Blank cells per column, read from the sidecar metadata."""
+    return {column: columnar.missing_count(column) for column in dict.fromkeys(columnar.header)}
+
+
+def fill_value(columnar, column, method, value=None):
+    """Value replacing the blank cells of `column`, or None when the column
+    has nothing to take it from (e.g. the mean of a column without numbers)."""
+    if method == 'constant': return value
+    numbers = [x for x in columnar.numeric_values(column) if x == x]
+    if method == 'mean': return processing_logic.calculate_mean(numbers) if numbers else None
+    if method == 'median': return processing_logic.calculate_median(numbers) if numbers else None
+    if method == 'mode':
+        if numbers: return processing_logic.calculate_mode(numbers)[0]
+        # Most frequent non-blank category, counted on the dictionary codes.
+        dictionary = columnar.dictionary(column)
+        counts = Counter(code for code in columnar.codes(column) if code != columnar_logic.NUMERIC_CODE and str(dictionary[code]).strip() != '')
+        return dictionary[counts.most_common(1)[0][0]] if counts else None
+    raise ValueError(f"Unknown imputation method: {method}")
+
+
+def constant_value(value, column_type):
+    """A user-supplied constant converted like the cells of a column of
+    `column_type` (Dataset.column_types): a number for int/float columns,
+    text otherwise. Raises ValueError when a numeric column gets text."""
+    if column_type in (ingest_logic.INT, ingest_logic.FLOAT):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Constant value {value!r} is not a number.") from None
+    return value if isinstance(value, str) else str(value)
+
+
+def impute_rows(columnar, fills):
+    """Streams every row with the blank cells of each column of `fills`
+    ({column: value}) replaced, in one pass. Blank cells are located through
+    the null bitmaps, so the other cells are never inspected."""
+    fills_at = {}
+    for column, value in fills.items():
+        for r in columnar.missing_rows(column):
+            fills_at.setdefault(r, []).append((column, value))
+    for r, row in enumerate(columnar.iter_rows()):
+        for column, value in fills_at.get(r, ()):
+            row[column] = value
+        yield row
+
+
+def incomplete_rows(columnar):
+    """Indices of the rows with at least one blank cell."""
+    rows = set()
+    for column in dict.fromkeys(columnar.header):
+        rows.update(columnar.missing_rows(column))
+    return rows
+
+
+def complete_rows(columnar, skip=None):
+    """Streams the rows without blank cells (`handle_missing_values(..., 'remove_rows')`)."""
+    skip = incomplete_rows(columnar) if skip is None else skip
+    return (row for r, row in enumerate(columnar.iter_rows()) if r not in skip)
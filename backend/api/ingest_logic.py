@@ -0,0 +1,120 @@
+import csv
+import hashlib
+import io
+import os
+
+from . import columnar_logic
+
+# Column types recorded on Dataset.column_types. Text columns are `string`
+# when no cell parses as a number and `categorical` when some cells do.
+INT, FLOAT, CATEGORICAL, STRING, EMPTY = 'int', 'float', 'categorical', 'string', 'empty'
+
+
+class _TeeReader(io.RawIOBase):
+    """Raw stream over upload chunks that writes, hashes and row-indexes every byte it hands out."""
+
+    def __init__(self, chunks, destination):
+        self._chunks = iter(chunks)
+        self._destination = destination
+        self._pending = b''
+        self.sha256 = hashlib.sha256()
+        self.indexer = columnar_logic.RowIndexer()
+        self.byte_size = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None: return 0
+            self._destination.write(chunk)
+            self.sha256.update(chunk)
+            self.indexer.feed(chunk)
+            self.byte_size += len(chunk)
+            self._pending = chunk
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+class SchemaInferer:
+    """Infers int/float/categorical/string/empty per column from streamed rows.
+
+    The float parsing is left to the SidecarBuilder fed the same rows, whose
+    arrays tell which columns hold numbers and text; only the integer check
+    is made here, and only until a column turns out not to be integral.
+    """
+
+    def __init__(self, header):
+        self.header = header
+        self.integral = [True] * len(header)
+
+    def add_row(self, row):
+        for i in range(len(self.header)):
+            if not self.integral[i]: continue
+            value = row[i] if i < len(row) else None
+            if value is None or value.strip() == '': continue
+            try:
+                int(value)
+            except ValueError:
+                self.integral[i] = False
+
+    def column_types(self, builder):
+        types = {}
+        for i, name in enumerate(self.header):
+            has_text = any(value is not None and str(value).strip() != '' for value in builder.dictionaries[i])
+            has_number = builder.number_count(i) > 0
+            if has_text: types[name] = CATEGORICAL if has_number else STRING
+            elif not has_number: types[name] = EMPTY
+            else: types[name] = INT if self.integral[i] else FLOAT
+        return types
+
+
+def ingest_upload(chunks, file_path):
+    """Writes an upload to `file_path` while parsing it, in a single pass.
+
+    The same pass builds the columnar sidecar and row offset index, infers the
+    column types, counts rows and hashes the content. Every cell is parsed
+    once, by the sidecar builder; the types are only known at the end of the
+    pass, so they apply from the next sidecar rebuild on. Returns the
+    metadata stored on `Dataset`.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'wb') as destination:
+        tee = _TeeReader(chunks, destination)
+        text = io.TextIOWrapper(io.BufferedReader(tee), encoding='utf-8', newline='')
+        reader = csv.reader(text)
+        header = next(reader, [])
+        builder = columnar_logic.SidecarBuilder(header, file_path=file_path)
+        inferer = SchemaInferer(header)
+        for row in reader:
+            if not row: continue
+            builder.add_row(row)
+            inferer.add_row(row)
+        # Drain whatever the text layer did not need (e.g. a trailing newline).
+        while tee.readinto(bytearray(65536)): pass
+    builder.write(file_path, tee.indexer.finish())
+    return {
+        'columns': header,
+        'row_count': builder.row_count,
+        'byte_size': tee.byte_size,
+        'column_types': inferer.column_types(builder),
+        'content_hash': tee.sha256.hexdigest(),
+    }
+
+
+def encode_csv(header, rows, batch_size=1000):
+    """Yields UTF-8 encoded CSV chunks for `rows`, a batch of rows at a time."""
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for i, row in enumerate(rows, 1):
+        writer.writerow([row.get(column) for column in header])
+        if i % batch_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
@@ -0,0 +1,211 @@
+import heapq
+from itertools import combinations
+
+# Frequent itemset miners selectable for the `apriori` task. All of them mine
+# the same itemsets and return the response of `processing_logic.apriori`.
+ALGORITHMS = ('apriori', 'eclat', 'fpgrowth')
+# Rule measures usable to rank the top-K rules.
+RULE_METRICS = ('confidence', 'lift', 'leverage', 'conviction', 'support')
+
+
+def item_transactions(dataset, columns):
+    """Each row as the set of its non-blank `column=value` items; rows without
+    any item are skipped."""
+    transactions = []
+    for row in dataset:
+        items = set()
+        for c in columns:
+            val = row.get(c)
+            if val is not None and str(val).strip() != '':
+                items.add(f"{c}={val}")
+        if items:
+            transactions.append(items)
+    return transactions
+
+
+def _bitset(rows, n):
+    bits = bytearray((n + 7) // 8)
+    for t in rows:
+        bits[t >> 3] |= 1 << (t & 7)
+    return int.from_bytes(bits, 'little')
+
+
+class VerticalIndex:
+    """Items dictionary-encoded to integers, each with the bitset (a Python
+    int, bit t = transaction t) of the transactions holding it."""
+
+    def __init__(self, transactions):
+        self.n = len(transactions)
+        self.labels, self.ids = [], {}
+        rows = []
+        for t, items in enumerate(transactions):
+            for item in items:
+                i = self.ids.get(item)
+                if i is None:
+                    i = self.ids[item] = len(self.labels)
+                    self.labels.append(item)
+                    rows.append([])
+                rows[i].append(t)
+        self.bitsets = [_bitset(r, self.n) for r in rows]
+
+
+def eclat_itemsets(index, min_support, max_len=3):
+    """Frequent itemsets {frozenset(labels): support} up to `max_len` items,
+    mined depth-first: the bitset of prefix + item is the intersection of the
+    prefix's and the item's bitsets, and its popcount is the support count."""
+    n, labels = index.n, index.labels
+    frequent = {}
+
+    def grow(prefix, members):
+        # members: frequent extensions (item, bitset of prefix + item), in item order.
+        for a, (i, bits) in enumerate(members):
+            itemset = prefix + (i,)
+            if len(itemset) >= max_len: continue
+            extensions = []
+            for j, other in members[a + 1:]:
+                both = bits & other
+                sup = both.bit_count() / n
+                if sup >= min_support:
+                    extensions.append((j, both))
+                    frequent[frozenset(labels[x] for x in itemset + (j,))] = sup
+            if extensions: grow(itemset, extensions)
+
+    singles = []
+    for i, bits in enumerate(index.bitsets):
+        sup = bits.bit_count() / n
+        if sup >= min_support:
+            singles.append((i, bits))
+            frequent[frozenset([labels[i]])] = sup
+    grow((), singles)
+    return frequent
+
+
+class _FPNode:
+    __slots__ = ('item', 'count', 'parent', 'children')
+
+    def __init__(self, item, parent):
+        self.item, self.count, self.parent, self.children = item, 0, parent, {}
+
+
+def _fp_tree(paths, is_frequent):
+    """FP-tree of weighted item paths [(items, count)], built in two passes:
+    item counts first, then every path inserted with its frequent items in
+    descending count order. Returns the frequent items' counts and the tree
+    nodes of each item (the header table)."""
+    counts = {}
+    for items, count in paths:
+        for item in items:
+            counts[item] = counts.get(item, 0) + count
+    counts = {item: count for item, count in counts.items() if is_frequent(count)}
+    rank = {item: r for r, item in enumerate(sorted(counts, key=lambda item: (-counts[item], item)))}
+    root = _FPNode(None, None)
+    header = {item: [] for item in counts}
+    for items, count in paths:
+        node = root
+        for item in sorted((item for item in items if item in rank), key=rank.__getitem__):
+            child = node.children.get(item)
+            if child is None:
+                child = node.children[item] = _FPNode(item, node)
+                header[item].append(child)
+            child.count += count
+            node = child
+    return counts, header
+
+
+def fp_growth_itemsets(transactions, min_support, max_len=3):
+    """Frequent itemsets {frozenset(items): support} mined from FP-trees:
+    each frequent item's prefix paths form a conditional tree that is mined
+    recursively, so no candidate itemsets are generated."""
+    n = len(transactions)
+    is_frequent = lambda count: count / n >= min_support
+    frequent = {}
+
+    def mine(paths, suffix):
+        counts, header = _fp_tree(paths, is_frequent)
+        for item, nodes in header.items():
+            itemset = suffix + (item,)
+            frequent[frozenset(itemset)] = counts[item] / n
+            if len(itemset) >= max_len: continue
+            conditional = []
+            for node in nodes:
+                path, parent = [], node.parent
+                while parent.item is not None:
+                    path.append(parent.item)
+                    parent = parent.parent
+                if path: conditional.append((path, node.count))
+            if conditional: mine(conditional, itemset)
+
+    mine([(items, 1) for items in transactions], ())
+    return frequent
+
+
+def association_rules(freq_itemsets, min_confidence, top_k=None, rank_by='confidence'):
+    """Rules A -> itemset - A for every frequent itemset and non-empty proper
+    subset A, with support, confidence, lift, leverage and conviction. All
+    supports are read from `freq_itemsets`, which holds every subset of a
+    frequent itemset. With `top_k`, only the k rules ranking highest on
+    `rank_by` are kept (in a heap) and returned best first.
+
+    Returns (rules, number of rules passing min_confidence). Conviction is
+    None for rules with confidence 1 (it is infinite)."""
+    if top_k is not None and top_k < 1: raise ValueError("top_k must be at least 1.")
+    heap, rules, total = [], [], 0
+    for itemset, sup in freq_itemsets.items():
+        if len(itemset) < 2: continue
+        items = list(itemset)
+        for r in range(1, len(items)):
+            for antecedent in combinations(items, r):
+                A = frozenset(antecedent)
+                C = itemset.difference(A)
+                sup_a, sup_c = freq_itemsets[A], freq_itemsets[C]
+                if not sup_a: continue
+                conf = sup / sup_a
+                if conf < min_confidence: continue
+                total += 1
+                measures = {
+                    'support': sup,
+                    'confidence': conf,
+                    'lift': conf / sup_c,
+                    'leverage': sup - sup_a * sup_c,
+                    'conviction': (1 - sup_c) / (1 - conf) if conf < 1 else float('inf'),
+                }
+                if top_k is not None:
+                    entry = (measures[rank_by], total, A, C, measures)
+                    if len(heap) < top_k: heapq.heappush(heap, entry)
+                    elif entry[0] > heap[0][0]: heapq.heapreplace(heap, entry)
+                else:
+                    rules.append(_rule(A, C, measures))
+    if top_k is not None:
+        rules = [_rule(A, C, measures) for _, _, A, C, measures in sorted(heap, key=lambda entry: (-entry[0], entry[1]))]
+    return rules, total
+
+
+def _rule(antecedent, consequent, measures):
+    rule = {'antecedent': list(antecedent), 'consequent': list(consequent)}
+    for name, value in measures.items():
+        rule[name] = round(value, 4) if value != float('inf') else None
+    return rule
+
+
+def mining_response(freq_itemsets, min_confidence, top_k=None, rank_by='confidence'):
+    """The `apriori` task response for a table of frequent itemsets."""
+    rules, total = association_rules(freq_itemsets, min_confidence, top_k, rank_by)
+    return {'task': 'apriori', 'frequent_itemsets': {', '.join(list(k)): v for k, v in freq_itemsets.items()}, 'rules': rules, 'total_rules': total}
+
+
+def eclat(dataset, columns, min_support=0.1, min_confidence=0.6, max_len=3, top_k=None, rank_by='confidence'):
+    """`processing_logic.apriori` on a vertical index: support counting is a
+    bitset intersection and popcount instead of a scan of every transaction."""
+    transactions = item_transactions(dataset, columns)
+    if not transactions:
+        return {'error': 'No transactions created from selected columns.'}
+    index = VerticalIndex(transactions)
+    return mining_response(eclat_itemsets(index, min_support, max_len), min_confidence, top_k, rank_by)
+
+
+def fp_growth(dataset, columns, min_support=0.1, min_confidence=0.6, max_len=3, top_k=None, rank_by='confidence'):
+    """`processing_logic.apriori` mined with FP-Growth."""
+    transactions = item_transactions(dataset, columns)
+    if not transactions:
+        return {'error': 'No transactions created from selected columns.'}
+    return mining_response(fp_growth_itemsets(transactions, min_support, max_len), min_confidence, top_k, rank_by)
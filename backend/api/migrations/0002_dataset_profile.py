@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='profile',
+            field=models.JSONField(default=dict),
+        ),
+    ]
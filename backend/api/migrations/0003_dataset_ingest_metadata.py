@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_dataset_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='byte_size',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='column_types',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='row_count',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_dataset_ingest_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='lineage',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='derived', to='api.dataset'),
+        ),
+    ]
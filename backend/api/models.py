@@ -7,6 +7,16 @@ class Dataset(models.Model):
     filename = models.CharField(max_length=255, unique=True)
     upload_date = models.DateTimeField(auto_now_add=True)
     columns = models.JSONField(default=list)
+    # Per-column statistics computed in one scan, see profiling_logic.profile_dataset
+    profile = models.JSONField(default=dict)
+    # Recorded while the upload is streamed to disk, see ingest_logic.ingest_upload
+    column_types = models.JSONField(default=dict)
+    row_count = models.PositiveBigIntegerField(default=0)
+    byte_size = models.PositiveBigIntegerField(default=0)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    # Datasets materialized from a transform of another dataset keep a link to it
+    parent = models.ForeignKey('self', related_name='derived', null=True, blank=True, on_delete=models.SET_NULL)
+    lineage = models.JSONField(default=dict, blank=True)
 
     def __str__(self):
         return self.filename
@@ -3,6 +3,8 @@ import os
 import math
 from collections import Counter
 
+from . import binning_logic, itemset_logic, graph_logic
+
 def load_column_data(file_path, column_name):
     """Loads a specific column from a CSV file, converting to float if possible."""
     if not os.path.exists(file_path):
@@ -21,21 +23,50 @@ def load_column_data(file_path, column_name):
                 pass 
     return column_data
 
-def load_full_data(file_path):
-    """Loads the entire CSV into a list of dictionaries, converting numbers."""
+def parse_cell(value):
+    """Converts a raw CSV cell to float when possible, otherwise keeps it as is."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return value
+
+def _keep_cell(value):
+    return value
+
+# Fixed per-column converters for the types recorded by upload schema inference.
+# String and empty columns are never parsed. Numeric columns parse every cell
+# anyway (blank ones fail float() and are kept), as do categorical columns,
+# which hold some numeric-looking cells.
+CELL_CONVERTERS = {'int': parse_cell, 'float': parse_cell, 'string': _keep_cell, 'empty': _keep_cell, 'categorical': parse_cell}
+
+def cell_converters(header, column_types=None):
+    """Returns one converter per header column, `parse_cell` where the type is unknown."""
+    column_types = column_types or {}
+    return [CELL_CONVERTERS.get(column_types.get(name), parse_cell) for name in header]
+
+def load_full_data(file_path, column_types=None, columns=None):
+    """Loads the entire CSV into a list of dictionaries, converting numbers.
+
+    When `columns` is given only those cells are converted and kept.
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found at {file_path}")
     
     dataset = []
     with open(file_path, 'r', encoding='utf-8') as csvfile:
         reader = csv.DictReader(csvfile)
+        converters = dict(zip(reader.fieldnames or [], cell_converters(reader.fieldnames or [], column_types)))
+        if columns is not None:
+            missing = [c for c in columns if c not in converters]
+            if missing: raise ValueError(f"Column '{missing[0]}' not found in the file.")
+            converters = {c: converters[c] for c in columns}
+            for row in reader:
+                dataset.append({key: convert(row[key]) for key, convert in converters.items()})
+            return dataset
         for row in reader:
             processed_row = {}
             for key, value in row.items():
-                try:
-                    processed_row[key] = float(value)
-                except (ValueError, TypeError):
-                    processed_row[key] = value
+                processed_row[key] = converters.get(key, parse_cell)(value)
             dataset.append(processed_row)
     return dataset
 
@@ -108,25 +139,15 @@ def normalize_decimal_scaling(dataset, column):
             row[column] = row[column] / divisor
     return dataset
 
-def discretize_by_binning(dataset, column, num_bins):
-    values = [row[column] for row in dataset if isinstance(row.get(column), (int, float))]
-    if not values or num_bins <= 0: return dataset
-    min_val, max_val = min(values), max(values)
-    bin_width = (max_val - min_val) / num_bins
-    if bin_width == 0:
-        for row in dataset:
-            if isinstance(row.get(column), (int, float)): row[column] = f'Bin 1: ({min_val})'
-        return dataset
-    bins = [min_val + i * bin_width for i in range(num_bins + 1)]
-    bins[-1] = max_val
-    for row in dataset:
-        if isinstance(row.get(column), (int, float)):
-            val = row[column]
-            for i in range(num_bins):
-                if bins[i] <= val <= bins[i+1]:
-                    if i < num_bins - 1 and val == bins[i+1]: continue
-                    row[column] = f'Bin {i+1}: [{bins[i]:.2f} - {bins[i+1]:.2f}]'
-                    break
+def discretize_by_binning(dataset, column, num_bins, strategy='equal_width', target_column=None):
+    """Replaces the numeric cells of `column` with bin labels. The 'entropy'
+    strategy places the edges using the classes in `target_column`."""
+    rows = [row for row in dataset if isinstance(row.get(column), (int, float))]
+    if not rows or num_bins <= 0: return dataset
+    classes = [row.get(target_column) for row in rows] if target_column else None
+    binning = binning_logic.fit([row[column] for row in rows], num_bins, strategy, classes)
+    for row in rows:
+        row[column] = binning.label(row[column])
     return dataset
 
 
@@ -149,6 +170,145 @@ def handle_missing_values(dataset, method, column=None):
         raise ValueError(f"Unknown missing value method: {method}")
 
 
+# -----------------------------
+# Fused preprocessing pipeline
+# -----------------------------
+PIPELINE_STEPS = ('normalize_min_max', 'normalize_z_score', 'normalize_decimal_scaling', 'discretize_by_binning', 'fill_mean', 'remove_rows')
+
+def _is_blank(val):
+    return val is None or str(val).strip() == ''
+
+def validate_pipeline(steps):
+    """Checks an ordered list of {'task', 'column', 'params'} steps, raising ValueError."""
+    if not steps: raise ValueError("Pipeline has no steps.")
+    for i, step in enumerate(steps):
+        task = step.get('task')
+        if task not in PIPELINE_STEPS: raise ValueError(f"Unknown pipeline step: {task}")
+        if task == 'remove_rows':
+            # Rows are filtered before any statistic is taken, see pipeline_statistics.
+            if i != 0: raise ValueError("remove_rows must be the first pipeline step.")
+        elif not step.get('column'):
+            raise ValueError(f"Missing column for pipeline step {task}")
+        elif task == 'discretize_by_binning' and step.get('params', {}).get('strategy', 'equal_width') != 'equal_width':
+            # Pass 1 only keeps running min/max, which is all equal-width edges need.
+            raise ValueError("Pipeline binning supports the equal_width strategy only.")
+
+class _ColumnState:
+    """Running summary of a column's numeric cells as it moves through the pipeline."""
+    def __init__(self):
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+        self.min, self.max = math.inf, -math.inf
+        self.missing = 0
+
+    def add(self, val):
+        if isinstance(val, (int, float)):
+            self.n += 1
+            delta = val - self.mean
+            self.mean += delta / self.n
+            self.m2 += delta * (val - self.mean)
+            if val < self.min: self.min = val
+            if val > self.max: self.max = val
+        elif _is_blank(val):
+            self.missing += 1
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n >= 2 else 0
+
+    def rescale(self, offset, divisor):
+        """Tracks the summary through x -> (x - offset) / divisor, with divisor > 0."""
+        self.mean = (self.mean - offset) / divisor
+        self.m2 = self.m2 / divisor ** 2
+        self.min, self.max = (self.min - offset) / divisor, (self.max - offset) / divisor
+
+def pipeline_statistics(rows, steps):
+    """Pass 1: one scan collecting the statistics of every column the steps touch."""
+    columns = {step['column'] for step in steps if step['task'] != 'remove_rows'}
+    remove = bool(steps) and steps[0]['task'] == 'remove_rows'
+    states = {column: _ColumnState() for column in columns}
+    for row in rows:
+        if remove and any(_is_blank(val) for val in row.values()): continue
+        for column, state in states.items():
+            state.add(row.get(column))
+    return states
+
+def _rescaler(offset, divisor):
+    def apply(val):
+        return (val - offset) / divisor if isinstance(val, (int, float)) else val
+    return apply
+
+def _binner(label):
+    def apply(val):
+        return label(val) if isinstance(val, (int, float)) else val
+    return apply
+
+def _filler(mean_val):
+    def apply(val):
+        return mean_val if _is_blank(val) else val
+    return apply
+
+def plan_pipeline(steps, states):
+    """Turns the steps into fused per-column operations, deriving each step's
+    statistics from pass 1 and the steps before it (same results as running
+    the single-step functions one after another)."""
+    ops = []
+    for step in steps:
+        task, column = step['task'], step.get('column')
+        if task == 'remove_rows':
+            ops.append((None, None))
+            continue
+        state = states[column]
+        if state.n == 0: continue
+        if task == 'normalize_min_max':
+            val_range = state.max - state.min
+            if val_range == 0: continue
+            offset, divisor = state.min, val_range
+        elif task == 'normalize_z_score':
+            std_dev = state.std_dev
+            if std_dev == 0: continue
+            offset, divisor = state.mean, std_dev
+        elif task == 'normalize_decimal_scaling':
+            max_abs_val = max(abs(state.min), abs(state.max))
+            if max_abs_val == 0: continue
+            offset, divisor = 0, 10 ** math.ceil(math.log10(max_abs_val))
+        elif task == 'discretize_by_binning':
+            num_bins = int(step.get('params', {}).get('num_bins', 5))
+            if num_bins <= 0 or not state.n: continue
+            binning = binning_logic.Binning(binning_logic.equal_width_edges(state.min, state.max, num_bins))
+            ops.append((column, _binner(binning.label)))
+            states[column] = _ColumnState()  # values are labels from here on
+            states[column].missing = state.missing
+            continue
+        elif task == 'fill_mean':
+            ops.append((column, _filler(state.mean)))
+            state.n += state.missing  # filled cells sit on the mean: m2 is unchanged
+            state.missing = 0
+            continue
+        ops.append((column, _rescaler(offset, divisor)))
+        state.rescale(offset, divisor)
+    return ops
+
+def apply_pipeline(rows, ops):
+    """Pass 2: streams rows through every planned operation at once."""
+    remove = bool(ops) and ops[0][0] is None
+    column_ops = [op for op in ops if op[0] is not None]
+    for row in rows:
+        if remove and any(_is_blank(val) for val in row.values()): continue
+        for column, apply in column_ops:
+            row[column] = apply(row.get(column))
+        yield row
+
+def run_pipeline(row_source, steps):
+    """Runs ordered preprocessing steps in two streaming passes.
+
+    `row_source()` must return a fresh iterator of row dictionaries; it is
+    called once for the statistics pass and once for the transform pass.
+    """
+    validate_pipeline(steps)
+    ops = plan_pipeline(steps, pipeline_statistics(row_source(), steps))
+    return apply_pipeline(row_source(), ops)
+
+
 def calculate_chi_square(dataset, column1, column2):
     """Calculates the Chi-square statistic for two categorical columns."""
     categories1 = sorted(list(set(row[column1] for row in dataset)))
@@ -194,141 +354,68 @@ def prepare_histogram_data(dataset, column, num_bins):
         counts[bin_index] += 1
     return {'labels': labels, 'counts': counts}
 
-def prepare_scatter_plot_data(dataset, column1, column2):
-    """Prepares data for a scatter plot from two numerical columns."""
-    return [{'x': row.get(column1), 'y': row.get(column2)} for row in dataset if isinstance(row.get(column1), (int, float)) and isinstance(row.get(column2), (int, float))]
+def prepare_scatter_plot_points(xs, ys, mask):
+    """Prepares scatter plot data from row-aligned columns and their validity mask."""
+    return [{'x': x, 'y': y} for x, y, ok in zip(xs, ys, mask) if ok]
 
+SCATTER_SAMPLING = ('reservoir', 'density')
 
-# -----------------------------
-# Clustering: k-Means & k-Medoid
-# -----------------------------
-def _extract_numeric_matrix(dataset, columns):
-    matrix = []
-    for row in dataset:
-        vec = []
-        ok = True
-        for c in columns:
-            val = row.get(c)
-            if isinstance(val, (int, float)):
-                vec.append(float(val))
-            else:
-                ok = False
-                break
-        if ok:
-            matrix.append(vec)
-    return matrix
-
-def _euclidean(a, b):
-    return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
-
-def k_means(dataset, columns, k=3, max_iter=100):
-    """Simple k-means implementation operating on selected numeric columns."""
-    matrix = _extract_numeric_matrix(dataset, columns)
-    if not matrix: return {'error': 'No numeric data found for selected columns.'}
-
+def sample_scatter_plot_points(xs, ys, mask, max_points, seed=None):
+    """Uniform sample of at most `max_points` valid points, drawn in one pass
+    with reservoir sampling. Returns the points and the number of valid points."""
     import random
-    n = len(matrix)
-    dim = len(matrix[0])
-    # initialize centroids randomly
-    centroids = [matrix[i][:] for i in random.sample(range(n), min(k, n))]
-
-    for it in range(max_iter):
-        clusters = [[] for _ in range(len(centroids))]
-        for vec in matrix:
-            dists = [_euclidean(vec, c) for c in centroids]
-            idx = dists.index(min(dists))
-            clusters[idx].append(vec)
-
-        moved = False
-        for i, cluster in enumerate(clusters):
-            if not cluster: continue
-            new_centroid = [sum(col) / len(cluster) for col in zip(*cluster)]
-            if any(abs(a - b) > 1e-6 for a, b in zip(new_centroid, centroids[i])):
-                centroids[i] = new_centroid
-                moved = True
-        if not moved:
-            break
-
-    # Map input rows to cluster indexes for a simple response (first N rows considered)
-    assignments = []
-    for vec in matrix:
-        dists = [_euclidean(vec, c) for c in centroids]
-        assignments.append(dists.index(min(dists)))
-
-    return {'task': 'k_means', 'k': len(centroids), 'centroids': centroids, 'assignments_sample': assignments[:200]}
-
-
-def k_medoid(dataset, columns, k=3, max_iter=100):
-    """Simple k-medoid (PAM-like) implementation on selected numeric columns."""
-    matrix = _extract_numeric_matrix(dataset, columns)
-    if not matrix: return {'error': 'No numeric data found for selected columns.'}
+    rng = random.Random(seed)
+    reservoir, total = [], 0
+    for x, y, ok in zip(xs, ys, mask):
+        if not ok: continue
+        total += 1
+        if len(reservoir) < max_points:
+            reservoir.append({'x': x, 'y': y})
+        else:
+            j = rng.randrange(total)
+            if j < max_points: reservoir[j] = {'x': x, 'y': y}
+    return reservoir, total
+
+def density_scatter_plot_points(xs, ys, mask, max_points, x_range, y_range):
+    """Counts valid points per cell of a grid with at most `max_points` cells,
+    in one pass; the (min, max) ranges come from the stored column profile.
+    Returns one {'x', 'y', 'count'} point per non-empty cell (at its centre)
+    and the number of valid points."""
+    side = max(1, math.isqrt(max_points))
+    (x_min, x_max), (y_min, y_max) = x_range, y_range
+    x_width, y_width = (x_max - x_min) / side, (y_max - y_min) / side
+    counts, total = Counter(), 0
+    for x, y, ok in zip(xs, ys, mask):
+        if not ok: continue
+        total += 1
+        i = min(int((x - x_min) / x_width), side - 1) if x_width else 0
+        j = min(int((y - y_min) / y_width), side - 1) if y_width else 0
+        counts[i, j] += 1
+    cells = [{'x': x_min + (i + 0.5) * x_width, 'y': y_min + (j + 0.5) * y_width, 'count': count} for (i, j), count in sorted(counts.items())]
+    return cells, total
 
-    import random
-    n = len(matrix)
-    if k >= n:
-        # trivial: each point is a medoid
-        return {'task': 'k_medoid', 'k': n, 'medoids': matrix, 'assignments_sample': list(range(n))}
-
-    medoid_indices = random.sample(range(n), k)
-    medoids = [matrix[i] for i in medoid_indices]
-
-    for it in range(max_iter):
-        clusters = [[] for _ in range(k)]
-        for idx, vec in enumerate(matrix):
-            dists = [_euclidean(vec, m) for m in medoids]
-            mi = dists.index(min(dists))
-            clusters[mi].append(idx)
-
-        changed = False
-        for i, cluster in enumerate(clusters):
-            if not cluster: continue
-            # pick the medoid as the point minimizing total distance to others
-            best_idx, best_cost = None, float('inf')
-            for candidate_idx in cluster:
-                cost = sum(_euclidean(matrix[candidate_idx], matrix[j]) for j in cluster)
-                if cost < best_cost:
-                    best_cost = cost
-                    best_idx = candidate_idx
-            if best_idx is not None and matrix[best_idx] != medoids[i]:
-                medoids[i] = matrix[best_idx]
-                changed = True
-        if not changed:
-            break
-
-    assignments = []
-    for vec in matrix:
-        dists = [_euclidean(vec, m) for m in medoids]
-        assignments.append(dists.index(min(dists)))
-
-    return {'task': 'k_medoid', 'k': k, 'medoids': medoids, 'assignments_sample': assignments[:200]}
+
+# -----------------------------
+# Clustering helpers (the algorithms live in clustering_logic)
+# -----------------------------
+def matrix_from_columns(arrays, mask):
+    """Builds the row-major matrix of valid rows from row-aligned column arrays."""
+    return [list(vec) for vec, ok in zip(zip(*arrays), mask) if ok]
 
 
 # -----------------------------
 # Association Rules: Apriori
 # -----------------------------
-def apriori(dataset, columns, min_support=0.1, min_confidence=0.6, max_len=3):
+def apriori(dataset, columns, min_support=0.1, min_confidence=0.6, max_len=3, top_k=None, rank_by='confidence'):
     """A small Apriori implementation treating each row as a transaction made of selected column values.
     Values are used as items; to avoid collisions item names are prefixed by column name.
     """
-    transactions = []
-    for row in dataset:
-        items = []
-        for c in columns:
-            val = row.get(c)
-            if val is not None and str(val).strip() != '':
-                items.append(f"{c}={val}")
-        if items:
-            transactions.append(set(items))
+    transactions = itemset_logic.item_transactions(dataset, columns)
 
     n = len(transactions)
     if n == 0:
         return {'error': 'No transactions created from selected columns.'}
 
-    # support counting
-    def support(itemset):
-        cnt = sum(1 for t in transactions if itemset.issubset(t))
-        return cnt / n
-
     # generate frequent itemsets
     freq_itemsets = {}
     # L1
@@ -360,116 +447,32 @@ def apriori(dataset, columns, min_support=0.1, min_confidence=0.6, max_len=3):
         current_L = next_L
         k += 1
 
-    # generate rules
-    rules = []
-    for itemset, sup in list(freq_itemsets.items()):
-        if len(itemset) < 2: continue
-        items = list(itemset)
-        # all non-empty proper subsets
-        from itertools import combinations
-        for r in range(1, len(items)):
-            for antecedent in combinations(items, r):
-                A = frozenset(antecedent)
-                C = itemset.difference(A)
-                if not C: continue
-                conf = support(itemset) / support(A)
-                if conf >= min_confidence:
-                    rules.append({'antecedent': list(A), 'consequent': list(C), 'support': round(sup, 4), 'confidence': round(conf, 4)})
-
-    return {'task': 'apriori', 'frequent_itemsets': {', '.join(list(k)): v for k, v in freq_itemsets.items()}, 'rules': rules}
+    # rules are built from the supports in freq_itemsets
+    return itemset_logic.mining_response(freq_itemsets, min_confidence, top_k, rank_by)
 
 
 # -----------------------------
 # Web Mining: PageRank & HITS
 # -----------------------------
-def pagerank_from_edges(dataset, source_col, target_col, damping=0.85, max_iter=100, tol=1e-6):
+def pagerank_from_edges(dataset, source_col, target_col, damping=0.85, max_iter=100, tol=1e-6, limit=None):
     edges = []
     for row in dataset:
         s = row.get(source_col); t = row.get(target_col)
         if s is None or t is None: continue
         edges.append((str(s), str(t)))
 
-    nodes = set([u for u, v in edges] + [v for u, v in edges])
-    if not nodes:
-        return {'error': 'No edges found using selected columns.'}
-
-    node_list = list(nodes)
-    idx = {n: i for i, n in enumerate(node_list)}
-    N = len(node_list)
-
-    out_links = {n: set() for n in node_list}
-    in_links = {n: set() for n in node_list}
-    for u, v in edges:
-        out_links[u].add(v)
-        in_links[v].add(u)
-
-    pr = {n: 1.0 / N for n in node_list}
-    for it in range(max_iter):
-        new_pr = {}
-        diff = 0.0
-        for n in node_list:
-            rank = (1 - damping) / N
-            rank += damping * sum(pr.get(q, 0.0) / max(1, len(out_links[q])) for q in in_links[n])
-            new_pr[n] = rank
-            diff += abs(rank - pr[n])
-        pr = new_pr
-        if diff < tol:
-            break
-
-    # return sorted
-    sorted_pr = sorted(pr.items(), key=lambda x: x[1], reverse=True)
-    return {'task': 'pagerank', 'scores': [{ 'node': n, 'score': round(s, 6)} for n, s in sorted_pr]}
-
-
-def hits_from_edges(dataset, source_col, target_col, max_iter=100, tol=1e-6):
+    # compiled once to CSR arrays; see graph_logic.pagerank
+    graph = graph_logic.Graph.from_edges(edges)
+    return graph_logic.pagerank_response(graph, damping, max_iter, tol, limit)
+
+
+def hits_from_edges(dataset, source_col, target_col, max_iter=100, tol=1e-6, limit=None):
     edges = []
     for row in dataset:
         s = row.get(source_col); t = row.get(target_col)
         if s is None or t is None: continue
         edges.append((str(s), str(t)))
 
-    nodes = set([u for u, v in edges] + [v for u, v in edges])
-    if not nodes:
-        return {'error': 'No edges found using selected columns.'}
-
-    node_list = list(nodes)
-    in_links = {n: set() for n in node_list}
-    out_links = {n: set() for n in node_list}
-    for u, v in edges:
-        out_links[u].add(v)
-        in_links[v].add(u)
-
-    auth = {n: 1.0 for n in node_list}
-    hub = {n: 1.0 for n in node_list}
-    for it in range(max_iter):
-        # update authority
-        new_auth = {}
-        for n in node_list:
-            new_auth[n] = sum(hub.get(q, 0.0) for q in in_links[n])
-        # normalize
-        norm = math.sqrt(sum(v * v for v in new_auth.values())) or 1.0
-        for n in node_list:
-            new_auth[n] /= norm
-
-        # update hub
-        new_hub = {}
-        for n in node_list:
-            new_hub[n] = sum(new_auth.get(q, 0.0) for q in out_links[n])
-        norm2 = math.sqrt(sum(v * v for v in new_hub.values())) or 1.0
-        for n in node_list:
-            new_hub[n] /= norm2
-
-        # check convergence
-        diff = sum(abs(new_auth[n] - auth.get(n, 0.0)) for n in node_list) + sum(abs(new_hub[n] - hub.get(n, 0.0)) for n in node_list)
-        auth, hub = new_auth, new_hub
-        if diff < tol:
-            break
-
-    sorted_auth = sorted(auth.items(), key=lambda x: x[1], reverse=True)
-    sorted_hub = sorted(hub.items(), key=lambda x: x[1], reverse=True)
-    return {
-        'task': 'hits',
-        'authorities': [{ 'node': n, 'score': round(s, 6)} for n, s in sorted_auth],
-        'hubs': [{ 'node': n, 'score': round(s, 6)} for n, s in sorted_hub]
-    }
+    graph = graph_logic.Graph.from_edges(edges)
+    return graph_logic.hits_response(graph, max_iter, tol, limit)
 
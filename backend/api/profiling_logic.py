@@ -0,0 +1,231 @@
+import math
+import random
+from collections import Counter
+
+from . import columnar_logic
+
+# Quantiles stored for every numeric column of the profile.
+PROFILE_QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+# Continuous columns can have one mode per row; longer mode lists are cut.
+MODE_LIMIT = 50
+
+
+def _is_null(value):
+    return value is None or (isinstance(value, str) and value.strip() == '') or (isinstance(value, float) and math.isnan(value))
+
+
+def _quantile(sorted_data, q):
+    """Linear interpolation between closest ranks; q=0.5 matches `calculate_median`."""
+    pos = (len(sorted_data) - 1) * q
+    lo = int(math.floor(pos))
+    hi = min(lo + 1, len(sorted_data) - 1)
+    if lo == hi or pos == lo: return sorted_data[lo]
+    return sorted_data[lo] + (sorted_data[hi] - sorted_data[lo]) * (pos - lo)
+
+
+def _welford(values):
+    """Single pass count/mean/variance/min/max (sample variance, n - 1)."""
+    n, mean, m2 = 0, 0.0, 0.0
+    min_val, max_val = math.inf, -math.inf
+    for x in values:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+        if x < min_val: min_val = x
+        if x > max_val: max_val = x
+    variance = m2 / (n - 1) if n >= 2 else 0
+    return n, mean, variance, min_val, max_val
+
+
+def _mode(values):
+    if not values: return [], 0, False
+    counts = Counter(values)
+    max_count = max(counts.values())
+    modes = [key for key, value in counts.items() if value == max_count]
+    return modes[:MODE_LIMIT], max_count, len(modes) > MODE_LIMIT
+
+
+def profile_column(values):
+    """Profiles one column given every cell as parsed by `load_full_data`."""
+    nulls = 0
+    numeric = []
+    categories = []
+    for value in values:
+        if _is_null(value): nulls += 1
+        elif isinstance(value, float): numeric.append(value)
+        else: categories.append(value)
+
+    n, mean, variance, min_val, max_val = _welford(numeric)
+    stats = {
+        'count': len(values) - nulls,
+        'nulls': nulls,
+        'numeric_count': n,
+        'distinct': len(set(numeric)) + len(set(categories)),
+        'min': min_val if n else None,
+        'max': max_val if n else None,
+        'mean': mean if n else 0,
+        'variance': variance,
+        'std_dev': math.sqrt(variance),
+    }
+    if n:
+        sorted_data = sorted(numeric)
+        stats['quantiles'] = {str(q): _quantile(sorted_data, q) for q in PROFILE_QUANTILES}
+        stats['median'] = stats['quantiles']['0.5']
+    else:
+        stats['quantiles'] = {}
+        stats['median'] = 0
+    stats['mode'], stats['mode_frequency'], stats['mode_truncated'] = _mode(numeric if n else categories)
+    return stats
+
+
+def profile_dataset(file_path, column_types=None):
+    """Profiles every column of a dataset in one scan of its columnar sidecar."""
+    columnar = columnar_logic.load_columnar(file_path, column_types)
+    return {column: profile_column(columnar.values(column)) for column in dict.fromkeys(columnar.header)}
+
+
+# -----------------------------
+# Streaming sketches (bounded memory)
+# -----------------------------
+class _Compactor(list):
+    def compact(self, rng):
+        """Sorts the buffer and promotes every other item (random offset) to the next level."""
+        self.sort()
+        leftover = [self.pop()] if len(self) % 2 else []
+        promoted = self[1 if rng.random() < 0.5 else 0::2]
+        self[:] = leftover
+        return promoted
+
+
+class KLLSketch:
+    """KLL quantile sketch: mergeable, memory is O(k) regardless of the stream length.
+
+    The normalized rank error of a quantile is roughly 2 / k, see `for_error`.
+    """
+
+    def __init__(self, k=200, c=2.0 / 3.0, seed=None):
+        self.k = max(8, int(k))
+        self.c = c
+        self.n = 0
+        self.compactors = []
+        self.size = 0
+        self.max_size = 0
+        self._rng = random.Random(seed)
+        self._grow()
+
+    @classmethod
+    def for_error(cls, epsilon, seed=None):
+        return cls(k=math.ceil(2.0 / epsilon), seed=seed)
+
+    def _capacity(self, height):
+        depth = len(self.compactors) - height - 1
+        return int(math.ceil(self.c ** depth * self.k)) + 1
+
+    def _grow(self):
+        self.compactors.append(_Compactor())
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def update(self, value):
+        self.compactors[0].append(value)
+        self.size += 1
+        self.n += 1
+        if self.size >= self.max_size: self._compress()
+
+    def _compress(self):
+        for h in range(len(self.compactors)):
+            if len(self.compactors[h]) >= self._capacity(h):
+                if h + 1 >= len(self.compactors): self._grow()
+                self.compactors[h + 1].extend(self.compactors[h].compact(self._rng))
+                self.size = sum(len(c) for c in self.compactors)
+                if self.size < self.max_size: break
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors): self._grow()
+        for h, compactor in enumerate(other.compactors): self.compactors[h].extend(compactor)
+        self.n += other.n
+        self.size = sum(len(c) for c in self.compactors)
+        while self.size >= self.max_size: self._compress()
+
+    def quantiles(self, qs):
+        """Approximate values at the given ranks (0 <= q <= 1)."""
+        weighted = sorted((value, 2 ** h) for h, compactor in enumerate(self.compactors) for value in compactor)
+        if not weighted: return [None for _ in qs]
+        total = sum(w for _, w in weighted)
+        results = []
+        for q in qs:
+            target, cumulative = q * total, 0
+            answer = weighted[-1][0]
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    answer = value
+                    break
+            results.append(answer)
+        return results
+
+
+class HeavyHitters:
+    """Misra-Gries summary: any value seen more than n / capacity times is kept.
+
+    Stored counts underestimate the true frequency by at most n / capacity.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = max(1, int(capacity))
+        self.counts = {}
+        self.n = 0
+
+    @classmethod
+    def for_error(cls, epsilon):
+        return cls(capacity=math.ceil(1.0 / epsilon))
+
+    def update(self, value):
+        self.n += 1
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+        else:
+            for key in list(counts):
+                counts[key] -= 1
+                if counts[key] == 0: del counts[key]
+
+    def merge(self, other):
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.n += other.n
+        if len(self.counts) > self.capacity:
+            cut = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {v: c - cut for v, c in self.counts.items() if c > cut}
+
+    def mode(self):
+        """Values with the highest estimated frequency, and that estimate."""
+        if not self.counts: return [], 0
+        top = max(self.counts.values())
+        return [value for value, count in self.counts.items() if count == top], top
+
+
+def approximate_summary(values, epsilon=0.01, percentiles=(25, 50, 75)):
+    """Streams numeric values once with bounded memory: exact count/mean,
+    approximate median and percentiles (KLL) and approximate mode (Misra-Gries)."""
+    sketch, hitters = KLLSketch.for_error(epsilon), HeavyHitters.for_error(epsilon)
+    n, mean = 0, 0.0
+    for x in values:
+        n += 1
+        mean += (x - mean) / n
+        sketch.update(x)
+        hitters.update(x)
+    ranks = [0.5] + [p / 100 for p in percentiles]
+    answers = sketch.quantiles(ranks)
+    mode, frequency = hitters.mode()
+    return {
+        'count': n,
+        'mean': mean if n else 0,
+        'median': answers[0] if n else 0,
+        'percentiles': {f'{p:g}': v for p, v in zip(percentiles, answers[1:])},
+        'mode': mode,
+        'mode_frequency_estimate': frequency,
+        'epsilon': epsilon,
+    }
@@ -1,6 +1,25 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
 
-from . import processing_logic
+import unittest
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from . import views, processing_logic, columnar_logic, profiling_logic, ingest_logic, vector_logic, binning_logic, classification_logic, histogram_logic, correlation_logic, contingency_logic, imputation_logic, clustering_logic, itemset_logic, graph_logic
+
+
+def _write_csv(test, text):
+	"""Writes `text` to a temporary CSV removed, with its sidecar, when `test` ends."""
+	handle, path = tempfile.mkstemp(suffix='.csv')
+	with os.fdopen(handle, 'w', encoding='utf-8', newline='') as fh:
+		fh.write(text)
+	test.addCleanup(columnar_logic.remove_sidecar, path)
+	test.addCleanup(os.remove, path)
+	return path
 
 
 class ProcessingLogicTests(TestCase):
@@ -15,6 +34,113 @@ class ProcessingLogicTests(TestCase):
 		self.assertIn('frequent_itemsets', res)
 		self.assertIn('rules', res)
 
+	def test_rules_are_ranked_from_the_support_table(self):
+		dataset = [{'A': 'x', 'B': 'u'}, {'A': 'x', 'B': 'v'}, {'A': 'y', 'B': 'u'}, {'A': 'x', 'B': 'u'}]
+		res = processing_logic.apriori(dataset, ['A', 'B'], min_support=0.25, min_confidence=0.5, max_len=2)
+		rule = next(r for r in res['rules'] if r['antecedent'] == ['A=x'] and r['consequent'] == ['B=u'])
+		# support 2/4, confidence 2/3, support(B=u) 3/4
+		self.assertEqual((rule['support'], rule['confidence'], rule['lift']), (0.5, 0.6667, 0.8889))
+		self.assertEqual((rule['leverage'], rule['conviction']), (-0.0625, 0.75))
+		top = processing_logic.apriori(dataset, ['A', 'B'], min_support=0.25, min_confidence=0.5, max_len=2, top_k=2, rank_by='lift')
+		self.assertEqual(top['total_rules'], res['total_rules'])
+		self.assertEqual([r['lift'] for r in top['rules']], sorted((r['lift'] for r in res['rules']), reverse=True)[:2])
+		with self.assertRaises(ValueError):
+			processing_logic.apriori(dataset, ['A', 'B'], min_support=0.25, min_confidence=0.5, max_len=2, top_k=0)
+
+	def test_itemset_miners_match_apriori(self):
+		dataset = [{'A': 'xyz'[i % 3], 'B': 'uv'[i % 2], 'C': '' if i % 5 == 0 else 'pq'[(i // 2) % 2]} for i in range(60)]
+		itemsets = lambda res: {frozenset(key.split(', ')): sup for key, sup in res['frequent_itemsets'].items()}
+		rules = lambda res: sorted((sorted(r['antecedent']), sorted(r['consequent']), r['support'], r['confidence']) for r in res['rules'])
+		for min_support, max_len in ((0.05, 3), (0.3, 2)):
+			expected = processing_logic.apriori(dataset, ['A', 'B', 'C'], min_support=min_support, min_confidence=0.4, max_len=max_len)
+			for miner in (itemset_logic.eclat, itemset_logic.fp_growth):
+				result = miner(dataset, ['A', 'B', 'C'], min_support=min_support, min_confidence=0.4, max_len=max_len)
+				self.assertEqual(itemsets(result), itemsets(expected))
+				self.assertEqual(rules(result), rules(expected))
+
+	def test_pipeline_matches_sequential_steps(self):
+		rows = [{'a': 1.0, 'b': 10.0, 'c': ''}, {'a': 4.0, 'b': '', 'c': 2.0}, {'a': 9.0, 'b': 30.0, 'c': 6.0}, {'a': 2.0, 'b': 20.0, 'c': 'x'}]
+		steps = [
+			{'task': 'fill_mean', 'column': 'b'},
+			{'task': 'normalize_z_score', 'column': 'b'},
+			{'task': 'normalize_min_max', 'column': 'a'},
+			{'task': 'discretize_by_binning', 'column': 'a', 'params': {'num_bins': 3}},
+			{'task': 'normalize_decimal_scaling', 'column': 'c'},
+		]
+		fused = list(processing_logic.run_pipeline(lambda: (dict(row) for row in rows), steps))
+		expected = [dict(row) for row in rows]
+		processing_logic.handle_missing_values(expected, 'fill_mean', 'b')
+		processing_logic.normalize_z_score(expected, 'b')
+		processing_logic.normalize_min_max(expected, 'a')
+		processing_logic.discretize_by_binning(expected, 'a', 3)
+		processing_logic.normalize_decimal_scaling(expected, 'c')
+		for got, want in zip(fused, expected):
+			self.assertEqual(got['a'], want['a'])
+			self.assertEqual(got['c'], want['c'])
+			self.assertAlmostEqual(got['b'], want['b'])
+
+	def test_pipeline_rejects_late_remove_rows(self):
+		with self.assertRaises(ValueError):
+			processing_logic.validate_pipeline([{'task': 'fill_mean', 'column': 'a'}, {'task': 'remove_rows'}])
+
+	def test_scatter_downsampling_bounds_points(self):
+		xs, ys = [float(i) for i in range(1000)], [float(i % 7) for i in range(1000)]
+		mask = [i % 4 != 0 for i in range(1000)]
+		sample, total = processing_logic.sample_scatter_plot_points(xs, ys, mask, 50, seed=1)
+		self.assertEqual((len(sample), total), (50, 750))
+		self.assertFalse(any(point['x'] % 4 == 0 for point in sample))
+		cells, total = processing_logic.density_scatter_plot_points(xs, ys, mask, 30, (0.0, 999.0), (0.0, 6.0))
+		self.assertLessEqual(len(cells), 25)
+		self.assertEqual(sum(cell['count'] for cell in cells), total)
+
+	def test_accelerated_k_means_reaches_a_lloyd_fixed_point(self):
+		points = [[(i * 37) % 17 + (20 if i % 3 == 0 else 0), (i * 11) % 13 + (15 if i % 3 == 1 else 0)] for i in range(300)]
+		result = clustering_logic.k_means(points, k=3, seed=7)
+		self.assertTrue(result['converged'])
+		centroids = result['centroids']
+		assignments = [min(range(3), key=lambda j: clustering_logic._sq_dist(p, centroids[j])) for p in points]
+		for j in range(3):
+			members = [p for p, a in zip(points, assignments) if a == j]
+			for d in range(2): self.assertAlmostEqual(centroids[j][d], sum(p[d] for p in members) / len(members))
+		self.assertAlmostEqual(result['inertia'], sum(clustering_logic._sq_dist(p, centroids[a]) for p, a in zip(points, assignments)))
+		if clustering_logic.np is not None:
+			vectorized = clustering_logic.k_means(clustering_logic.np.array(points, dtype=float), k=3, seed=7, init='random')
+			self.assertAlmostEqual(vectorized['inertia'], clustering_logic.k_means(points, k=3, seed=7, init='random')['inertia'])
+		with self.assertRaises(ValueError):
+			clustering_logic.k_means(points, k=0)
+
+	def test_minibatch_k_means_labels_every_row(self):
+		lines = [f"{(i % 5) + (30 if i % 2 else 0)},{'' if i % 50 == 7 else (i % 3)}" for i in range(400)]
+		path = _write_csv(self, 'x,y\n' + '\n'.join(lines) + '\n')
+		columnar = columnar_logic.load_columnar(path)
+		model = clustering_logic.MiniBatchKMeans(k=2, batch_size=64, seed=1).fit(columnar, ['x', 'y'], max_epochs=5)
+		labels = list(model.assignments(columnar, ['x', 'y']))
+		self.assertEqual(len(labels), 400)
+		self.assertEqual([i for i, label in enumerate(labels) if label is None], list(range(7, 400, 50)))
+		self.assertEqual(sorted(model.sizes), [192, 200])
+		self.assertTrue(all(labels[i] != labels[i + 1] for i in range(0, 398, 2) if labels[i] is not None and labels[i + 1] is not None))
+		with self.assertRaises(ValueError):
+			clustering_logic.MiniBatchKMeans(k=0)
+
+	def test_fast_pam_finds_the_optimal_medoids(self):
+		import itertools, math
+		points = [[(i * 7) % 5 + 10 * (i % 3), (i * 3) % 4 - 6 * (i % 3)] for i in range(24)]
+		cost = lambda medoids: sum(min(math.dist(p, points[m]) for m in medoids) for p in points)
+		optimum = min(cost(medoids) for medoids in itertools.combinations(range(24), 3))
+		result = clustering_logic.k_medoids(points, k=3, method='fastpam')
+		self.assertAlmostEqual(result['cost'], optimum)
+		self.assertAlmostEqual(cost([points.index(m) for m in result['medoids']]), optimum)
+		clara = clustering_logic.k_medoids(points, k=3, method='clara', sample_size=24, samples=2, workers=1, seed=1)
+		self.assertAlmostEqual(clara['cost'], optimum)
+		self.assertGreaterEqual(clustering_logic.k_medoids(points, k=3, method='clarans', workers=1, seed=1)['cost'], optimum - 1e-9)
+		with self.assertRaises(ValueError):
+			clustering_logic.k_medoids(points, k=0)
+		for bad in ({'samples': 0}, {'sample_size': 2}):
+			with self.assertRaises(ValueError):
+				clustering_logic.k_medoids(points, k=3, method='clara', workers=1, **bad)
+		with self.assertRaises(ValueError):
+			clustering_logic.k_medoids(points, k=3, method='clarans', num_local=0)
+
 	def test_pagerank_small(self):
 		dataset = [
 			{'src': '1', 'dst': '2'},
@@ -23,3 +149,297 @@ class ProcessingLogicTests(TestCase):
 		]
 		res = processing_logic.pagerank_from_edges(dataset, 'src', 'dst', damping=0.85)
 		self.assertIn('scores', res)
+
+	def test_pagerank_redistributes_dangling_rank(self):
+		path = _write_csv(self, 'src,dst\n1,2\n2,3\n1,3\n1,3\nx,1\n,2\n')
+		graph = graph_logic.load_graph(columnar_logic.load_columnar(path), 'src', 'dst')
+		# The blank source cell is a node named '', as in the row-based implementation.
+		self.assertEqual((graph.num_nodes, graph.num_edges), (5, 5))
+		self.assertIn('', graph.labels)
+		result = graph_logic.pagerank_response(graph, tol=1e-12)
+		self.assertAlmostEqual(sum(item['score'] for item in result['scores']), 1.0, places=5)
+		self.assertEqual(result['scores'][0]['node'], '3.0')
+		self.assertEqual(result['scores'], processing_logic.pagerank_from_edges(columnar_logic.load_full_data(path), 'src', 'dst', tol=1e-12)['scores'])
+		self.assertEqual(graph_logic.pagerank(graph, max_iter=0)[1], 0)
+		with self.assertRaises(ValueError):
+			graph_logic.pagerank_response(graph, limit=-1)
+
+	def test_graph_index_is_persisted_for_pagerank_and_hits(self):
+		path = _write_csv(self, 'src,dst\na,b\nb,c\nc,a\na,c\n')
+		columnar = columnar_logic.load_columnar(path)
+		compiled = graph_logic.load_graph(columnar, 'src', 'dst')
+		self.assertTrue(os.path.exists(columnar.pair_file('src', 'dst', 'graph.json')))
+		loaded = graph_logic.load_graph(columnar, 'src', 'dst')
+		self.assertEqual(loaded.labels, ['a', 'b', 'c'])
+		self.assertEqual((list(loaded.offsets), list(loaded.targets)), ([0, 2, 3, 4], [1, 2, 2, 0]))
+		self.assertEqual((list(loaded.reverse_offsets), list(loaded.sources)), ([0, 1, 2, 4], [2, 0, 0, 1]))
+		self.assertEqual(graph_logic.hits_response(loaded), graph_logic.hits_response(compiled))
+		rows = columnar_logic.load_full_data(path)
+		self.assertEqual(graph_logic.hits_response(loaded)['authorities'], processing_logic.hits_from_edges(rows, 'src', 'dst')['authorities'])
+		self.assertEqual(graph_logic.pagerank_response(loaded), processing_logic.pagerank_from_edges(rows, 'src', 'dst'))
+		self.assertEqual(graph_logic.hits(loaded, max_iter=0)[2], 0)
+
+
+class ColumnarLogicTests(TestCase):
+	def test_sidecar_matches_csv_loader(self):
+		path = _write_csv(self, 'a,b,c\n1,x,\n2,,3\n,z\n4,y,5\n')
+		columnar_logic.build_sidecar(path)
+		self.assertEqual(columnar_logic.load_full_data(path), processing_logic.load_full_data(path))
+		self.assertEqual(columnar_logic.load_column_data(path, 'c'), processing_logic.load_column_data(path, 'c'))
+		self.assertEqual(columnar_logic.load_columnar(path).kind('a'), columnar_logic.MIXED)
+
+	def test_cached_rows_are_not_corrupted_by_mutating_tasks(self):
+		path = _write_csv(self, 'a\n1\n3\n')
+		processing_logic.normalize_min_max(columnar_logic.load_full_data(path), 'a')
+		self.assertEqual([row['a'] for row in columnar_logic.load_full_data(path, readonly=True)], [1.0, 3.0])
+		with self.assertRaises(TypeError):
+			columnar_logic.load_full_data(path, readonly=True)[0]['a'] = 0
+
+	def test_projected_rows_keep_only_requested_columns(self):
+		path = _write_csv(self, 'a,b,c\n1,x,2\n3,y,4\n')
+		expected = [{'c': 2.0, 'a': 1.0}, {'c': 4.0, 'a': 3.0}]
+		self.assertEqual(columnar_logic.load_full_data(path, columns=['c', 'a']), expected)
+		self.assertEqual(processing_logic.load_full_data(path, columns=['c', 'a']), expected)
+		with self.assertRaises(ValueError):
+			columnar_logic.load_full_data(path, columns=['missing'])
+
+	def test_row_index_seeks_past_quoted_newlines(self):
+		path = _write_csv(self, 'id,text\n1,"a\nb"\n\n2,c\r\n3,"d ""x""\ne"\n4,f')
+		header, rows, total = columnar_logic.read_rows(path, 1, 2)
+		self.assertEqual(header, ['id', 'text'])
+		self.assertEqual(rows, [['2', 'c'], ['3', 'd "x"\ne']])
+		self.assertEqual(total, 4)
+		self.assertEqual(columnar_logic.read_rows(path, 3, 5)[1], [['4', 'f']])
+
+	def test_dataset_cache_evicts_least_recently_used(self):
+		cache = columnar_logic.DatasetCache(max_bytes=columnar_logic._estimate_size([{'a': 1.0}]) * 2)
+		cache.get_or_load('x', lambda: [{'a': 1.0}])
+		cache.get_or_load('y', lambda: [{'a': 2.0}])
+		cache.get_or_load('x', lambda: self.fail('x should be cached'))
+		cache.get_or_load('z', lambda: [{'a': 3.0}])
+		self.assertEqual(cache.get_or_load('y', lambda: [{'a': 4.0}])[0]['a'], 4.0)
+
+	def test_aligned_columns_share_one_mask(self):
+		path = _write_csv(self, 'a,b\n1,2\n,3\n4,x\n5,6\n')
+		(a, b), mask = columnar_logic.load_aligned_columns(path, ['a', 'b'])
+		self.assertEqual(mask, [True, False, False, True])
+		self.assertEqual(columnar_logic.compress(a, mask), [1.0, 5.0])
+		self.assertEqual(columnar_logic.compress(b, mask), [2.0, 6.0])
+
+	def test_histogram_pyramid_merges_persisted_fine_bins(self):
+		path = _write_csv(self, 'v\n' + ''.join(f'{(i * 7919) % 1000 / 3}\n' for i in range(500)))
+		columnar = columnar_logic.load_columnar(path)
+		histogram = histogram_logic.load_histogram(columnar, 'v')
+		self.assertTrue(os.path.exists(columnar.column_file('v', histogram_logic.HISTOGRAM_SUFFIX)))
+		for num_bins in (1, 8, 10, 50, 64, 100):
+			self.assertEqual(histogram_logic.load_histogram(columnar, 'v').merge(num_bins), processing_logic.prepare_histogram_data(columnar_logic.load_full_data(path), 'v', num_bins))
+		zoomed = histogram.merge(4, (0.0, 100.0))
+		self.assertEqual(sum(zoomed['counts']), sum(1 for row in columnar_logic.load_full_data(path) if row['v'] <= 100.0))
+		self.assertFalse(histogram_logic.merges_exactly(7))
+		self.assertFalse(histogram_logic.merges_exactly(8, (0.0, 100.0)))
+		in_range = [{'v': row['v']} for row in columnar_logic.load_full_data(path) if 10.0 <= row['v'] <= 100.0]
+		with mock.patch.object(vector_logic, 'numeric_column', return_value=None):
+			pure = histogram_logic.exact_histogram(columnar, 'v', 10), histogram_logic.exact_histogram(columnar, 'v', 3, (10.0, 100.0))
+		for exact in (histogram_logic.exact_histogram(columnar, 'v', 10), pure[0]):
+			self.assertEqual(exact, processing_logic.prepare_histogram_data(columnar_logic.load_full_data(path), 'v', 10))
+		for exact in (histogram_logic.exact_histogram(columnar, 'v', 3, (10.0, 100.0)), pure[1]):
+			self.assertEqual(sum(exact['counts']), len(in_range))
+			self.assertEqual(exact['labels'], ['[10.00-40.00]', '[40.00-70.00]', '[70.00-100.00]'])
+
+	def test_correlation_matrix_uses_pairwise_complete_rows(self):
+		lines = [f"{1000 + i * 0.5},{'' if i % 5 == 0 else (i * 37) % 11},{'x' if i % 7 == 0 else i * i % 13}" for i in range(40)]
+		path = _write_csv(self, 'a,b,c\n' + '\n'.join(lines) + '\n')
+		columnar = columnar_logic.load_columnar(path)
+		with_numpy = correlation_logic.correlation_matrix(columnar, ['a', 'b', 'c'], chunk_rows=16)
+		numpy, correlation_logic.np = correlation_logic.np, None
+		try:
+			covariance, correlation, counts = correlation_logic.correlation_matrix(columnar, ['a', 'b', 'c'], chunk_rows=16)
+		finally:
+			correlation_logic.np = numpy
+		for i, col1 in enumerate('abc'):
+			for j, col2 in enumerate('abc'):
+				(data1, data2), mask = columnar_logic.load_aligned_columns(path, [col1, col2])
+				data1, data2 = columnar_logic.compress(data1, mask), columnar_logic.compress(data2, mask)
+				self.assertEqual(counts[i][j], len(data1))
+				self.assertAlmostEqual(covariance[i][j], processing_logic.calculate_covariance(data1, data2), places=9)
+				self.assertAlmostEqual(correlation[i][j], processing_logic.calculate_correlation(data1, data2), places=9)
+				self.assertAlmostEqual(with_numpy[1][i][j], correlation[i][j], places=9)
+
+	def test_contingency_engine_matches_chi_square(self):
+		path = _write_csv(self, 'a,b\n' + ''.join(f"{'xyz'[i % 3]},{(i * 7) % 4}\n" for i in range(90)))
+		test = contingency_logic.chi_square_test(columnar_logic.load_columnar(path), 'a', 'b')
+		statistic, df, table = processing_logic.calculate_chi_square(columnar_logic.load_full_data(path), 'a', 'b')
+		self.assertAlmostEqual(test['chi_square_statistic'], statistic)
+		self.assertEqual((test['degrees_of_freedom'], test['contingency_table']), (df, table))
+		self.assertAlmostEqual(contingency_logic.chi_square_sf(3.841458820694124, 1), 0.05, places=9)
+		self.assertAlmostEqual(contingency_logic.chi_square_sf(10.0, 5), 0.0752352, places=6)
+		matrix = contingency_logic.chi_square_matrix(columnar_logic.load_columnar(path), ['a', 'b'])
+		self.assertAlmostEqual(matrix['cramers_v'][0][0], 1.0)
+		self.assertAlmostEqual(matrix['chi_square_statistic'][1][0], statistic)
+
+	def test_null_bitmaps_drive_cleaning_and_imputation(self):
+		path = _write_csv(self, 'a,b,c\n1,x,\n,y,2\n3, ,4\n5,y,\n')
+		columnar = columnar_logic.load_columnar(path)
+		self.assertEqual(imputation_logic.missing_counts(columnar), {'a': 1, 'b': 1, 'c': 2})
+		self.assertEqual(columnar.missing_rows('c'), [0, 3])
+		self.assertEqual(list(imputation_logic.complete_rows(columnar)), processing_logic.handle_missing_values(columnar_logic.load_full_data(path), 'remove_rows'))
+		filled = imputation_logic.impute_rows(columnar, {'a': imputation_logic.fill_value(columnar, 'a', 'mean')})
+		self.assertEqual(list(filled), processing_logic.handle_missing_values(columnar_logic.load_full_data(path), 'fill_mean', 'a'))
+		fills = {'b': imputation_logic.fill_value(columnar, 'b', 'mode'), 'c': imputation_logic.fill_value(columnar, 'c', 'median'), 'a': 0}
+		rows = list(imputation_logic.impute_rows(columnar, fills))
+		self.assertEqual([(row['a'], row['b'], row['c']) for row in rows], [(1.0, 'x', 3.0), (0, 'y', 2.0), (3.0, 'y', 4.0), (5.0, 'y', 3.0)])
+		self.assertEqual(imputation_logic.constant_value('2', 'int'), 2.0)
+		self.assertEqual(imputation_logic.constant_value('2', 'categorical'), '2')
+		with self.assertRaises(ValueError):
+			imputation_logic.constant_value('n/a', 'float')
+
+	def test_stale_sidecar_is_ignored(self):
+		path = _write_csv(self, 'a\n1\n')
+		columnar_logic.build_sidecar(path)
+		with open(path, 'a', encoding='utf-8') as fh:
+			fh.write('2\n')
+		self.assertIsNone(columnar_logic.open_sidecar(path))
+		self.assertEqual(columnar_logic.load_column_data(path, 'a'), [1.0, 2.0])
+
+	def test_spilled_sidecar_matches_in_memory_build(self):
+		lines = [f"{i},{'' if i % 7 == 3 else 'x' if i % 5 else i},{'' if i % 4 else 'y'}" for i in range(45)]
+		path = _write_csv(self, 'a,b,c\n' + '\n'.join(lines) + '\n')
+		expected = processing_logic.load_full_data(path)
+		with mock.patch.object(columnar_logic, 'SPILL_ROWS', 8):
+			meta = columnar_logic.build_sidecar(path)
+		self.assertEqual([column['kind'] for column in meta['columns']], [columnar_logic.NUMERIC, columnar_logic.MIXED, columnar_logic.STRING])
+		columnar = columnar_logic.load_columnar(path)
+		self.assertEqual(list(columnar.iter_rows()), expected)
+		self.assertEqual(columnar.missing_rows('b'), [i for i in range(45) if i % 7 == 3])
+		self.assertEqual(columnar.missing_rows('c'), [i for i in range(45) if i % 4])
+
+
+class ProfilingLogicTests(TestCase):
+	def test_profile_matches_column_statistics(self):
+		path = _write_csv(self, 'a,b\n4,x\n1,y\n,x\n3,x\n1,\n')
+		profile = profiling_logic.profile_dataset(path)
+		data = processing_logic.load_column_data(path, 'a')
+		self.assertEqual(profile['a']['nulls'], 1)
+		self.assertAlmostEqual(profile['a']['mean'], processing_logic.calculate_mean(data))
+		self.assertAlmostEqual(profile['a']['median'], processing_logic.calculate_median(data))
+		self.assertAlmostEqual(profile['a']['variance'], processing_logic.calculate_variance(data))
+		self.assertEqual(profile['a']['mode'], processing_logic.calculate_mode(data))
+		self.assertEqual(profile['b']['mode'], ['x'])
+
+	def test_approximate_summary_stays_within_error_bound(self):
+		values = [float(i % 1000) for i in range(20000)] + [7.0] * 500
+		summary = profiling_logic.approximate_summary(iter(values), epsilon=0.01, percentiles=[10, 90])
+		self.assertEqual(summary['count'], len(values))
+		self.assertEqual(summary['mode'], [7.0])
+		ordered = sorted(values)
+		for rank, value in ((0.5, summary['median']), (0.1, summary['percentiles']['10']), (0.9, summary['percentiles']['90'])):
+			self.assertLess(abs(ordered.index(value) / len(values) - rank), 0.03)
+
+
+class IngestLogicTests(TestCase):
+	def test_ingest_streams_file_and_infers_schema(self):
+		content = b'id,score,name,note,code\n1,2.5,"a\nb",,x\n2,3,c,,7\n'
+		path = _write_csv(self, '')
+		chunks = [content[i:i + 7] for i in range(0, len(content), 7)]
+		metadata = ingest_logic.ingest_upload(chunks, path)
+		with open(path, 'rb') as fh:
+			self.assertEqual(fh.read(), content)
+		self.assertEqual(metadata['row_count'], 2)
+		self.assertEqual(metadata['byte_size'], len(content))
+		self.assertEqual(metadata['column_types'], {'id': 'int', 'score': 'float', 'name': 'string', 'note': 'empty', 'code': 'categorical'})
+		self.assertEqual(columnar_logic.load_full_data(path), processing_logic.load_full_data(path, metadata['column_types']))
+		self.assertEqual(processing_logic.load_full_data(path, metadata['column_types']), processing_logic.load_full_data(path))
+
+	def test_encode_csv_round_trips_through_ingest(self):
+		rows = [{'a': 0.1, 'b': 'x,y'}, {'a': None, 'b': 'z'}]
+		path = _write_csv(self, '')
+		metadata = ingest_logic.ingest_upload(ingest_logic.encode_csv(['a', 'b'], rows, batch_size=1), path)
+		self.assertEqual(metadata['row_count'], 2)
+		self.assertEqual(columnar_logic.load_full_data(path), [{'a': 0.1, 'b': 'x,y'}, {'a': '', 'b': 'z'}])
+
+
+class BinningLogicTests(TestCase):
+	def test_strategies_place_edges(self):
+		values = [float(v) for v in range(1, 101)]
+		width = binning_logic.fit(values, 4)
+		self.assertEqual(width.label(25.75), 'Bin 2: [25.75 - 50.50]')
+		self.assertEqual(width.label(100.0), 'Bin 4: [75.25 - 100.00]')
+		frequency = binning_logic.fit(values + [1.0] * 100, 4, 'equal_frequency')
+		self.assertEqual(frequency.edges, [1.0, 51.0, 100.0])
+		classes = ['low' if v <= 40 else 'high' for v in values]
+		self.assertEqual(binning_logic.fit(values, strategy='entropy', classes=classes).edges, [1.0, 40.5, 100.0])
+
+	def test_tree_preprocessing_uses_shared_bins(self):
+		dataset = [{'x': float(v), 'y': 'a' if v < 10 else 'b'} for v in range(20)]
+		processed = classification_logic.preprocess_for_tree(dataset, ['x'], 'entropy', 'y')
+		self.assertEqual({row['x'] for row in processed}, {'[0.00-9.50]', '[9.50-19.00]'})
+		self.assertEqual(dataset[0]['x'], 0.0)
+
+@unittest.skipUnless(vector_logic.available(), 'numpy is not installed')
+class VectorLogicTests(TestCase):
+	def test_vectorized_transforms_match_row_functions(self):
+		path = _write_csv(self, 'v,w\n' + ''.join(f'{(i * 37) % 101 / 7},{i}\n' for i in range(60)))
+		values = vector_logic.numeric_column(columnar_logic.load_columnar(path), 'v')
+		for task in vector_logic.VECTOR_TASKS:
+			expected = getattr(processing_logic, task)(columnar_logic.load_full_data(path), 'v', *([4] if task == 'discretize_by_binning' else []))
+			rows = vector_logic.replace_column(columnar_logic.load_full_data(path), 'v', vector_logic.transform_column(task, values, 4))
+			self.assertEqual(list(rows), expected, task)
+		for strategy in ('equal_frequency', 'entropy'):
+			expected = processing_logic.discretize_by_binning(columnar_logic.load_full_data(path), 'v', 4, strategy, 'w' if strategy == 'entropy' else None)
+			self.assertEqual([row['v'] for row in expected], vector_logic.discretize_by_binning(values, 4, strategy, [row['w'] for row in columnar_logic.load_full_data(path)]))
+		self.assertEqual(vector_logic.prepare_histogram_data(values, 7), processing_logic.prepare_histogram_data(columnar_logic.load_full_data(path), 'v', 7))
+
+	def test_vectorized_z_score_is_bit_exact(self):
+		values = [((i * 7919) % 1009 - 504) * 10 ** ((i % 9) - 4) / 3 for i in range(500)]
+		expected = processing_logic.normalize_z_score([{'v': v} for v in values], 'v')
+		self.assertEqual(vector_logic.normalize_z_score(vector_logic.np.array(values)).tolist(), [row['v'] for row in expected])
+
+
+class ApiViewTests(TestCase):
+	def setUp(self):
+		media = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+		media_settings = override_settings(MEDIA_ROOT=media)
+		media_settings.enable()
+		self.addCleanup(media_settings.disable)
+		self.media = media
+		response = self.client.post('/api/upload/', {'dataset': SimpleUploadedFile('data.csv', b'a,b\n1,x\n,y\n3,x\n5,\n')})
+		self.assertEqual(response.status_code, 201)
+
+	def _post(self, url, body):
+		return self.client.post(url, json.dumps(body), content_type='application/json')
+
+	def test_preview_pages_through_rows_within_bounds(self):
+		response = self.client.get('/api/preview/data.csv/', {'offset': 1, 'limit': 2})
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.json()['data'], [{'a': '', 'b': 'y'}, {'a': '3', 'b': 'x'}])
+		self.assertEqual(response.json()['total_rows'], 4)
+		self.assertEqual(self.client.get('/api/preview/data.csv/', {'offset': 10}).json()['data'], [])
+		for query in ({'offset': -1}, {'limit': 0}, {'limit': views.MAX_PREVIEW_ROWS + 1}, {'limit': 'x'}):
+			self.assertEqual(self.client.get('/api/preview/data.csv/', query).status_code, 400, query)
+		self.assertEqual(self.client.get('/api/preview/missing.csv/').status_code, 404)
+
+	def test_materialize_rejects_unsafe_output_filenames(self):
+		for name in ('../x.csv', 'a/b.csv', 'x.txt', '.csv'):
+			response = self._post('/api/process/', {'filename': 'data.csv', 'task': 'normalize_min_max', 'column': 'a', 'params': {'materialize': True, 'output_filename': name}})
+			self.assertEqual(response.status_code, 400, name)
+			response = self._post('/api/pipeline/', {'filename': 'data.csv', 'steps': [{'task': 'normalize_min_max', 'column': 'a'}], 'materialize': True, 'output_filename': name})
+			self.assertEqual(response.status_code, 400, name)
+		self.assertEqual([name for name in os.listdir(self.media) if name.endswith('.csv')], ['data.csv'])
+
+	def test_pipeline_rejects_invalid_steps(self):
+		for steps in ([{'task': 'sort', 'column': 'a'}], [{'task': 'fill_mean'}], [{'task': 'fill_mean', 'column': 'missing'}], []):
+			response = self._post('/api/pipeline/', {'filename': 'data.csv', 'steps': steps})
+			self.assertEqual(response.status_code, 400, steps)
+			self.assertIn('error', response.json())
+		self.assertEqual(self._post('/api/pipeline/', {'filename': 'data.csv'}).status_code, 400)
+
+	def test_pipeline_materializes_derived_dataset(self):
+		steps = [{'task': 'fill_mean', 'column': 'a'}, {'task': 'normalize_min_max', 'column': 'a'}]
+		response = self._post('/api/pipeline/', {'filename': 'data.csv', 'steps': steps, 'materialize': True, 'output_filename': 'clean.csv'})
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response.json()['derived_dataset']['filename'], 'clean.csv')
+		self.assertEqual(response.json()['rows_after'], 4)
+		self.assertTrue(os.path.exists(os.path.join(self.media, 'clean.csv')))
+		preview = self.client.get('/api/preview/clean.csv/').json()['data']
+		self.assertEqual([row['a'] for row in preview], ['0.0', '0.5', '0.5', '1.0'])
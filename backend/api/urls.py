@@ -7,6 +7,7 @@ urlpatterns = [
     path('preview/<str:filename>/', views.preview_file, name='preview_file'),
     path('process/', views.process_data, name='process_data'),
     path('classify/', views.classify_data, name='classify_data'),
+    path('pipeline/', views.run_pipeline, name='run_pipeline'),
     path('datasets/', views.list_datasets, name='list_datasets'),
     path('datasets/<int:dataset_id>/analyses/', views.list_dataset_analyses, name='list_dataset_analyses'),
     path('datasets/<int:dataset_id>/delete/', views.delete_dataset, name='delete_dataset'),
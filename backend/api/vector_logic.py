@@ -0,0 +1,105 @@
+import math
+import sys
+
+from .compat import np  # None without NumPy: the row-based functions in processing_logic are used instead
+from . import binning_logic, columnar_logic
+
+# Array-backed versions of the single-column transforms of processing_logic.
+# They run on the float64 columns of the sidecar and return exactly what the
+# row-based functions would put in the column. Sums add the floats the way the
+# builtin sum does, so means and deviations match calculate_mean & co.
+VECTOR_TASKS = ('normalize_min_max', 'normalize_z_score', 'normalize_decimal_scaling', 'discretize_by_binning')
+
+
+def available():
+    return np is not None
+
+
+def numeric_column(columnar, column):
+    """Read-only float64 array of a purely numeric sidecar column, or None when
+    the vectorized path does not apply (NumPy missing, text or NaN cells)."""
+    if np is None or columnar.kind(column) != columnar_logic.NUMERIC: return None
+    values = np.frombuffer(columnar.floats(column), dtype=np.float64)
+    if np.isnan(values).any(): return None
+    return values
+
+
+def _builtin_sum(values):
+    """`sum(values.tolist())` without boxing every element: the builtin adds
+    floats left to right, as cumsum does, until Python 3.12 compensates them."""
+    if values.size == 0: return 0
+    if sys.version_info >= (3, 12): return sum(values.tolist())
+    return float(np.cumsum(values)[-1])
+
+
+def normalize_min_max(values):
+    if values.size == 0: return values
+    min_val, max_val = float(values.min()), float(values.max())
+    val_range = max_val - min_val
+    if val_range == 0: return values
+    return (values - min_val) / val_range
+
+
+def normalize_z_score(values):
+    n = values.size
+    if n == 0: return values
+    mean = _builtin_sum(values) / n
+    # float_power squares through C pow() like `(x - mean) ** 2` does; `** 2` on an array multiplies.
+    std_dev = math.sqrt(_builtin_sum(np.float_power(values - mean, 2)) / (n - 1)) if n >= 2 else 0
+    if std_dev == 0: return values
+    return (values - mean) / std_dev
+
+
+def normalize_decimal_scaling(values):
+    if values.size == 0: return values
+    max_abs_val = float(np.abs(values).max())
+    if max_abs_val == 0: return values
+    return values / 10 ** math.ceil(math.log10(max_abs_val))
+
+
+def discretize_by_binning(values, num_bins, strategy='equal_width', classes=None):
+    """Bin label of every value, assigned with a binary search over the bin edges."""
+    if values.size == 0 or num_bins <= 0: return values
+    if strategy == 'equal_width':
+        binning = binning_logic.Binning(binning_logic.equal_width_edges(float(values.min()), float(values.max()), num_bins))
+    elif strategy == 'equal_frequency':
+        binning = binning_logic.Binning(binning_logic.equal_frequency_edges(np.sort(values).tolist(), num_bins))
+    else:
+        binning = binning_logic.fit(values.tolist(), num_bins, strategy, classes)
+    index = np.clip(np.searchsorted(np.array(binning.edges), values, side='right') - 1, 0, binning.num_bins - 1)
+    return [binning.labels[i] for i in index.tolist()]
+
+
+def transform_column(task, values, num_bins=5, strategy='equal_width', classes=None):
+    if task == 'normalize_min_max': return normalize_min_max(values)
+    if task == 'normalize_z_score': return normalize_z_score(values)
+    if task == 'normalize_decimal_scaling': return normalize_decimal_scaling(values)
+    if task == 'discretize_by_binning': return discretize_by_binning(values, num_bins, strategy, classes)
+    raise ValueError(f"No vectorized version of task: {task}")
+
+
+def replace_column(rows, column, values):
+    """Streams rows with `column` replaced by the transformed values."""
+    cells = values.tolist() if hasattr(values, 'tolist') else values
+    for row, cell in zip(rows, cells):
+        row[column] = cell
+        yield row
+
+
+def prepare_histogram_data(values, num_bins):
+    """Vectorized `processing_logic.prepare_histogram_data`."""
+    if values.size == 0 or num_bins <= 0: return {'labels': [], 'counts': []}
+    min_val, max_val = float(values.min()), float(values.max())
+    if min_val == max_val: return {'labels': [f'{min_val:.2f}'], 'counts': [int(values.size)]}
+    bin_width = (max_val - min_val) / num_bins
+    bins = [min_val + i * bin_width for i in range(num_bins + 1)]
+    labels = [f'[{bins[i]:.2f}-{bins[i+1]:.2f}]' for i in range(num_bins)]
+    return {'labels': labels, 'counts': bin_counts(values, min_val, max_val, num_bins)}
+
+
+def bin_counts(values, min_val, max_val, num_bins):
+    """Equal-width bin counts over [min_val, max_val] (max_val > min_val)."""
+    bin_width = (max_val - min_val) / num_bins
+    index = np.minimum(((values - min_val) / bin_width).astype(np.int64), num_bins - 1)
+    index[values == max_val] = num_bins - 1
+    return np.bincount(index, minlength=num_bins).tolist()
@@ -3,12 +3,14 @@ from django.views.decorators.csrf import csrf_exempt
 from django.core.files.storage import FileSystemStorage
 import os
 from django.conf import settings
-import csv
+import itertools
 import json
 from .models import Dataset, AnalysisResult
-from . import processing_logic, classification_logic
+from . import processing_logic, classification_logic, columnar_logic, profiling_logic, ingest_logic, vector_logic, binning_logic, histogram_logic, correlation_logic, contingency_logic, imputation_logic, clustering_logic, itemset_logic, graph_logic
 from . import evaluation_logic
 
+MAX_PREVIEW_ROWS = 1000
+
 @csrf_exempt
 def upload_file(request):
     if request.method == 'POST' and request.FILES.get('dataset'):
@@ -16,22 +18,22 @@ def upload_file(request):
         fs = FileSystemStorage()
         
         if fs.exists(uploaded_file.name):
+            columnar_logic.remove_sidecar(fs.path(uploaded_file.name))
             fs.delete(uploaded_file.name)
             
-        filename = fs.save(uploaded_file.name, uploaded_file)
-        file_path = os.path.join(settings.MEDIA_ROOT, filename)
+        filename = fs.get_available_name(uploaded_file.name)
+        file_path = fs.path(filename)
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                header = next(reader, [])
+            metadata = ingest_logic.ingest_upload(uploaded_file.chunks(), file_path)
+            profile = profiling_logic.profile_dataset(file_path, metadata['column_types'])
             
             dataset, created = Dataset.objects.update_or_create(
                 filename=filename,
-                defaults={'columns': header}
+                defaults=dict(metadata, profile=profile)
             )
         except Exception as e:
-            return JsonResponse({'error': f'Could not process CSV headers: {str(e)}'}, status=400)
+            return JsonResponse({'error': f'Could not process the uploaded CSV: {str(e)}'}, status=400)
 
         return JsonResponse({
             'message': f'File "{filename}" uploaded successfully.',
@@ -42,20 +44,73 @@ def upload_file(request):
     return JsonResponse({'error': 'Invalid request method or no file provided.'}, status=400)
 
 def preview_file(request, filename):
+    """
+    Returns `limit` rows (20 by default) starting at data row `offset`, seeking
+    straight to them through the row offset index built at upload.
+    """
     file_path = os.path.join(settings.MEDIA_ROOT, filename)
     if not os.path.exists(file_path): return JsonResponse({'error': 'File not found.'}, status=404)
     try:
-        preview_data, header = [], []
-        with open(file_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.reader(csvfile)
-            header = next(reader, None)
-            if header is None: return JsonResponse({'error': 'Cannot read header.'}, status=400)
-            for i, row in enumerate(reader):
-                if i >= 20: break
-                preview_data.append({header[j]: cell for j, cell in enumerate(row)})
-        return JsonResponse({'filename': filename, 'header': header, 'data': preview_data})
+        offset = int(request.GET.get('offset', 0))
+        limit = int(request.GET.get('limit', 20))
+    except ValueError:
+        return JsonResponse({'error': 'offset and limit must be integers.'}, status=400)
+    if offset < 0 or not 0 < limit <= MAX_PREVIEW_ROWS:
+        return JsonResponse({'error': f'offset must be >= 0 and limit between 1 and {MAX_PREVIEW_ROWS}.'}, status=400)
+    try:
+        header, rows, total_rows = columnar_logic.read_rows(file_path, offset, limit)
+        if not header: return JsonResponse({'error': 'Cannot read header.'}, status=400)
+        preview_data = [{header[j]: cell for j, cell in enumerate(row) if j < len(header)} for row in rows]
+        return JsonResponse({'filename': filename, 'header': header, 'data': preview_data, 'offset': offset, 'limit': limit, 'total_rows': total_rows})
     except Exception as e: return JsonResponse({'error': str(e)}, status=500)
 
+def _output_filename_error(name):
+    """The reason a requested name for a derived dataset is rejected, or None:
+    it must be a bare file name (no directories) ending in `.csv`."""
+    if name is None or name == '': return None
+    if not isinstance(name, str) or os.path.basename(name) != name or '\\' in name \
+            or name.startswith('.') or not name.lower().endswith('.csv') or len(name) <= len('.csv'):
+        return 'output_filename must be a plain file name ending in .csv.'
+    return None
+
+def _materialize_dataset(parent, rows, lineage, output_filename=None, extra_columns=()):
+    """
+    Streams transformed rows to a new CSV and registers it as a Dataset derived
+    from `parent`, with `extra_columns` appended to its header. Returns the
+    derived dataset summary, the first 100 rows and the number of rows written.
+    """
+    sample, row_count = [], 0
+    def observe(rows):
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            if len(sample) < 100: sample.append(row)
+            yield row
+
+    fs = FileSystemStorage()
+    requested = output_filename or f"{os.path.splitext(parent.filename)[0]}_{lineage['task']}.csv"
+    filename = fs.get_available_name(requested)
+    file_path = fs.path(filename)
+    header = list(dict.fromkeys(list(parent.columns) + list(extra_columns)))
+    metadata = ingest_logic.ingest_upload(ingest_logic.encode_csv(header, observe(rows)), file_path)
+    derived = Dataset.objects.create(
+        filename=filename,
+        parent=parent,
+        lineage=lineage,
+        profile=profiling_logic.profile_dataset(file_path),
+        **metadata
+    )
+    return {'id': derived.id, 'filename': derived.filename, 'parent_id': parent.id}, sample, row_count
+
+def _column_profile(dataset_obj, file_path, column):
+    """Returns the stored statistics of a column, profiling the dataset once if needed."""
+    if not dataset_obj.profile:
+        dataset_obj.profile = profiling_logic.profile_dataset(file_path, dataset_obj.column_types)
+        dataset_obj.save(update_fields=['profile'])
+    if column not in dataset_obj.profile:
+        raise ValueError(f"Column '{column}' not found in the file.")
+    return dataset_obj.profile[column]
+
 @csrf_exempt
 def process_data(request):
     if request.method != 'POST': return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
@@ -63,6 +118,8 @@ def process_data(request):
         body = json.loads(request.body)
         filename, task = body.get('filename'), body.get('task')
         if not all([filename, task]): return JsonResponse({'error': 'Missing filename or task'}, status=400)
+        name_error = _output_filename_error((body.get('params') or {}).get('output_filename'))
+        if name_error: return JsonResponse({'error': name_error}, status=400)
         
         try:
             dataset_obj = Dataset.objects.get(filename=filename)
@@ -75,77 +132,259 @@ def process_data(request):
         if task in ['central_tendency', 'dispersion_of_data']:
             column = body.get('column')
             if not column: return JsonResponse({'error': 'Missing column name'}, status=400)
-            data = processing_logic.load_column_data(file_path, column)
-            if task == 'central_tendency':
-                result = {'task': 'Measures of Central Tendency', 'column': column, 'mean': round(processing_logic.calculate_mean(data), 4), 'median': round(processing_logic.calculate_median(data), 4), 'mode': processing_logic.calculate_mode(data)}
+            params = body.get('params', {})
+            if task == 'central_tendency' and params.get('approximate'):
+                epsilon = float(params.get('epsilon', 0.01))
+                if not 0 < epsilon < 1: return JsonResponse({'error': 'epsilon must be between 0 and 1'}, status=400)
+                percentiles = [float(p) for p in params.get('percentiles', [25, 50, 75])]
+                columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+                summary = profiling_logic.approximate_summary(columnar.iter_numeric(column), epsilon, percentiles)
+                result = {'task': 'Measures of Central Tendency', 'column': column, 'approximate': True, 'epsilon': epsilon, 'mean': round(summary['mean'], 4), 'median': round(summary['median'], 4), 'mode': summary['mode'], 'mode_frequency_estimate': summary['mode_frequency_estimate'], 'percentiles': summary['percentiles']}
+            elif task == 'central_tendency':
+                stats = _column_profile(dataset_obj, file_path, column)
+                # The profile keeps the category mode of text columns; this task reports numbers only.
+                if not stats['numeric_count']: mode = []
+                elif stats['mode_truncated']: mode = processing_logic.calculate_mode(columnar_logic.load_column_data(file_path, column, dataset_obj.column_types))
+                else: mode = stats['mode']
+                result = {'task': 'Measures of Central Tendency', 'column': column, 'mean': round(stats['mean'], 4), 'median': round(stats['median'], 4), 'mode': mode}
             elif task == 'dispersion_of_data':
-                result = {'task': 'Dispersion of Data', 'column': column, 'variance': round(processing_logic.calculate_variance(data), 4), 'standard_deviation': round(processing_logic.calculate_std_dev(data), 4)}
+                stats = _column_profile(dataset_obj, file_path, column)
+                result = {'task': 'Dispersion of Data', 'column': column, 'variance': round(stats['variance'], 4), 'standard_deviation': round(stats['std_dev'], 4)}
 
         elif task == 'correlation_covariance':
             col1, col2 = body.get('column1'), body.get('column2')
             if not all([col1, col2]): return JsonResponse({'error': 'Missing column1 or column2'}, status=400)
-            data1, data2 = processing_logic.load_column_data(file_path, col1), processing_logic.load_column_data(file_path, col2)
+            (data1, data2), mask = columnar_logic.load_aligned_columns(file_path, [col1, col2], dataset_obj.column_types)
+            data1, data2 = columnar_logic.compress(data1, mask), columnar_logic.compress(data2, mask)
             result = {'task': 'Correlation and Covariance', 'columns': f'{col1} and {col2}', 'covariance': round(processing_logic.calculate_covariance(data1, data2), 4), 'correlation_coefficient': round(processing_logic.calculate_correlation(data1, data2), 4)}
 
+        elif task == 'correlation_matrix':
+            columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+            columns = body.get('params', {}).get('columns') or [c for c in dict.fromkeys(columnar.header) if columnar.kind(c) != columnar_logic.STRING]
+            missing = [c for c in columns if c not in columnar.header]
+            if missing: return JsonResponse({'error': f'Unknown columns: {missing}'}, status=400)
+            covariance, correlation, pair_counts = correlation_logic.correlation_matrix(columnar, columns)
+            result = {
+                'task': 'Correlation Matrix',
+                'columns': columns,
+                'covariance': [[round(v, 4) for v in row] for row in covariance],
+                'correlation': [[round(v, 4) for v in row] for row in correlation],
+                'pair_counts': pair_counts,
+            }
+
         elif task in ['normalize_min_max', 'normalize_z_score', 'normalize_decimal_scaling', 'discretize_by_binning']:
             column = body.get('column')
             if not column: return JsonResponse({'error': 'Missing column name'}, status=400)
-            dataset = processing_logic.load_full_data(file_path)
-            if task == 'normalize_min_max': result_data = processing_logic.normalize_min_max(dataset, column)
-            elif task == 'normalize_z_score': result_data = processing_logic.normalize_z_score(dataset, column)
-            elif task == 'normalize_decimal_scaling': result_data = processing_logic.normalize_decimal_scaling(dataset, column)
-            elif task == 'discretize_by_binning':
-                num_bins = body.get('params', {}).get('num_bins', 5)
-                result_data = processing_logic.discretize_by_binning(dataset, column, num_bins)
-            result = {'task': task, 'column': column, 'processed_data': result_data[:100]}
+            params = body.get('params', {})
+            num_bins = params.get('num_bins', 5)
+            strategy, target_column = params.get('strategy', 'equal_width'), params.get('target_column')
+            if strategy not in binning_logic.STRATEGIES: return JsonResponse({'error': f'Unknown binning strategy: {strategy}'}, status=400)
+            if strategy == 'entropy' and target_column not in dataset_obj.columns: return JsonResponse({'error': 'Entropy binning needs a valid target_column'}, status=400)
+            columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+            values = vector_logic.numeric_column(columnar, column)
+            if values is not None:
+                # Whole-column NumPy path; rows are only built for what is returned or written.
+                classes = columnar.values(target_column) if strategy == 'entropy' else None
+                transformed = vector_logic.transform_column(task, values, num_bins, strategy, classes)
+                result_data = vector_logic.replace_column(columnar.iter_rows(), column, transformed)
+                if not params.get('materialize'): result_data = list(itertools.islice(result_data, 100))
+            else:
+                dataset = columnar_logic.load_full_data(file_path, dataset_obj.column_types)
+                if task == 'normalize_min_max': result_data = processing_logic.normalize_min_max(dataset, column)
+                elif task == 'normalize_z_score': result_data = processing_logic.normalize_z_score(dataset, column)
+                elif task == 'normalize_decimal_scaling': result_data = processing_logic.normalize_decimal_scaling(dataset, column)
+                elif task == 'discretize_by_binning': result_data = processing_logic.discretize_by_binning(dataset, column, num_bins, strategy, target_column)
+            result = {'task': task, 'column': column}
+            if params.get('materialize'):
+                lineage = {'task': task, 'column': column, 'params': params}
+                result['derived_dataset'], result['processed_data'], _ = _materialize_dataset(dataset_obj, result_data, lineage, params.get('output_filename'))
+            else:
+                result['processed_data'] = result_data[:100]
 
         elif task == 'data_cleaning':
-            method = body.get('params', {}).get('method')
+            params = body.get('params', {})
+            method = params.get('method')
             if not method: return JsonResponse({'error': 'Missing cleaning method'}, status=400)
-            dataset = processing_logic.load_full_data(file_path)
+            columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
             if method == 'fill_mean':
                 column = body.get('column')
                 if not column: return JsonResponse({'error': 'Missing column for fill_mean'}, status=400)
-                result_data = processing_logic.handle_missing_values(dataset, method, column)
-            else: result_data = processing_logic.handle_missing_values(dataset, method)
-            result = {'task': 'Data Cleaning', 'method': method, 'rows_before': len(dataset), 'rows_after': len(result_data), 'processed_data': result_data[:100]}
+                if column not in dataset_obj.columns: return JsonResponse({'error': f"Column '{column}' not found in the file."}, status=400)
+                mean_val = imputation_logic.fill_value(columnar, column, 'mean')
+                result_data = imputation_logic.impute_rows(columnar, {column: mean_val} if mean_val is not None else {})
+                rows_after = columnar.row_count
+            elif method == 'remove_rows':
+                incomplete = imputation_logic.incomplete_rows(columnar)
+                result_data = imputation_logic.complete_rows(columnar, incomplete)
+                rows_after = columnar.row_count - len(incomplete)
+            else: return JsonResponse({'error': f'Unknown missing value method: {method}'}, status=400)
+            result = {'task': 'Data Cleaning', 'method': method, 'rows_before': columnar.row_count, 'rows_after': rows_after, 'missing_counts': imputation_logic.missing_counts(columnar)}
+            if params.get('materialize'):
+                lineage = {'task': task, 'column': body.get('column'), 'params': params}
+                result['derived_dataset'], result['processed_data'], _ = _materialize_dataset(dataset_obj, result_data, lineage, params.get('output_filename'))
+            else:
+                result['processed_data'] = list(itertools.islice(result_data, 100))
+
+        elif task == 'impute':
+            # params.columns: [{'column', 'method': mean|median|mode|constant, 'value' (constant only)}]
+            params = body.get('params', {})
+            specs = params.get('columns') or []
+            if not specs: return JsonResponse({'error': 'Missing columns to impute'}, status=400)
+            columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+            counts = imputation_logic.missing_counts(columnar)
+            fills, filled = {}, {}
+            for spec in specs:
+                column, method = spec.get('column'), spec.get('method', 'mean')
+                if column not in counts: return JsonResponse({'error': f"Column '{column}' not found in the file."}, status=400)
+                if method not in imputation_logic.IMPUTE_METHODS: return JsonResponse({'error': f'Unknown imputation method: {method}'}, status=400)
+                if method == 'constant':
+                    if spec.get('value') is None: return JsonResponse({'error': f"Missing constant value for '{column}'"}, status=400)
+                    try:
+                        spec_value = imputation_logic.constant_value(spec['value'], dataset_obj.column_types.get(column))
+                    except ValueError:
+                        return JsonResponse({'error': f"Constant value for numeric column '{column}' must be a number."}, status=400)
+                else: spec_value = None
+                value = imputation_logic.fill_value(columnar, column, method, spec_value)
+                if value is not None: fills[column] = value
+                filled[column] = {'method': method, 'value': value, 'filled': counts[column] if value is not None else 0}
+            rows = imputation_logic.impute_rows(columnar, fills)
+            result = {'task': 'Imputation', 'rows': columnar.row_count, 'missing_counts': counts, 'imputed': filled}
+            if params.get('materialize'):
+                lineage = {'task': task, 'params': params}
+                result['derived_dataset'], result['processed_data'], _ = _materialize_dataset(dataset_obj, rows, lineage, params.get('output_filename'))
+            else:
+                result['processed_data'] = list(itertools.islice(rows, 100))
 
         elif task == 'chi_square_test':
-            col1, col2 = body.get('column1'), body.get('column2')
-            if not all([col1, col2]): return JsonResponse({'error': 'Missing column1 or column2'}, status=400)
-            dataset = processing_logic.load_full_data(file_path)
-            statistic, df, table = processing_logic.calculate_chi_square(dataset, col1, col2)
-            result = {'task': 'Chi-square Test', 'columns': f'{col1} and {col2}', 'chi_square_statistic': round(statistic, 4), 'degrees_of_freedom': df, 'contingency_table': table}
+            params = body.get('params', {})
+            columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+            if params.get('mode') == 'all_pairs':
+                columns = params.get('columns') or [c for c in dict.fromkeys(columnar.header) if dataset_obj.column_types.get(c, ingest_logic.CATEGORICAL) in (ingest_logic.CATEGORICAL, ingest_logic.STRING) and columnar.kind(c) != columnar_logic.NUMERIC]
+                missing = [c for c in columns if c not in columnar.header]
+                if missing: return JsonResponse({'error': f'Unknown columns: {missing}'}, status=400)
+                matrix = contingency_logic.chi_square_matrix(columnar, columns)
+                matrix['chi_square_statistic'] = [[round(v, 4) for v in row] for row in matrix['chi_square_statistic']]
+                matrix['cramers_v'] = [[round(v, 4) for v in row] for row in matrix['cramers_v']]
+                result = dict({'task': 'Chi-square Matrix'}, **matrix)
+            else:
+                col1, col2 = body.get('column1'), body.get('column2')
+                if not all([col1, col2]): return JsonResponse({'error': 'Missing column1 or column2'}, status=400)
+                test = contingency_logic.chi_square_test(columnar, col1, col2)
+                result = {'task': 'Chi-square Test', 'columns': f'{col1} and {col2}', 'chi_square_statistic': round(test['chi_square_statistic'], 4), 'degrees_of_freedom': test['degrees_of_freedom'], 'p_value': test['p_value'], 'cramers_v': round(test['cramers_v'], 4), 'contingency_table': test['contingency_table']}
 
         elif task == 'visualization':
             params = body.get('params', {})
             chart_type = params.get('chart_type')
             if not chart_type: return JsonResponse({'error': 'Missing chart_type'}, status=400)
-            dataset = processing_logic.load_full_data(file_path)
             if chart_type == 'histogram':
                 column = body.get('column')
-                num_bins = params.get('num_bins', 10)
-                chart_data = processing_logic.prepare_histogram_data(dataset, column, num_bins)
-                result = {'task': 'Visualization', 'chart_type': 'histogram', 'chart_data': chart_data}
+                if not column: return JsonResponse({'error': 'Missing column name'}, status=400)
+                num_bins = int(params.get('num_bins', 10))
+                value_range = params.get('range')
+                if value_range is not None:
+                    if len(value_range) != 2 or not float(value_range[0]) < float(value_range[1]): return JsonResponse({'error': 'range must be [low, high] with low < high'}, status=400)
+                    value_range = (float(value_range[0]), float(value_range[1]))
+                columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+                # The persisted fine histogram answers exactly when the bins line up with
+                # its own; other requests scan the column unless `approximate` is set.
+                approximate = bool(params.get('approximate')) and not histogram_logic.merges_exactly(num_bins, value_range)
+                if approximate or histogram_logic.merges_exactly(num_bins, value_range):
+                    histogram = histogram_logic.load_histogram(columnar, column)
+                    chart_data = histogram.merge(num_bins, value_range) if histogram else {'labels': [], 'counts': []}
+                else:
+                    chart_data = histogram_logic.exact_histogram(columnar, column, num_bins, value_range)
+                result = {'task': 'Visualization', 'chart_type': 'histogram', 'chart_data': chart_data, 'approximate': approximate}
             elif chart_type == 'scatter_plot':
                 col1, col2 = body.get('column1'), body.get('column2')
-                chart_data = processing_logic.prepare_scatter_plot_data(dataset, col1, col2)
-                result = {'task': 'Visualization', 'chart_type': 'scatter_plot', 'chart_data': chart_data}
+                if not all([col1, col2]): return JsonResponse({'error': 'Missing column1 or column2'}, status=400)
+                max_points, sampling = params.get('max_points'), params.get('sampling', 'reservoir')
+                if max_points is not None:
+                    max_points = int(max_points)
+                    if max_points <= 0: return JsonResponse({'error': 'max_points must be positive'}, status=400)
+                    if sampling not in processing_logic.SCATTER_SAMPLING: return JsonResponse({'error': f'Unknown sampling mode: {sampling}'}, status=400)
+                (xs, ys), mask = columnar_logic.load_aligned_columns(file_path, [col1, col2], dataset_obj.column_types)
+                result = {'task': 'Visualization', 'chart_type': 'scatter_plot'}
+                if max_points is None:
+                    result['chart_data'] = processing_logic.prepare_scatter_plot_points(xs, ys, mask)
+                else:
+                    if sampling == 'density':
+                        x_stats, y_stats = _column_profile(dataset_obj, file_path, col1), _column_profile(dataset_obj, file_path, col2)
+                        if x_stats['min'] is None or y_stats['min'] is None: chart_data, total = [], 0
+                        else: chart_data, total = processing_logic.density_scatter_plot_points(xs, ys, mask, max_points, (x_stats['min'], x_stats['max']), (y_stats['min'], y_stats['max']))
+                    else:
+                        chart_data, total = processing_logic.sample_scatter_plot_points(xs, ys, mask, max_points, params.get('seed'))
+                    result.update({'chart_data': chart_data, 'sampling': sampling, 'max_points': max_points, 'total_points': total})
 
         elif task == 'clustering':
             # params: algorithm ('kmeans'|'kmedoid'), columns: [col1,col2,..], k, max_iter
             params = body.get('params', {})
             algo = params.get('algorithm')
             columns = params.get('columns', [])
-            k = int(params.get('k', 3))
-            max_iter = int(params.get('max_iter', 100))
-            dataset = processing_logic.load_full_data(file_path)
+            try:
+                k = int(params.get('k', 3))
+                max_iter = int(params.get('max_iter', 100))
+            except (TypeError, ValueError):
+                return JsonResponse({'error': 'k and max_iter must be integers.'}, status=400)
             if not columns:
                 return JsonResponse({'error': 'Missing columns for clustering'}, status=400)
             if algo == 'kmeans':
-                result = processing_logic.k_means(dataset, columns, k=k, max_iter=max_iter)
+                init = params.get('init', 'k-means++')
+                if k < 1: return JsonResponse({'error': 'k must be at least 1.'}, status=400)
+                if params.get('seed') is not None and not isinstance(params['seed'], int): return JsonResponse({'error': 'seed must be an integer.'}, status=400)
+                if init not in ('k-means++', 'random'): return JsonResponse({'error': f'Unknown k-means init: {init}'}, status=400)
+                columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+                points = clustering_logic.feature_matrix(columnar, columns)
+                result = clustering_logic.k_means(points, k=k, max_iter=max_iter, seed=params.get('seed'), init=init)
+            elif algo == 'minibatch_kmeans':
+                # Streams batches from the sidecar and writes every row's cluster to a derived dataset.
+                output_column = params.get('output_column', 'cluster')
+                if output_column in dataset_obj.columns: return JsonResponse({'error': f"Column '{output_column}' already exists"}, status=400)
+                if k < 1: return JsonResponse({'error': 'k must be at least 1.'}, status=400)
+                if params.get('seed') is not None and not isinstance(params['seed'], int): return JsonResponse({'error': 'seed must be an integer.'}, status=400)
+                try:
+                    batch_size, max_epochs = int(params.get('batch_size', 1024)), int(params.get('max_epochs', 10))
+                except (TypeError, ValueError):
+                    return JsonResponse({'error': 'batch_size and max_epochs must be integers.'}, status=400)
+                if batch_size < 1 or max_epochs < 1: return JsonResponse({'error': 'batch_size and max_epochs must be at least 1.'}, status=400)
+                columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+                model = clustering_logic.MiniBatchKMeans(k=k, batch_size=batch_size, seed=params.get('seed'))
+                model.fit(columnar, columns, max_epochs=max_epochs)
+                if model.centroids is None: return JsonResponse({'error': 'No numeric data found for selected columns.'}, status=400)
+                labels = model.assignments(columnar, columns)
+                rows = (dict(row, **{output_column: '' if label is None else label}) for row, label in zip(columnar.iter_rows(), labels))
+                lineage = {'task': 'minibatch_k_means', 'params': params}
+                derived, sample, _ = _materialize_dataset(dataset_obj, rows, lineage, params.get('output_filename'), [output_column])
+                centroids = model.centroids.tolist() if hasattr(model.centroids, 'tolist') else model.centroids
+                result = {
+                    'task': 'minibatch_k_means',
+                    'k': len(centroids),
+                    'centroids': centroids,
+                    'assignments_sample': [row[output_column] for row in sample],
+                    'cluster_sizes': model.sizes,
+                    'inertia': model.inertia,
+                    'epochs': model.epochs,
+                    'batches': model.batches,
+                    'derived_dataset': derived,
+                }
             elif algo == 'kmedoid' or algo == 'k-medoid':
-                result = processing_logic.k_medoid(dataset, columns, k=k, max_iter=max_iter)
+                # method: 'fastpam' (default up to PAM_MAX_ROWS rows), 'clara' (default above) or 'clarans'
+                method = params.get('method')
+                if k < 1: return JsonResponse({'error': 'k must be at least 1.'}, status=400)
+                if method is not None and method not in clustering_logic.KMEDOID_METHODS: return JsonResponse({'error': f'Unknown k-medoids method: {method}'}, status=400)
+                try:
+                    workers = int(params['workers']) if params.get('workers') else None
+                    samples, num_local, max_neighbor = int(params.get('samples', 5)), int(params.get('num_local', 2)), int(params.get('max_neighbor', 250))
+                    sample_size = int(params['sample_size']) if params.get('sample_size') else None
+                except (TypeError, ValueError):
+                    return JsonResponse({'error': 'workers, samples, sample_size, num_local and max_neighbor must be integers.'}, status=400)
+                if samples < 1 or num_local < 1 or max_neighbor < 1: return JsonResponse({'error': 'samples, num_local and max_neighbor must be at least 1.'}, status=400)
+                if sample_size is not None and sample_size < k: return JsonResponse({'error': 'sample_size must be at least k.'}, status=400)
+                columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+                points = clustering_logic.feature_matrix(columnar, columns)
+                result = clustering_logic.k_medoids(
+                    points, k=k, max_iter=max_iter, method=method, seed=params.get('seed'), workers=workers,
+                    samples=samples, sample_size=sample_size, num_local=num_local, max_neighbor=max_neighbor,
+                )
             else:
                 return JsonResponse({'error': 'Unknown clustering algorithm'}, status=400)
 
@@ -155,29 +394,61 @@ def process_data(request):
             min_support = float(params.get('min_support', 0.1))
             min_confidence = float(params.get('min_confidence', 0.6))
             max_len = int(params.get('max_len', 3))
-            dataset = processing_logic.load_full_data(file_path)
+            # algorithm: 'apriori' (level-wise scans), 'eclat' (transaction bitsets) or 'fpgrowth' (prefix tree); same output
+            algorithm = params.get('algorithm', 'apriori')
             if not columns:
                 return JsonResponse({'error': 'Missing columns for apriori'}, status=400)
-            result = processing_logic.apriori(dataset, columns, min_support=min_support, min_confidence=min_confidence, max_len=max_len)
+            if algorithm not in itemset_logic.ALGORITHMS:
+                return JsonResponse({'error': f'Unknown itemset algorithm: {algorithm}'}, status=400)
+            # top_k: keep only the k best rules by rank_by (confidence, lift, leverage, conviction or support)
+            top_k = int(params['top_k']) if params.get('top_k') not in (None, '') else None
+            if top_k is not None and top_k < 1:
+                return JsonResponse({'error': 'top_k must be at least 1.'}, status=400)
+            rank_by = params.get('rank_by', 'confidence')
+            if rank_by not in itemset_logic.RULE_METRICS:
+                return JsonResponse({'error': f'Unknown rule metric: {rank_by}'}, status=400)
+            dataset = columnar_logic.load_full_data(file_path, dataset_obj.column_types, readonly=True, columns=columns)
+            miner = {'apriori': processing_logic.apriori, 'eclat': itemset_logic.eclat, 'fpgrowth': itemset_logic.fp_growth}[algorithm]
+            result = miner(dataset, columns, min_support=min_support, min_confidence=min_confidence, max_len=max_len, top_k=top_k, rank_by=rank_by)
 
         elif task == 'pagerank':
             params = body.get('params', {})
             source_col = params.get('source_column')
             target_col = params.get('target_column')
-            damping = float(params.get('damping', 0.85))
-            dataset = processing_logic.load_full_data(file_path)
             if not all([source_col, target_col]):
                 return JsonResponse({'error': 'Missing source_column or target_column for pagerank'}, status=400)
-            result = processing_logic.pagerank_from_edges(dataset, source_col, target_col, damping=damping)
+            try:
+                damping, max_iter, tol = float(params.get('damping', 0.85)), int(params.get('max_iter', 100)), float(params.get('tol', 1e-6))
+                limit = int(params['limit']) if params.get('limit') not in (None, '') else None
+            except (TypeError, ValueError):
+                return JsonResponse({'error': 'damping, max_iter, tol and limit must be numbers.'}, status=400)
+            if max_iter < 1 or (limit is not None and limit < 1): return JsonResponse({'error': 'max_iter and limit must be at least 1.'}, status=400)
+            if not tol > 0: return JsonResponse({'error': 'tol must be positive.'}, status=400)
+            missing = [column for column in (source_col, target_col) if column not in dataset_obj.columns]
+            if missing: return JsonResponse({'error': f"Column '{missing[0]}' not found in the file."}, status=400)
+            # The graph index of the column pair is compiled once and kept in the sidecar; limit caps the returned scores.
+            columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+            graph = graph_logic.load_graph(columnar, source_col, target_col)
+            result = graph_logic.pagerank_response(graph, damping=damping, max_iter=max_iter, tol=tol, limit=limit)
 
         elif task == 'hits':
             params = body.get('params', {})
             source_col = params.get('source_column')
             target_col = params.get('target_column')
-            dataset = processing_logic.load_full_data(file_path)
             if not all([source_col, target_col]):
                 return JsonResponse({'error': 'Missing source_column or target_column for hits'}, status=400)
-            result = processing_logic.hits_from_edges(dataset, source_col, target_col)
+            try:
+                max_iter, tol = int(params.get('max_iter', 100)), float(params.get('tol', 1e-6))
+                limit = int(params['limit']) if params.get('limit') not in (None, '') else None
+            except (TypeError, ValueError):
+                return JsonResponse({'error': 'max_iter, tol and limit must be numbers.'}, status=400)
+            if max_iter < 1 or (limit is not None and limit < 1): return JsonResponse({'error': 'max_iter and limit must be at least 1.'}, status=400)
+            if not tol > 0: return JsonResponse({'error': 'tol must be positive.'}, status=400)
+            missing = [column for column in (source_col, target_col) if column not in dataset_obj.columns]
+            if missing: return JsonResponse({'error': f"Column '{missing[0]}' not found in the file."}, status=400)
+            columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+            graph = graph_logic.load_graph(columnar, source_col, target_col)
+            result = graph_logic.hits_response(graph, max_iter=max_iter, tol=tol, limit=limit)
 
         if result:
             AnalysisResult.objects.create(dataset=dataset_obj, task_name=task, task_parameters=body, result=result)
@@ -187,6 +458,59 @@ def process_data(request):
     except Exception as e:
         return JsonResponse({'error': f'An error occurred: {str(e)}'}, status=500)
 
+@csrf_exempt
+def run_pipeline(request):
+    """
+    Applies an ordered list of preprocessing steps in two streaming passes:
+    one shared statistics pass, then one fused transform pass.
+    """
+    if request.method != 'POST': return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+    try:
+        body = json.loads(request.body)
+        filename, steps = body.get('filename'), body.get('steps')
+        if not all([filename, steps]): return JsonResponse({'error': 'Missing filename or steps'}, status=400)
+        name_error = _output_filename_error(body.get('output_filename'))
+        if name_error: return JsonResponse({'error': name_error}, status=400)
+
+        try:
+            dataset_obj = Dataset.objects.get(filename=filename)
+        except Dataset.DoesNotExist:
+            return JsonResponse({'error': 'Dataset not found in database.'}, status=404)
+
+        try:
+            processing_logic.validate_pipeline(steps)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        unknown = [step['column'] for step in steps if step.get('column') and step['column'] not in dataset_obj.columns]
+        if unknown: return JsonResponse({'error': f"Column '{unknown[0]}' not found in the file."}, status=400)
+
+        file_path = os.path.join(settings.MEDIA_ROOT, filename)
+        columnar = columnar_logic.load_columnar(file_path, dataset_obj.column_types)
+        rows = processing_logic.run_pipeline(columnar.iter_rows, steps)
+
+        result = {'task': 'pipeline', 'steps': steps, 'rows_before': columnar.row_count}
+        if body.get('materialize'):
+            lineage = {'task': 'pipeline', 'steps': steps}
+            result['derived_dataset'], sample, rows_after = _materialize_dataset(dataset_obj, rows, lineage, body.get('output_filename'))
+        else:
+            sample, rows_after = [], 0
+            for row in rows:
+                rows_after += 1
+                if len(sample) < 100: sample.append(row)
+        result.update({'rows_after': rows_after, 'processed_data': sample})
+
+        AnalysisResult.objects.create(dataset=dataset_obj, task_name='pipeline', task_parameters=body, result=result)
+        return JsonResponse(result)
+
+    except Exception as e:
+        return JsonResponse({'error': f'An error occurred: {str(e)}'}, status=500)
+
+def _classification_columns(task, params):
+    """Columns a classification task reads; None means every column."""
+    if task == 'linear_regression':
+        return [c for c in (params.get('independent_attribute'), params.get('dependent_attribute')) if c] or None
+    return None
+
 @csrf_exempt
 def classify_data(request):
     if request.method != 'POST': return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
@@ -202,7 +526,7 @@ def classify_data(request):
             return JsonResponse({'error': 'Dataset not found in database.'}, status=404)
 
         file_path = os.path.join(settings.MEDIA_ROOT, filename)
-        dataset = processing_logic.load_full_data(file_path)
+        dataset = columnar_logic.load_full_data(file_path, dataset_obj.column_types, readonly=True, columns=_classification_columns(task, params))
         target_attribute = params.get('target_attribute')
         if not target_attribute and task not in ['linear_regression']: 
             return JsonResponse({'error': 'Missing target_attribute in params'}, status=400)
@@ -212,7 +536,7 @@ def classify_data(request):
 
         if task == 'decision_tree':
             split_criterion = params.get('split_criterion', 'information_gain')
-            processed_data = classification_logic.preprocess_for_tree(dataset, attributes)
+            processed_data = classification_logic.preprocess_for_tree(dataset, attributes, params.get('binning', 'equal_width'), target_attribute)
             model = classification_logic.build_decision_tree(processed_data, attributes, target_attribute, split_criterion)
             result = {'task': 'Decision Tree', 'params': params, 'model': model}
 
@@ -239,7 +563,7 @@ def classify_data(request):
         elif task == 'rule_based_1r':
             test_instance = params.get('test_instance')
             if not test_instance: return JsonResponse({'error': 'Missing test_instance'}, status=400)
-            processed_data = classification_logic.preprocess_for_tree(dataset, attributes)
+            processed_data = classification_logic.preprocess_for_tree(dataset, attributes, params.get('binning', 'equal_width'), target_attribute)
             model = classification_logic.train_1r(processed_data, attributes, target_attribute)
             prediction = classification_logic.predict_1r(model, test_instance)
             result = {'task': 'Rule-Based (1R)', 'params': params, 'model': model, 'prediction': prediction}
@@ -275,7 +599,13 @@ def list_datasets(request):
         'id': ds.id,
         'filename': ds.filename,
         'upload_date': ds.upload_date.strftime('%Y-%m-%d %H:%M:%S'),
-        'columns': ds.columns
+        'columns': ds.columns,
+        'column_types': ds.column_types,
+        'row_count': ds.row_count,
+        'byte_size': ds.byte_size,
+        'content_hash': ds.content_hash,
+        'parent_id': ds.parent_id,
+        'lineage': ds.lineage
     } for ds in datasets]
     return JsonResponse(data, safe=False)
 
@@ -311,6 +641,7 @@ def delete_dataset(request, dataset_id):
         file_path = os.path.join(settings.MEDIA_ROOT, dataset.filename)
         if os.path.exists(file_path):
             os.remove(file_path)
+        columnar_logic.remove_sidecar(file_path)
             
         dataset.delete()
         
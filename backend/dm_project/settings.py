@@ -134,4 +134,7 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Memory budget of the in-process LRU cache of parsed datasets (bytes)
+DATASET_CACHE_MAX_BYTES = 256 * 1024 * 1024
\ No newline at end of file
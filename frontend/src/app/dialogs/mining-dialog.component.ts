@@ -43,6 +43,7 @@ import { ApiService } from '../services/api.service';
           <mat-label>Algorithm</mat-label>
           <mat-select formControlName="algorithm">
             <mat-option value="kmeans">k-Means</mat-option>
+            <mat-option value="minibatch_kmeans">Mini-batch k-Means (large files, adds a cluster column)</mat-option>
             <mat-option value="kmedoid">k-Medoid</mat-option>
           </mat-select>
         </mat-form-field>
@@ -56,6 +57,16 @@ import { ApiService } from '../services/api.service';
           <mat-label>k (clusters)</mat-label>
           <input matInput type="number" formControlName="k" />
         </mat-form-field>
+
+        <mat-form-field class="half" appearance="outline" *ngIf="form.value.algorithm==='kmedoid'">
+          <mat-label>k-Medoid Method</mat-label>
+          <mat-select formControlName="method">
+            <mat-option value="">Automatic</mat-option>
+            <mat-option value="fastpam">FastPAM (exact swaps)</mat-option>
+            <mat-option value="clara">CLARA (sampling)</mat-option>
+            <mat-option value="clarans">CLARANS (randomized search)</mat-option>
+          </mat-select>
+        </mat-form-field>
       </div>
 
       <!-- Apriori options -->
@@ -72,6 +83,28 @@ import { ApiService } from '../services/api.service';
           <mat-label>Min Confidence</mat-label>
           <input matInput type="number" step="0.01" formControlName="min_confidence" />
         </mat-form-field>
+        <mat-form-field class="half" appearance="outline">
+          <mat-label>Itemset Algorithm</mat-label>
+          <mat-select formControlName="itemset_algorithm">
+            <mat-option value="apriori">Apriori</mat-option>
+            <mat-option value="eclat">Eclat (bitsets, faster on many rows)</mat-option>
+            <mat-option value="fpgrowth">FP-Growth (prefix tree, low support)</mat-option>
+          </mat-select>
+        </mat-form-field>
+        <mat-form-field class="half" appearance="outline">
+          <mat-label>Top-K Rules (blank = all)</mat-label>
+          <input matInput type="number" min="1" formControlName="top_k" />
+        </mat-form-field>
+        <mat-form-field class="half" appearance="outline">
+          <mat-label>Rank Rules By</mat-label>
+          <mat-select formControlName="rank_by">
+            <mat-option value="confidence">Confidence</mat-option>
+            <mat-option value="lift">Lift</mat-option>
+            <mat-option value="leverage">Leverage</mat-option>
+            <mat-option value="conviction">Conviction</mat-option>
+            <mat-option value="support">Support</mat-option>
+          </mat-select>
+        </mat-form-field>
       </div>
 
       <!-- Graph mining options -->
@@ -123,8 +156,12 @@ export class MiningDialogComponent {
     algorithm: this.fb.control<string>('kmeans'),
     columns: this.fb.control<string>(''),
     k: this.fb.control<number>(3),
+    method: this.fb.control<string>(''),
     min_support: this.fb.control<number>(0.1),
     min_confidence: this.fb.control<number>(0.6),
+    itemset_algorithm: this.fb.control<string>('apriori'),
+    top_k: this.fb.control<number | null>(null),
+    rank_by: this.fb.control<string>('confidence'),
     source_column: this.fb.control<string>(''),
     target_column: this.fb.control<string>('')
   });
@@ -141,9 +178,11 @@ export class MiningDialogComponent {
     if (v.task === 'clustering') {
       const cols = (v.columns ?? '').split(',').map((s: string) => s.trim()).filter((s: string) => s);
       payload.params = { algorithm: v.algorithm, columns: cols, k: v.k };
+      if (v.algorithm === 'kmedoid' && v.method) payload.params.method = v.method;
     } else if (v.task === 'apriori') {
       const cols = (v.columns ?? '').split(',').map((s: string) => s.trim()).filter((s: string) => s);
-      payload.params = { columns: cols, min_support: v.min_support, min_confidence: v.min_confidence };
+      payload.params = { columns: cols, min_support: v.min_support, min_confidence: v.min_confidence, algorithm: v.itemset_algorithm };
+      if (v.top_k) { payload.params.top_k = v.top_k; payload.params.rank_by = v.rank_by; }
     } else if (v.task === 'pagerank' || v.task === 'hits') {
       payload.params = { source_column: v.source_column, target_column: v.target_column };
     }
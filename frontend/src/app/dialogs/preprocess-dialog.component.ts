@@ -36,8 +36,11 @@ import { VisualizationDialogComponent } from './visualization-dialog.component';
           <mat-option value="central_tendency">Statistical description (Central Tendency)</mat-option>
           <mat-option value="dispersion_of_data">Dispersion of data</mat-option>
           <mat-option value="data_cleaning">Data cleaning</mat-option>
+          <mat-option value="impute">Impute missing values (several columns)</mat-option>
           <mat-option value="chi_square_test">Chi-square test</mat-option>
+          <mat-option value="chi_square_matrix">Chi-square matrix (all categorical pairs)</mat-option>
           <mat-option value="correlation_covariance">Correlation & Covariance</mat-option>
+          <mat-option value="correlation_matrix">Correlation matrix (all numeric columns)</mat-option>
           <mat-option value="normalize_min_max">Normalization – Min-Max</mat-option>
           <mat-option value="normalize_z_score">Normalization – Z-Score</mat-option>
           <mat-option value="normalize_decimal_scaling">Normalization – Decimal Scaling</mat-option>
@@ -81,6 +84,28 @@ import { VisualizationDialogComponent } from './visualization-dialog.component';
           </mat-form-field>
         </ng-container>
 
+        <ng-container *ngSwitchCase="'impute'">
+          <mat-form-field class="full" appearance="outline">
+            <mat-label>Columns</mat-label>
+            <mat-select formControlName="columns" multiple>
+              <mat-option *ngFor="let col of data.columns" [value]="col">{{ col }}</mat-option>
+            </mat-select>
+          </mat-form-field>
+          <mat-form-field class="half" appearance="outline">
+            <mat-label>Fill with</mat-label>
+            <mat-select formControlName="impute_method">
+              <mat-option value="mean">Mean</mat-option>
+              <mat-option value="median">Median</mat-option>
+              <mat-option value="mode">Mode</mat-option>
+              <mat-option value="constant">Constant</mat-option>
+            </mat-select>
+          </mat-form-field>
+          <mat-form-field class="half" appearance="outline" *ngIf="form.value.impute_method==='constant'">
+            <mat-label>Constant value</mat-label>
+            <input matInput formControlName="impute_value" />
+          </mat-form-field>
+        </ng-container>
+
         <ng-container *ngSwitchCase="'chi_square_test'">
           <mat-form-field class="half" appearance="outline">
             <mat-label>Column 1</mat-label>
@@ -111,6 +136,15 @@ import { VisualizationDialogComponent } from './visualization-dialog.component';
           </mat-form-field>
         </ng-container>
 
+        <ng-container *ngSwitchCase="'correlation_matrix'">
+          <mat-form-field class="full" appearance="outline">
+            <mat-label>Columns (all numeric if empty)</mat-label>
+            <mat-select formControlName="columns" multiple>
+              <mat-option *ngFor="let col of data.columns" [value]="col">{{ col }}</mat-option>
+            </mat-select>
+          </mat-form-field>
+        </ng-container>
+
         <ng-container *ngSwitchCase="'discretize_by_binning'">
           <mat-form-field class="half" appearance="outline">
             <mat-label>Column</mat-label>
@@ -119,9 +153,23 @@ import { VisualizationDialogComponent } from './visualization-dialog.component';
             </mat-select>
           </mat-form-field>
           <mat-form-field class="half" appearance="outline">
+            <mat-label>Strategy</mat-label>
+            <mat-select formControlName="strategy">
+              <mat-option value="equal_width">Equal width</mat-option>
+              <mat-option value="equal_frequency">Equal frequency</mat-option>
+              <mat-option value="entropy">Entropy (supervised)</mat-option>
+            </mat-select>
+          </mat-form-field>
+          <mat-form-field class="half" appearance="outline" *ngIf="form.value.strategy!=='entropy'">
             <mat-label>Number of bins</mat-label>
             <input matInput type="number" formControlName="num_bins" />
           </mat-form-field>
+          <mat-form-field class="half" appearance="outline" *ngIf="form.value.strategy==='entropy'">
+            <mat-label>Target column</mat-label>
+            <mat-select formControlName="target_column">
+              <mat-option *ngFor="let col of data.columns" [value]="col">{{ col }}</mat-option>
+            </mat-select>
+          </mat-form-field>
         </ng-container>
 
         <ng-container *ngSwitchCase="'visualization'">
@@ -142,6 +190,23 @@ import { VisualizationDialogComponent } from './visualization-dialog.component';
             <mat-label>Bins</mat-label>
             <input matInput type="number" formControlName="num_bins" />
           </mat-form-field>
+          <ng-container *ngIf="form.value.chart_type==='histogram'">
+            <mat-form-field class="half" appearance="outline">
+              <mat-label>Range from (optional)</mat-label>
+              <input matInput type="number" formControlName="range_low" />
+            </mat-form-field>
+            <mat-form-field class="half" appearance="outline">
+              <mat-label>Range to (optional)</mat-label>
+              <input matInput type="number" formControlName="range_high" />
+            </mat-form-field>
+            <mat-form-field class="half" appearance="outline" *ngIf="form.value.range_low != null && form.value.range_high != null">
+              <mat-label>Range counts</mat-label>
+              <mat-select formControlName="approximate">
+                <mat-option [value]="true">Approximate (stored histogram, fast)</mat-option>
+                <mat-option [value]="false">Exact (scans the column)</mat-option>
+              </mat-select>
+            </mat-form-field>
+          </ng-container>
           <ng-container *ngIf="form.value.chart_type==='scatter_plot'">
             <mat-form-field class="half" appearance="outline">
               <mat-label>X Column</mat-label>
@@ -155,6 +220,17 @@ import { VisualizationDialogComponent } from './visualization-dialog.component';
                 <mat-option *ngFor="let col of data.columns" [value]="col">{{ col }}</mat-option>
               </mat-select>
             </mat-form-field>
+            <mat-form-field class="half" appearance="outline">
+              <mat-label>Max points</mat-label>
+              <input matInput type="number" formControlName="max_points" />
+            </mat-form-field>
+            <mat-form-field class="half" appearance="outline">
+              <mat-label>Downsampling</mat-label>
+              <mat-select formControlName="sampling">
+                <mat-option value="reservoir">Random sample</mat-option>
+                <mat-option value="density">Density grid</mat-option>
+              </mat-select>
+            </mat-form-field>
           </ng-container>
         </ng-container>
 
@@ -216,9 +292,19 @@ export class PreprocessDialogComponent {
     column: this.fb.control<string>(''),
     column1: this.fb.control<string>(''),
     column2: this.fb.control<string>(''),
+    columns: this.fb.control<string[]>([]),
+    impute_method: this.fb.control<string>('mean'),
+    impute_value: this.fb.control<string>(''),
     method: this.fb.control<string>(''),
     num_bins: this.fb.control<number>(10),
-    chart_type: this.fb.control<string>('')
+    strategy: this.fb.control<string>('equal_width'),
+    target_column: this.fb.control<string>(''),
+    chart_type: this.fb.control<string>(''),
+    max_points: this.fb.control<number | null>(5000),
+    sampling: this.fb.control<string>('reservoir'),
+    range_low: this.fb.control<number | null>(null),
+    range_high: this.fb.control<number | null>(null),
+    approximate: this.fb.control<boolean>(true)
   });
 
   constructor(@Inject(MAT_DIALOG_DATA) public data: { filename: string, columns: string[] }) {
@@ -234,18 +320,39 @@ export class PreprocessDialogComponent {
       payload.column = v.column;
     } else if (v.task === 'correlation_covariance') {
       payload.column1 = v.column1; payload.column2 = v.column2;
+    } else if (v.task === 'correlation_matrix') {
+      payload.params = { columns: v.columns };
     } else if (v.task?.startsWith('normalize')) {
       payload.column = v.column;
     } else if (v.task === 'discretize_by_binning') {
-      payload.column = v.column; payload.params = { num_bins: v.num_bins };
+      payload.column = v.column;
+      payload.params = { num_bins: v.num_bins, strategy: v.strategy };
+      if (v.strategy === 'entropy') payload.params.target_column = v.target_column;
     } else if (v.task === 'data_cleaning') {
       payload.column = v.column; payload.params = { method: v.method };
+    } else if (v.task === 'impute') {
+      payload.params = {
+        columns: v.columns.map((column: string) => v.impute_method === 'constant'
+          ? { column, method: v.impute_method, value: v.impute_value }
+          : { column, method: v.impute_method })
+      };
     } else if (v.task === 'chi_square_test') {
       payload.column1 = v.column1; payload.column2 = v.column2;
+    } else if (v.task === 'chi_square_matrix') {
+      payload.task = 'chi_square_test'; payload.params = { mode: 'all_pairs' };
     } else if (v.task === 'visualization') {
       payload.params = { chart_type: v.chart_type, num_bins: v.num_bins };
-      if (v.chart_type === 'histogram') payload.column = v.column;
-      if (v.chart_type === 'scatter_plot') { payload.column1 = v.column1; payload.column2 = v.column2; }
+      if (v.chart_type === 'histogram') {
+        payload.column = v.column;
+        if (v.range_low != null && v.range_high != null) {
+          payload.params.range = [v.range_low, v.range_high];
+          payload.params.approximate = v.approximate;
+        }
+      }
+      if (v.chart_type === 'scatter_plot') {
+        payload.column1 = v.column1; payload.column2 = v.column2;
+        if (v.max_points) { payload.params.max_points = v.max_points; payload.params.sampling = v.sampling; }
+      }
     }
 
     this.api.process(payload).subscribe({
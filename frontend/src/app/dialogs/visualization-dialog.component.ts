@@ -32,7 +32,9 @@ import { NgxChartsModule } from '@swimlane/ngx-charts';
           [yAxis]="true"
           [legend]="true"
           [xAxisLabel]="data.params.column1"
-          [yAxisLabel]="data.params.column2">
+          [yAxisLabel]="data.params.column2"
+          [minRadius]="minRadius"
+          [maxRadius]="maxRadius">
         </ngx-charts-bubble-chart>
 
       </ng-container>
@@ -53,6 +55,9 @@ import { NgxChartsModule } from '@swimlane/ngx-charts';
 })
 export class VisualizationDialogComponent {
   chartData: any[] = [];
+  // Bubble radius range in pixels; density cells scale within it by sqrt(count / maxCount).
+  minRadius = 3;
+  maxRadius = 12;
 
   constructor(@Inject(MAT_DIALOG_DATA) public data: any) {
     if (data.chart_type === 'histogram') {
@@ -61,15 +66,21 @@ export class VisualizationDialogComponent {
         value: data.chart_data.counts[index]
       }));
     } else if (data.chart_type === 'scatter_plot') {
+      const maxCount = data.chart_data.reduce((max: number, point: any) => Math.max(max, point.count ?? 1), 1);
       this.chartData = [{
         name: `${data.params.column1} vs ${data.params.column2}`,
         series: data.chart_data.map((point: any, index: number) => ({
           name: `${index}`,  
           x: point.x,
           y: point.y,
-          r: 5               
+          r: point.count == null ? 5 : this.bubbleRadius(point.count, maxCount)
         }))
       }];
     }
   }
+
+  private bubbleRadius(count: number, maxCount: number): number {
+    const radius = this.minRadius + (this.maxRadius - this.minRadius) * Math.sqrt(count / maxCount);
+    return Math.min(this.maxRadius, Math.max(this.minRadius, radius));
+  }
 }
@@ -22,6 +22,9 @@ export interface PreviewResponse {
   filename: string;
   header: string[];
   data: any[];
+  offset: number;
+  limit: number;
+  total_rows: number;
 }
 
 export interface UploadResponse {
@@ -49,9 +52,10 @@ export class ApiService {
     return this.http.post<UploadResponse>(`${this.BASE_URL}/upload/`, form);
   }
 
-  preview(filename: string): Observable<PreviewResponse> {
+  preview(filename: string, offset = 0, limit = 20): Observable<PreviewResponse> {
     return this.http.get<PreviewResponse>(
-      `${this.BASE_URL}/preview/${encodeURIComponent(filename)}/`
+      `${this.BASE_URL}/preview/${encodeURIComponent(filename)}/`,
+      { params: { offset, limit } }
     );
   }
 
@@ -62,6 +66,10 @@ export class ApiService {
   classify(payload: any): Observable<any> {
     return this.http.post<any>(`${this.BASE_URL}/classify/`, payload);
   }
+
+  pipeline(payload: any): Observable<any> {
+    return this.http.post<any>(`${this.BASE_URL}/pipeline/`, payload);
+  }
   deleteDataset(datasetId: number) {
     return this.http.delete<any>(`${this.BASE_URL}/datasets/${datasetId}/delete/`);
   }